@@ -1,21 +1,27 @@
 from pkgutil import extend_path
+from typing import Any
 
 __path__ = extend_path(__path__, __name__)  # type: ignore
-# Export for plugin use
-from pdm.cli.commands.base import BaseCommand
-from pdm.core import Core
-from pdm.installers import Installer, Synchronizer
-from pdm.project import Config, ConfigItem, Project
-
-__all__ = (
-    "Project",
-    "Config",
-    "ConfigItem",
-    "BaseCommand",
-    "Installer",
-    "Synchronizer",
-    "Core",
-)
+# Export for plugin use, imported on first access to keep the startup fast.
+_EXPORTS = {
+    "Project": "pdm.project",
+    "Config": "pdm.project",
+    "ConfigItem": "pdm.project",
+    "BaseCommand": "pdm.cli.commands.base",
+    "Installer": "pdm.installers",
+    "Synchronizer": "pdm.installers",
+    "Core": "pdm.core",
+}
+
+__all__ = tuple(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    import importlib
+
+    return getattr(importlib.import_module(_EXPORTS[name]), name)
 
 
 def _fix_pkg_resources() -> None:
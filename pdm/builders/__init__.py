@@ -1,9 +1,11 @@
 from pdm.builders.egg_info import EnvEggInfoBuilder
+from pdm.builders.metadata import EnvMetadataBuilder
 from pdm.builders.sdist import EnvSdistBuilder
 from pdm.builders.wheel import EnvWheelBuilder
 
 __all__ = (
     EnvEggInfoBuilder.__name__,
+    EnvMetadataBuilder.__name__,
     EnvSdistBuilder.__name__,
     EnvWheelBuilder.__name__,
 )
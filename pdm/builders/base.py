@@ -1,25 +1,37 @@
 from __future__ import annotations
 
+import contextlib
+import glob
+import hashlib
+import json
 import logging
 import os
+import shutil
 import subprocess
 import tempfile
 import textwrap
 import threading
 from logging import Logger
-from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Mapping, Optional
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Mapping, Optional, TypeVar
 
 import toml
 from pep517.wrappers import Pep517HookCaller
 from pip._vendor.pkg_resources import Requirement, VersionConflict, WorkingSet
+from resolvelib.reporters import BaseReporter
+from resolvelib.resolvers import ResolverException
 
-from pdm.exceptions import BuildError
+from pdm.exceptions import BuildBackendError, BuildError
 from pdm.models.in_process import get_sys_config_paths
 from pdm.termui import logger
-from pdm.utils import create_tracked_tempdir, prepare_pip_source_args
+from pdm.utils import create_tracked_tempdir, file_lock, prepare_pip_source_args
 
 if TYPE_CHECKING:
     from pdm.models.environment import Environment
+    from pdm.project import Project
+
+BUILD_ENV_MARKER = "pdm-build-env.json"
+_T = TypeVar("_T", bound="EnvBuilder")
+_install_state = threading.local()
 
 
 class LoggerWrapper(threading.Thread):
@@ -86,12 +98,49 @@ def log_subprocessor(
         outstream.stop()
 
 
+def remove_stale_build_envs(project: Project, keep: Optional[str] = None) -> None:
+    """Remove the least recently used build environments beyond the limit
+    of ``cache.max_build_envs``. The environments in use are skipped.
+    """
+    limit = int(project.config["cache.max_build_envs"])
+    root = project.cache("build_envs")
+    with project.cache_lock("build_envs", shared=True):
+        envs = sorted(
+            (
+                os.path.getmtime(marker),
+                os.path.dirname(marker),
+            )
+            for marker in glob.glob(os.path.join(root, "*", BUILD_ENV_MARKER))
+            if os.path.dirname(marker) != keep
+        )
+        for _, path in envs[: max(len(envs) - limit + bool(keep), 0)]:
+            try:
+                with file_lock(f"{path}.lock", blocking=False):
+                    logger.debug("Removing stale build env %s", path)
+                    shutil.rmtree(path, ignore_errors=True)
+            except BlockingIOError:
+                logger.debug("Build env %s is in use, not removing it", path)
+            # The lock file is kept, as other processes may be waiting on it.
+
+
 class _Prefix:
-    def __init__(self, executable: str, path: str) -> None:
+    def __init__(
+        self, executable: str, path: str, shared_path: Optional[str] = None
+    ) -> None:
         self.path = path
         paths = get_sys_config_paths(executable, vars={"base": path, "platbase": path})
-        self.bin_dir = paths["scripts"]
+        self.bin_dirs = [paths["scripts"]]
         self.lib_dirs = [paths["platlib"], paths["purelib"]]
+        if shared_path:
+            # The shared prefix has the same layout, with lower priority.
+            self.bin_dirs.extend(
+                os.path.join(shared_path, os.path.relpath(d, path))
+                for d in list(self.bin_dirs)
+            )
+            self.lib_dirs.extend(
+                os.path.join(shared_path, os.path.relpath(d, path))
+                for d in list(self.lib_dirs)
+            )
         self.site_dir = os.path.join(path, "site")
         if not os.path.isdir(self.site_dir):
             os.makedirs(self.site_dir)
@@ -136,12 +185,31 @@ class EnvBuilder:
             cls._env_cache[key] = create_tracked_tempdir(prefix="pdm-build-env-")
         return cls._env_cache[key]
 
+    def get_shared_env_path(self, requires: Iterable[str]) -> str:
+        """Get the path of the build environment shared by the projects with the
+        same build requirements, which persists across runs.
+        """
+        from pdm.models.requirements import parse_requirement
+
+        key = {
+            "requires": sorted(
+                parse_requirement(r).as_line().lower() for r in requires
+            ),
+            "python": self.executable,
+            "tag": self._env.interpreter.for_tag(),
+        }
+        digest = hashlib.sha256(
+            json.dumps(key, sort_keys=True).encode("utf-8")
+        ).hexdigest()
+        return os.path.join(self._env.project.cache("build_envs"), digest[:16])
+
     def __init__(self, src_dir: os.PathLike, environment: Environment) -> None:
         self._env = environment
+        self._stack = contextlib.ExitStack()
+        self._shared_env_held = False
         self._path = self.get_env_path(src_dir)
         self.executable = self._env.interpreter.executable
         self.src_dir = src_dir
-        self._prefix = _Prefix(self.executable, self._path)
         logger.debug("Preparing isolated env for PEP 517 build...")
         try:
             with open(os.path.join(src_dir, "pyproject.toml"), encoding="utf8") as f:
@@ -159,18 +227,29 @@ class EnvBuilder:
             raise BuildError("Missing 'build-system.requires' in pyproject.toml")
 
         self._backend = self._build_system["build-backend"]
+        # The build-system requirements are installed into the shared environment,
+        # while the backend specific ones go into the private one.
+        self._shared_path = self.get_shared_env_path(self._build_system["requires"])
+        self._prefix = _Prefix(self.executable, self._path, self._shared_path)
 
         self._hook = Pep517HookCaller(
             src_dir,
             self._backend,
             backend_path=self._build_system.get("backend-path"),
-            runner=self.subprocess_runner,
+            runner=self._backend_runner,
             python_executable=self.executable,
         )
 
+    def __enter__(self: _T) -> _T:
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self._stack.close()
+        self._shared_env_held = False
+
     @property
     def _env_vars(self) -> Dict[str, str]:
-        paths = [self._prefix.bin_dir]
+        paths = list(self._prefix.bin_dirs)
         if "PATH" in os.environ:
             paths.append(os.getenv("PATH", ""))
         return {
@@ -189,7 +268,23 @@ class EnvBuilder:
         env = self._env_vars.copy() if isolated else {}
         if extra_environ:
             env.update(extra_environ)
-        return log_subprocessor(cmd, cwd, extra_environ=env)
+        # Keep the shared environments from being removed while they are in use.
+        with self._env.project.cache_lock("build_envs", shared=True):
+            return log_subprocessor(cmd, cwd, extra_environ=env)
+
+    def _backend_runner(
+        self,
+        cmd: List[str],
+        cwd: Optional[os.PathLike] = None,
+        extra_environ: Optional[Dict[str, str]] = None,
+    ) -> None:
+        """Run the build backend hooks, telling their failures from those of
+        preparing the environment.
+        """
+        try:
+            self.subprocess_runner(cmd, cwd, extra_environ)
+        except BuildError as e:
+            raise BuildBackendError(str(e)) from e
 
     def check_requirements(self, reqs: Iterable[str]) -> Iterable[str]:
         missing = set()
@@ -206,21 +301,117 @@ class EnvBuilder:
             raise BuildError(f"Conflicting requirements: {', '.join(conflicting)}")
         return missing
 
-    def install(self, requirements: Iterable[str]) -> None:
+    def install(self, requirements: Iterable[str], shared: bool = False) -> None:
+        """Install the requirements into the private environment, or the shared
+        one if ``shared`` is True.
+        """
+        if not shared:
+            self._install(requirements, self._path)
+            return
+        if self._shared_env_held:
+            return
+        project = self._env.project
+        lock_file = f"{self._shared_path}.lock"
+        marker = os.path.join(self._shared_path, BUILD_ENV_MARKER)
+        while True:
+            # The shared lock is held until the builder exits, to keep the
+            # environment from being removed while it is in use.
+            with contextlib.ExitStack() as stack:
+                stack.enter_context(project.cache_lock("build_envs", shared=True))
+                stack.enter_context(file_lock(lock_file, shared=True))
+                if os.path.exists(marker):
+                    os.utime(marker)
+                    self._stack.enter_context(stack.pop_all())
+                    self._shared_env_held = True
+                    break
+            # The exclusive lock is only taken to create the environment, and
+            # it is locked shared again before use.
+            with project.cache_lock("build_envs", shared=True), file_lock(lock_file):
+                if os.path.exists(marker):
+                    continue
+                if os.path.exists(self._shared_path):
+                    # The installation was interrupted, start over.
+                    logger.debug("Removing incomplete build env %s", self._shared_path)
+                    shutil.rmtree(self._shared_path, ignore_errors=True)
+                self._install(requirements, self._shared_path)
+                os.makedirs(self._shared_path, exist_ok=True)
+                with open(marker, "w") as f:
+                    json.dump({"requires": list(requirements)}, f)
+        remove_stale_build_envs(project, keep=self._shared_path)
+
+    def _install(self, requirements: Iterable[str], path: str) -> None:
         missing = self.check_requirements(requirements)
         if not missing:
             return
+        if getattr(_install_state, "active", False):
+            # Installing build requirements needs to build another package, fall back
+            # to pip to avoid resolving recursively.
+            self._pip_install(missing, path)
+            return
+        _install_state.active = True
+        try:
+            self._pdm_install(missing, path)
+        except Exception as e:
+            # Whatever goes wrong with PDM's resolver or installer, pip gets a chance.
+            logger.debug("Failed to install build requirements with PDM: %s", e)
+        finally:
+            _install_state.active = False
+        # Let pip handle what PDM failed to provide, e.g. requirements that are
+        # only satisfied by sources outside of the project's.
+        missing = self.check_requirements(missing)
+        if missing:
+            self._pip_install(missing, path)
+
+    def _pdm_install(self, requirements: Iterable[str], path: str) -> None:
+        """Resolve the requirements with PDM's resolver and install them into the
+        prefix, reusing the caches of metadata and wheels.
+        """
+        from pdm.installers import Installer
+        from pdm.models.environment import PrefixEnvironment
+        from pdm.models.requirements import parse_requirement
+        from pdm.resolver import resolve
+        from pdm.resolver.providers import BuildEnvProvider
+
+        project = self._env.project
+        environment = PrefixEnvironment(project, path)
+        reqs = [parse_requirement(line) for line in requirements]
+        reqs = [
+            req
+            for req in reqs
+            if not req.marker or req.marker.evaluate(environment.marker_environment)
+        ]
+        repository = project.core.repository_class(project.sources, environment)
+        provider = BuildEnvProvider(
+            repository, environment.python_requires, project.allow_prereleases
+        )
+        resolver = project.core.resolver_class(provider, BaseReporter())
+        logger.debug("Installing build requirements: %s", ", ".join(requirements))
+        try:
+            mapping, *_ = resolve(
+                resolver,
+                reqs,
+                environment.python_requires,
+                int(project.config["strategy.resolve_max_rounds"]),
+            )
+        except ResolverException as e:
+            raise BuildError(f"Can't resolve the build requirements: {e}") from e
+        finally:
+            repository.flush_cache()
+        installer = Installer(environment)
+        for candidate in mapping.values():
+            installer.install(candidate)
 
+    def _pip_install(self, requirements: Iterable[str], path: str) -> None:
         with tempfile.NamedTemporaryFile(
             "w+", prefix="pdm-build-reqs-", suffix=".txt", delete=False
         ) as req_file:
-            req_file.write(os.linesep.join(missing))
+            req_file.write(os.linesep.join(requirements))
             req_file.close()
             cmd = self._env.pip_command + [
                 "install",
                 "--ignore-installed",
                 "--prefix",
-                self._path,
+                path,
             ]
             cmd.extend(prepare_pip_source_args(self._env.project.sources))
             cmd.extend(["-r", req_file.name])
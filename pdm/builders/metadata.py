@@ -0,0 +1,20 @@
+import os
+from typing import Any, Mapping, Optional
+
+from pdm.builders.base import EnvBuilder
+
+
+class EnvMetadataBuilder(EnvBuilder):
+    """Prepare the .dist-info directory in isolated env with managed Python,
+    without building the wheel.
+    """
+
+    def build(
+        self, out_dir: str, config_settings: Optional[Mapping[str, Any]] = None
+    ) -> str:
+        self.install(self._build_system["requires"], shared=True)
+        requires = self._hook.get_requires_for_build_wheel(config_settings)
+        self.install(requires)
+        # Backends not providing the hook fall back to building the wheel.
+        dirname = self._hook.prepare_metadata_for_build_wheel(out_dir, config_settings)
+        return os.path.join(out_dir, dirname)
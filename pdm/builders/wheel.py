@@ -10,7 +10,7 @@ class EnvWheelBuilder(EnvBuilder):
     def build(
         self, out_dir: str, config_settings: Optional[Mapping[str, Any]] = None
     ) -> str:
-        self.install(self._build_system["requires"])
+        self.install(self._build_system["requires"], shared=True)
         requires = self._hook.get_requires_for_build_wheel(config_settings)
         self.install(requires)
         filename = self._hook.build_wheel(out_dir, config_settings)
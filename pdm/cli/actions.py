@@ -16,6 +16,7 @@ from resolvelib.resolvers import ResolutionImpossible, ResolutionTooDeep, Resolv
 
 from pdm import termui
 from pdm.cli.utils import (
+    PEP582_PATH,
     check_project_file,
     find_importable_files,
     format_lockfile,
@@ -34,11 +35,9 @@ from pdm.models.python import PythonInfo
 from pdm.models.requirements import Requirement, parse_requirement, strip_extras
 from pdm.models.specifiers import get_specifier
 from pdm.project import Project
-from pdm.resolver import resolve
+from pdm.resolver import resolve, walk_lockfile
 from pdm.utils import normalize_name
 
-PEP582_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "pep582")
-
 
 def do_lock(
     project: Project,
@@ -87,6 +86,8 @@ def do_lock(
             else:
                 data = format_lockfile(mapping, dependencies, summaries)
                 spin.succeed(f"{termui.Emoji.LOCK} Lock successful")
+            finally:
+                provider.repository.flush_cache()
 
     project.write_lockfile(data, write=not dry_run)
 
@@ -105,6 +106,14 @@ def resolve_candidates_from_lockfile(
     ]
     with ui.logging("install-resolve"):
         with ui.open_spinner("Resolving packages from lockfile..."):
+            mapping = walk_lockfile(
+                project.locked_repository, reqs, project.environment.python_requires
+            )
+            if mapping is not None:
+                return mapping
+            termui.logger.debug(
+                "The lockfile can't be walked directly, resolve it instead"
+            )
             reporter = BaseReporter()
             provider = project.get_provider(for_install=True)
             resolver: Resolver = project.core.resolver_class(provider, reporter)
@@ -406,15 +415,13 @@ def do_build(
     with project.core.ui.logging("build"):
         if sdist:
             project.core.ui.echo("Building sdist...")
-            loc = EnvSdistBuilder(project.root, project.environment).build(
-                dest, config_settings
-            )
+            with EnvSdistBuilder(project.root, project.environment) as sdist_builder:
+                loc = sdist_builder.build(dest, config_settings)
             project.core.ui.echo(f"Built sdist at {loc}")
         if wheel:
             project.core.ui.echo("Building wheel...")
-            loc = EnvWheelBuilder(project.root, project.environment).build(
-                dest, config_settings
-            )
+            with EnvWheelBuilder(project.root, project.environment) as wheel_builder:
+                loc = wheel_builder.build(dest, config_settings)
             project.core.ui.echo(f"Built wheel at {loc}")
 
 
@@ -0,0 +1,28 @@
+"""Built-in subcommands of PDM.
+
+The command modules are imported only when the subcommand is selected, so the
+names and help texts are kept here to build the parser without importing them.
+"""
+
+#: A mapping of command name to (module name, help text)
+COMMANDS = {
+    "add": ("add", "Add package(s) to pyproject.toml and install them"),
+    "build": ("build", "Build artifacts for distribution"),
+    "cache": ("cache", "Control the caches of PDM"),
+    "completion": ("completion", "Generate completion scripts for the given shell"),
+    "config": ("config", "Display the current configuration"),
+    "export": ("export", "Export the locked packages set to other formats"),
+    "import": ("import_cmd", "Import project metadata from other formats"),
+    "info": ("info", "Show the project information"),
+    "init": ("init", "Initialize a pyproject.toml for PDM"),
+    "install": ("install", "Install dependencies from lock file"),
+    "list": ("list", "List packages installed in the current working set"),
+    "lock": ("lock", "Resolve and lock dependencies"),
+    "remove": ("remove", "Remove packages from pyproject.toml"),
+    "run": ("run", "Run commands or scripts with local packages loaded"),
+    "search": ("search", "Search for PyPI packages"),
+    "show": ("show", "Show the package information"),
+    "sync": ("sync", "Synchronize the current working set with lock file"),
+    "update": ("update", "Update package(s) in pyproject.toml"),
+    "use": ("use", "Use the given python version or path as base interpreter"),
+}
@@ -1,5 +1,7 @@
 import argparse
+import contextlib
 import os
+from typing import Iterable, Iterator, List, Tuple
 
 from pdm import termui
 from pdm.cli.commands.base import BaseCommand
@@ -38,22 +40,41 @@ def format_size(size: float) -> str:
         return "{} bytes".format(int(size))
 
 
+def find_cache_files(directory: str, pattern: str) -> List[str]:
+    """Find the cache files matching the pattern, excluding the lock files."""
+    return [
+        file for file in find_files(directory, pattern) if not file.endswith(".lock")
+    ]
+
+
+@contextlib.contextmanager
+def lock_caches(project: Project, cache_types: Iterable[str]) -> Iterator[None]:
+    """Wait for other processes to release the given caches and lock them."""
+    with contextlib.ExitStack() as stack:
+        for cache_type in cache_types:
+            stack.enter_context(project.cache_lock(cache_type))
+        yield
+
+
 def remove_cache_files(project: Project, pattern: str) -> None:
     if not pattern:
         raise PdmUsageError("Please provide a pattern")
 
     if pattern == "*":
-        files = list(find_files(project.cache_dir.as_posix(), pattern))
+        cache_types = ClearCommand.CACHE_TYPES
+        files = find_cache_files(project.cache_dir.as_posix(), pattern)
     else:
         # Only remove wheel files which specific pattern is given
-        files = list(find_files(project.cache("wheels").as_posix(), pattern))
+        cache_types = ("wheels",)
+        files = find_cache_files(project.cache("wheels").as_posix(), pattern)
 
     if not files:
         raise PdmUsageError("No matching files found")
 
-    for file in files:
-        os.unlink(file)
-        project.core.ui.echo(f"Removed {file}", verbosity=termui.DETAIL)
+    with lock_caches(project, cache_types):
+        for file in files:
+            os.unlink(file)
+            project.core.ui.echo(f"Removed {file}", verbosity=termui.DETAIL)
     project.core.ui.echo(f"{len(files)} file{'s' if len(files) > 1 else ''} removed")
 
 
@@ -61,7 +82,16 @@ class ClearCommand(BaseCommand):
     """Clean all the files under cache directory"""
 
     arguments = [verbose_option]
-    CACHE_TYPES = ("hashes", "http", "wheels", "metadata")
+    CACHE_TYPES: Tuple[str, ...] = (
+        "hashes",
+        "http",
+        "wheels",
+        "metadata",
+        "interpreters",
+        "build_envs",
+        "failures",
+        "packages",
+    )
 
     def add_arguments(self, parser: argparse.ArgumentParser) -> None:
         parser.add_argument("type", nargs="?", help="Clear the given type of caches")
@@ -69,17 +99,19 @@ class ClearCommand(BaseCommand):
     def handle(self, project: Project, options: argparse.Namespace) -> None:
         if not options.type:
             cache_parent = project.cache_dir
+            cache_types = self.CACHE_TYPES
         elif options.type not in self.CACHE_TYPES:
             raise PdmUsageError(
                 f"Invalid cache type {options.type}, should one of {self.CACHE_TYPES}"
             )
         else:
             cache_parent = project.cache(options.type)
+            cache_types = (options.type,)
 
         with project.core.ui.open_spinner(
             f"Clearing {options.type or 'all'} caches..."
-        ) as spinner:
-            files = list(find_files(cache_parent.as_posix(), "*"))
+        ) as spinner, lock_caches(project, cache_types):
+            files = find_cache_files(cache_parent.as_posix(), "*")
             for file in files:
                 os.unlink(file)
             spinner.succeed(f"{len(files)} file{'s' if len(files) > 1 else ''} removed")
@@ -110,7 +142,9 @@ class ListCommand(BaseCommand):
     def handle(self, project: Project, options: argparse.Namespace) -> None:
         rows = [
             (format_size(file_size(file)), os.path.basename(file))
-            for file in find_files(project.cache("wheels").as_posix(), options.pattern)
+            for file in find_cache_files(
+                project.cache("wheels").as_posix(), options.pattern
+            )
         ]
         project.core.ui.display_columns(rows, [">Size", "Filename"])
 
@@ -131,9 +165,13 @@ class InfoCommand(BaseCommand):
                 ("http", "HTTP Cache"),
                 ("wheels", "Wheels Cache"),
                 ("metadata", "Metadata Cache"),
+                ("interpreters", "Interpreter Info Cache"),
+                ("build_envs", "Build Environments Cache"),
+                ("failures", "Failure Cache"),
+                ("packages", "Package Store"),
             ]:
                 cache_location = project.cache(name)
-                files = list(find_files(cache_location.as_posix(), "*"))
+                files = find_cache_files(cache_location.as_posix(), "*")
                 size = directory_size(cache_location.as_posix())
                 output.append(f"  {termui.cyan(description)}: {cache_location}")
                 output.append(f"    Files: {len(files)}, Size: {format_size(size)}")
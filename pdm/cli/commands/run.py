@@ -8,9 +8,8 @@ import sys
 from typing import Any, Mapping, MutableMapping, Optional, Sequence, Tuple, Union, cast
 
 from pdm import termui
-from pdm.cli.actions import PEP582_PATH
 from pdm.cli.commands.base import BaseCommand
-from pdm.cli.utils import check_project_file
+from pdm.cli.utils import PEP582_PATH, check_project_file
 from pdm.exceptions import PdmUsageError
 from pdm.project import Project
 
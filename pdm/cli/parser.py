@@ -0,0 +1,207 @@
+"""The argument parser of PDM and its help formatter.
+
+This module is imported by ``pdm.core`` to build the parser, so it must not import
+the modules of the subcommands, which are loaded only when they are used.
+"""
+from __future__ import annotations
+
+import argparse
+from argparse import Action
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    MutableMapping,
+    Optional,
+)
+
+import cfonts
+
+from pdm import termui
+
+if TYPE_CHECKING:
+    from pdm.cli.commands.base import BaseCommand
+
+
+class PdmFormatter(argparse.HelpFormatter):
+    def _format_action(self, action: Action) -> str:
+        # determine the required width and the entry label
+        help_position = min(self._action_max_length + 2, self._max_help_position)
+        help_width = max(self._width - help_position, 11)
+        action_width = help_position - self._current_indent - 2
+        action_header = self._format_action_invocation(action)
+
+        # no help; start on same line and add a final newline
+        if not action.help:
+            tup = self._current_indent, "", action_header
+            action_header = "%*s%s\n" % tup
+
+        # short action name; start on the same line and pad two spaces
+        elif len(action_header) <= action_width:
+            tup = self._current_indent, "", action_width, action_header  # type: ignore
+            action_header = "%*s%-*s  " % tup  # type: ignore
+            indent_first = 0
+
+        # long action name; start on the next line
+        else:
+            tup = self._current_indent, "", action_header  # type: ignore
+            action_header = "%*s%s\n" % tup
+            indent_first = help_position
+
+        # collect the pieces of the action help
+        parts = [termui.cyan(action_header)]
+
+        # if there was help for the action, add lines of help text
+        if action.help:
+            help_text = self._expand_help(action)
+            help_lines = self._split_lines(help_text, help_width)
+            parts.append("%*s%s\n" % (indent_first, "", help_lines[0]))
+            for line in help_lines[1:]:
+                parts.append("%*s%s\n" % (help_position, "", line))
+
+        # or add a newline if the description doesn't end with one
+        elif not action_header.endswith("\n"):
+            parts.append("\n")
+
+        # if there are any sub-actions, add their help as well
+        for subaction in self._iter_indented_subactions(action):
+            parts.append(self._format_action(subaction))
+
+        # return a single string
+        return self._join_parts(parts)
+
+
+class PdmParser(argparse.ArgumentParser):
+    def format_help(self) -> str:
+        formatter = self._get_formatter()
+
+        if getattr(self, "is_root", False):
+            banner = (
+                cfonts.render(
+                    "PDM",
+                    font="slick",
+                    gradient=["bright_red", "bright_green"],
+                    space=False,
+                )
+                + "\n"
+            )
+            formatter._add_item(lambda x: x, [banner])
+            self._positionals.title = "Commands"
+        self._optionals.title = "Options"
+        # description
+        formatter.add_text(self.description)
+
+        # usage
+        formatter.add_usage(
+            self.usage or "",
+            self._actions,
+            self._mutually_exclusive_groups,
+            prefix=termui.yellow("Usage", bold=True) + ": ",
+        )
+
+        # positionals, optionals and user-defined groups
+        for action_group in self._action_groups:
+            formatter.start_section(
+                termui.yellow(action_group.title, bold=True)
+                if action_group.title
+                else None
+            )
+            formatter.add_text(action_group.description)
+            formatter.add_arguments(action_group._group_actions)
+            formatter.end_section()
+
+        # epilog
+        formatter.add_text(self.epilog)
+        # determine help from format above
+        return formatter.format_help()
+
+
+class _LazyParserMap(MutableMapping[str, argparse.ArgumentParser]):
+    """The parsers of the subcommands by name, where the parser of a lazy subcommand
+    is built by ``load(name)`` on first access.
+    """
+
+    def __init__(self, load: Callable[[str], None]) -> None:
+        self._load = load
+        self._parsers: Dict[str, Optional[argparse.ArgumentParser]] = {}
+        #: The subcommand whose parser is being built, which isn't registered yet.
+        self.loading: Optional[str] = None
+
+    def add_lazy(self, name: str) -> None:
+        self._parsers[name] = None
+
+    def __getitem__(self, name: str) -> argparse.ArgumentParser:
+        if self._parsers[name] is None:
+            self.loading = name
+            try:
+                self._load(name)
+            finally:
+                self.loading = None
+        parser = self._parsers[name]
+        assert parser is not None
+        return parser
+
+    def __setitem__(self, name: str, parser: argparse.ArgumentParser) -> None:
+        self._parsers[name] = parser
+
+    def __delitem__(self, name: str) -> None:
+        del self._parsers[name]
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._parsers and name != self.loading
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._parsers)
+
+    def __len__(self) -> int:
+        return len(self._parsers)
+
+
+class LazySubParsersAction(argparse._SubParsersAction):
+    """A subparsers action that creates the parser of a subcommand when it is
+    first accessed, so that the modules of other subcommands are never imported.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._lazy_commands: Dict[str, Callable[[], type[BaseCommand]]] = {}
+        self._parsers = _LazyParserMap(self._load_parser)
+        self._name_parser_map = self.choices = self._parsers  # type: ignore
+
+    def add_lazy_parser(
+        self, name: str, loader: Callable[[], type[BaseCommand]], help: str
+    ) -> None:
+        """Register a subcommand whose command class is returned by the loader."""
+        self._remove_parser(name)
+        self._lazy_commands[name] = loader
+        self._parsers.add_lazy(name)
+        self._choices_actions.append(self._ChoicesPseudoAction(name, (), help))
+
+    def _load_parser(self, name: str) -> None:
+        choices_actions = self._choices_actions
+        self._choices_actions = []
+        try:
+            self._lazy_commands[name]().register_to(self, name)
+            del self._lazy_commands[name]
+        finally:
+            # Keep the subcommand at its place in the help.
+            loaded = {action.dest: action for action in self._choices_actions}
+            self._choices_actions = [
+                loaded.pop(action.dest, action) for action in choices_actions
+            ] + list(loaded.values())
+
+    def _remove_parser(self, name: str) -> None:
+        if name not in self._parsers:
+            return
+        del self._parsers[name]
+        self._lazy_commands.pop(name, None)
+        self._choices_actions = [
+            action for action in self._choices_actions if action.dest != name
+        ]
+
+    def add_parser(self, name: str, **kwargs: Any) -> argparse.ArgumentParser:
+        # A later registration overrides the existing subcommand of the same name.
+        self._remove_parser(name)
+        return super().add_parser(name, **kwargs)
@@ -1,19 +1,17 @@
 from __future__ import annotations
 
-import argparse
 import os
-from argparse import Action
 from collections import ChainMap
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, Iterable, Mapping, MutableMapping, cast
 
 import atoml
-import cfonts
 from packaging.specifiers import SpecifierSet
 from pip._vendor.pkg_resources import Distribution
 from resolvelib.structs import DirectedGraph
 
 from pdm import termui
+from pdm.cli.parser import PdmFormatter, PdmParser  # noqa: F401
 from pdm.exceptions import PdmUsageError, ProjectError
 from pdm.formats import FORMATS
 from pdm.formats.base import make_array, make_inline_table
@@ -27,98 +25,7 @@ if TYPE_CHECKING:
 
     from pdm.models.candidates import Candidate
 
-
-class PdmFormatter(argparse.HelpFormatter):
-    def _format_action(self, action: Action) -> str:
-        # determine the required width and the entry label
-        help_position = min(self._action_max_length + 2, self._max_help_position)
-        help_width = max(self._width - help_position, 11)
-        action_width = help_position - self._current_indent - 2
-        action_header = self._format_action_invocation(action)
-
-        # no help; start on same line and add a final newline
-        if not action.help:
-            tup = self._current_indent, "", action_header
-            action_header = "%*s%s\n" % tup
-
-        # short action name; start on the same line and pad two spaces
-        elif len(action_header) <= action_width:
-            tup = self._current_indent, "", action_width, action_header  # type: ignore
-            action_header = "%*s%-*s  " % tup  # type: ignore
-            indent_first = 0
-
-        # long action name; start on the next line
-        else:
-            tup = self._current_indent, "", action_header  # type: ignore
-            action_header = "%*s%s\n" % tup
-            indent_first = help_position
-
-        # collect the pieces of the action help
-        parts = [termui.cyan(action_header)]
-
-        # if there was help for the action, add lines of help text
-        if action.help:
-            help_text = self._expand_help(action)
-            help_lines = self._split_lines(help_text, help_width)
-            parts.append("%*s%s\n" % (indent_first, "", help_lines[0]))
-            for line in help_lines[1:]:
-                parts.append("%*s%s\n" % (help_position, "", line))
-
-        # or add a newline if the description doesn't end with one
-        elif not action_header.endswith("\n"):
-            parts.append("\n")
-
-        # if there are any sub-actions, add their help as well
-        for subaction in self._iter_indented_subactions(action):
-            parts.append(self._format_action(subaction))
-
-        # return a single string
-        return self._join_parts(parts)
-
-
-class PdmParser(argparse.ArgumentParser):
-    def format_help(self) -> str:
-        formatter = self._get_formatter()
-
-        if getattr(self, "is_root", False):
-            banner = (
-                cfonts.render(
-                    "PDM",
-                    font="slick",
-                    gradient=["bright_red", "bright_green"],
-                    space=False,
-                )
-                + "\n"
-            )
-            formatter._add_item(lambda x: x, [banner])
-            self._positionals.title = "Commands"
-        self._optionals.title = "Options"
-        # description
-        formatter.add_text(self.description)
-
-        # usage
-        formatter.add_usage(
-            self.usage or "",
-            self._actions,
-            self._mutually_exclusive_groups,
-            prefix=termui.yellow("Usage", bold=True) + ": ",
-        )
-
-        # positionals, optionals and user-defined groups
-        for action_group in self._action_groups:
-            formatter.start_section(
-                termui.yellow(action_group.title, bold=True)
-                if action_group.title
-                else None
-            )
-            formatter.add_text(action_group.description)
-            formatter.add_arguments(action_group._group_actions)
-            formatter.end_section()
-
-        # epilog
-        formatter.add_text(self.epilog)
-        # determine help from format above
-        return formatter.format_help()
+PEP582_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "pep582")
 
 
 class Package:
@@ -3,48 +3,80 @@ from __future__ import annotations
 import argparse
 import importlib
 import os
-import pkgutil
 import sys
-from typing import Any, List, Optional, Type, cast
+from typing import TYPE_CHECKING, Any, Callable, Iterable, List, Optional, Type, cast
 
 import click
-from pip._vendor import pkg_resources
 from resolvelib import Resolver
 
 from pdm import termui
-from pdm.cli.actions import migrate_pyproject, print_pep582_command
-from pdm.cli.commands.base import BaseCommand
+from pdm.cli.commands import COMMANDS
 from pdm.cli.options import ignore_python_option, pep582_option, verbose_option
-from pdm.cli.utils import PdmFormatter, PdmParser
+from pdm.cli.parser import LazySubParsersAction, PdmFormatter, PdmParser
 from pdm.exceptions import PdmUsageError
-from pdm.installers import Synchronizer
-from pdm.models.repositories import PyPIRepository
-from pdm.project import Project
-from pdm.project.config import Config, ConfigItem
 
-COMMANDS_MODULE_PATH: str = importlib.import_module(
-    "pdm.cli.commands"
-).__path__  # type: ignore
+if sys.version_info >= (3, 8):
+    import importlib.metadata as importlib_metadata
+else:
+    import importlib_metadata
+
+if TYPE_CHECKING:
+    from pdm.cli.commands.base import BaseCommand
+    from pdm.project import Project
+    from pdm.project.config import ConfigItem
+
+
+def iter_entry_points(group: str) -> Iterable[importlib_metadata.EntryPoint]:
+    """Return the entry points of the installed distributions in the group."""
+    entry_points = importlib_metadata.entry_points()
+    if hasattr(entry_points, "select"):
+        return entry_points.select(group=group)  # type: ignore
+    return entry_points.get(group, [])  # type: ignore
+
+
+def _command_loader(module_name: str) -> Callable[[], Type[BaseCommand]]:
+    def load() -> Type[BaseCommand]:
+        module = importlib.import_module(f"pdm.cli.commands.{module_name}")
+        return module.Command  # type: ignore
+
+    return load
+
+
+class _DefaultClass:
+    """A class attribute of the core that is imported on first access, unless it is
+    replaced on the instance before.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.module, _, self.name = path.rpartition(".")
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.attr = name
+
+    def __get__(self, instance: Any, owner: type) -> Any:
+        if instance is None:
+            return self
+        value = getattr(importlib.import_module(self.module), self.name)
+        instance.__dict__[self.attr] = value
+        return value
 
 
 class Core:
     """A high level object that manages all classes and configurations"""
 
+    # The modules are imported only when a command uses them.
+    project_class = _DefaultClass("pdm.project.Project")
+    repository_class = _DefaultClass("pdm.models.repositories.PyPIRepository")
+    synchronizer_class = _DefaultClass("pdm.installers.Synchronizer")
+
     def __init__(self) -> None:
-        if sys.version_info >= (3, 8):
-            import importlib.metadata as importlib_metadata
-        else:
-            import importlib_metadata
         self.version = importlib_metadata.version(__name__.split(".")[0])
 
-        self.project_class = Project
-        self.repository_class = PyPIRepository
         self.resolver_class = Resolver
-        self.synchronizer_class = Synchronizer
 
         self.ui = termui.UI()
         self.parser: Optional[PdmParser] = None
-        self.subparsers: Optional[argparse._SubParsersAction] = None
+        self.subparsers: Optional[LazySubParsersAction] = None
 
     def init_parser(self) -> None:
         self.parser = PdmParser(
@@ -66,14 +98,15 @@ class Core:
         ignore_python_option.add_to_parser(self.parser)
         pep582_option.add_to_parser(self.parser)
 
-        self.subparsers = self.parser.add_subparsers()
-        for _, name, _ in pkgutil.iter_modules(COMMANDS_MODULE_PATH):
-            module = importlib.import_module(f"pdm.cli.commands.{name}", __name__)
-            try:
-                klass = module.Command  # type: ignore
-            except AttributeError:
-                continue
-            self.register_command(klass, klass.name or name)
+        self.subparsers = cast(
+            LazySubParsersAction,
+            self.parser.add_subparsers(action=LazySubParsersAction),
+        )
+        # The command modules are imported only when the subcommand is selected.
+        for name, (module_name, help_text) in COMMANDS.items():
+            self.subparsers.add_lazy_parser(
+                name, _command_loader(module_name), help_text
+            )
 
     def __call__(self, *args: Any, **kwargs: Any) -> None:
         return self.main(*args, **kwargs)
@@ -97,6 +130,8 @@ class Core:
             )
             options.project = project
 
+        from pdm.cli.actions import migrate_pyproject
+
         migrate_pyproject(options.project)
 
     def create_project(
@@ -112,8 +147,6 @@ class Core:
         **extra: Any,
     ) -> None:
         """The main entry function"""
-        from pdm.models.pip_shims import global_tempdir_manager
-
         self.init_parser()
         self.load_plugins()
         assert self.parser
@@ -124,6 +157,8 @@ class Core:
             os.environ["PDM_IGNORE_SAVED_PYTHON"] = "1"
 
         if options.pep582:
+            from pdm.cli.actions import print_pep582_command
+
             print_pep582_command(self.ui, options.pep582)
             sys.exit(0)
 
@@ -135,6 +170,8 @@ class Core:
             self.parser.print_help()
             sys.exit(1)
         else:
+            from pdm.models.pip_shims import global_tempdir_manager
+
             try:
                 with global_tempdir_manager():
                     f(options.project, options)
@@ -163,6 +200,8 @@ class Core:
     @staticmethod
     def add_config(name: str, config_item: ConfigItem) -> None:
         """Add a config item to the configuration class"""
+        from pdm.project.config import Config
+
         Config.add_config(name, config_item)
 
     def load_plugins(self) -> None:
@@ -175,7 +214,7 @@ class Core:
             ...
 
         """
-        for plugin in pkg_resources.iter_entry_points("pdm"):  # type: ignore
+        for plugin in iter_entry_points("pdm"):
             plugin.load()(self)
 
 
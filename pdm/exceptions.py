@@ -70,3 +70,7 @@ class NoPythonVersion(PdmException):
 
 class BuildError(PdmException, RuntimeError):
     pass
+
+
+class BuildBackendError(BuildError):
+    """The build backend failed, which happens again for the same source."""
@@ -1,17 +1,23 @@
 from __future__ import annotations
 
+import contextlib
+import os
 import pathlib
-from typing import TYPE_CHECKING
+from concurrent.futures import Executor
+from typing import TYPE_CHECKING, Dict, List, Optional, Union
 
 import distlib.scripts
 from pip._vendor.pkg_resources import EggInfoDistribution
 
 from pdm import termui
+from pdm.installers.uninstallers import StashedRemoval, stash_distribution
+from pdm.installers.wheels import compile_bytecode, install_wheel
 from pdm.models import pip_shims
 from pdm.models.requirements import parse_requirement
 
 if TYPE_CHECKING:
     from distlib.wheel import Wheel
+    from pip._internal.req.req_uninstall import UninstallPathSet
     from pip._vendor.pkg_resources import Distribution
 
     from pdm.models.candidates import Candidate
@@ -30,17 +36,52 @@ def format_dist(dist: Distribution) -> str:
     return formatter.format(version=termui.yellow(dist.version), path=path)
 
 
+def _install_wheel(
+    wheel_path: str,
+    paths: Dict[str, str],
+    executable: str,
+    store: Optional[str] = None,
+) -> List[str]:
+    """Install the wheel with the scripts pointing to the given interpreter. All the
+    arguments can be pickled, to run it in another process.
+    """
+    maker = distlib.scripts.ScriptMaker(None, None)
+    maker.variants = set(("",))
+    maker.executable = distlib.scripts.enquote_executable(executable)
+    return install_wheel(wheel_path, paths, maker, store)
+
+
 class Installer:  # pragma: no cover
     """The installer that performs the installation and uninstallation actions."""
 
-    def __init__(self, environment: Environment, auto_confirm: bool = True) -> None:
+    def __init__(
+        self,
+        environment: Environment,
+        auto_confirm: bool = True,
+        deferred_sources: Optional[List[str]] = None,
+        executor: Optional[Executor] = None,
+    ) -> None:
+        """
+        :param environment: the environment to install into.
+        :param auto_confirm: whether to uninstall without confirmation.
+        :param deferred_sources: a list to collect the installed source files into,
+            to compile them later. If not given, they are compiled after each wheel.
+        :param executor: the executor to unpack the wheels in, e.g. a pool of
+            processes. If not given, they are unpacked in the calling thread.
+        """
         self.environment = environment
         self.auto_confirm = auto_confirm
+        self.deferred_sources = deferred_sources
+        self.executor = executor
         # XXX: Patch pip to make it work under multi-thread mode
         pip_shims.pip_logging._log_state.indentation = 0
 
-    def install(self, candidate: Candidate) -> None:
+    def prepare(self, candidate: Candidate) -> None:
+        """Download the candidate and build it if needed, to be installed."""
         candidate.get_metadata(allow_all_wheels=False, raising=True)
+
+    def install(self, candidate: Candidate) -> None:
+        self.prepare(candidate)
         if candidate.req.editable:
             self.install_editable(candidate.ireq)
         else:
@@ -48,13 +89,26 @@ class Installer:  # pragma: no cover
 
     def install_wheel(self, wheel: Wheel) -> None:
         paths = self.environment.get_paths()
-        maker = distlib.scripts.ScriptMaker(None, None)
-        maker.variants = set(("",))
-        enquoted_executable = distlib.scripts.enquote_executable(
-            self.environment.interpreter.executable
-        )
-        maker.executable = enquoted_executable
-        wheel.install(paths, maker)
+        executable = self.environment.interpreter.executable
+        wheel_path = os.path.join(wheel.dirname, wheel.filename)
+        project = self.environment.project
+        with contextlib.ExitStack() as stack:
+            store: Optional[str] = None
+            if project.config["install.cache"]:
+                stack.enter_context(project.cache_lock("packages", shared=True))
+                store = project.cache("packages").as_posix()
+            if self.executor is not None:
+                sources = self.executor.submit(
+                    _install_wheel, wheel_path, paths, executable, store
+                ).result()
+            else:
+                sources = _install_wheel(wheel_path, paths, executable, store)
+        if not project.config["install.compile_bytecode"]:
+            return
+        if self.deferred_sources is not None:
+            self.deferred_sources.extend(sources)
+        else:
+            compile_bytecode(self.environment.interpreter.executable, sources)
 
     def install_editable(self, ireq: pip_shims.InstallRequirement) -> None:
         from pdm.builders.base import EnvBuilder
@@ -75,11 +129,25 @@ class Installer:  # pragma: no cover
         builder.install(["setuptools"])
         builder.subprocess_runner(install_args, ireq.unpacked_source_directory)
 
-    def uninstall(self, dist: Distribution) -> None:
+    def stash(
+        self, dist: Distribution
+    ) -> Union[StashedRemoval, UninstallPathSet, None]:
+        """Move the files of the distribution aside. Call ``commit()`` on the result
+        to remove them, or ``rollback()`` to restore them.
+        """
+        if not is_dist_editable(dist):
+            removal = stash_distribution(
+                dist, self.environment.is_local, self.environment.get_paths().values()
+            )
+            if removal is not None:
+                return removal
+        # Let pip remove the distributions without the record of installed files.
         req = parse_requirement(dist.project_name)
         ireq = pip_shims.install_req_from_line(dist.project_name)
         ireq.req = req
+        return ireq.uninstall(auto_confirm=self.auto_confirm)
 
-        pathset = ireq.uninstall(auto_confirm=self.auto_confirm)
-        if pathset:
-            pathset.commit()
+    def uninstall(self, dist: Distribution) -> None:
+        removal = self.stash(dist)
+        if removal:
+            removal.commit()
@@ -0,0 +1,101 @@
+"""The stages of the synchronization that overlap with the install jobs.
+
+The candidates are downloaded (and built if needed) ahead of their install jobs by
+a pool of network workers, and the installed source files are compiled to bytecode
+by a background thread, while other packages are still being installed.
+"""
+from __future__ import annotations
+
+import collections
+import contextlib
+import queue
+import threading
+import time
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from pdm import termui
+from pdm.installers.wheels import compile_bytecode
+
+
+class StageTimer:
+    """Record the time spent in each stage, summed over all workers."""
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.durations: Dict[str, float] = collections.defaultdict(float)
+        self.counts: Dict[str, int] = collections.defaultdict(int)
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def measure(self, stage: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.durations[stage] += elapsed
+                self.counts[stage] += 1
+
+    def format(self) -> str:
+        """Return the timings of the stages in one line."""
+        stages = [
+            f"{stage} {duration:.2f}s ({self.counts[stage]})"
+            for stage, duration in self.durations.items()
+        ]
+        elapsed = time.perf_counter() - self.started
+        return f"Stage timings: {', '.join(stages) or 'none'}, total {elapsed:.2f}s"
+
+
+class BytecodeCompiler:
+    """Compile the source files queued by the install jobs in a background thread.
+
+    The files are compiled in batches of at least ``batch_size`` files, to not start
+    the compiler processes for every small package. The queue holds at most
+    ``max_batches`` pending lists, and :meth:`put` blocks when it is full.
+    """
+
+    def __init__(
+        self,
+        executable: str,
+        timer: Optional[StageTimer] = None,
+        batch_size: int = 500,
+        max_batches: int = 64,
+    ) -> None:
+        self.executable = executable
+        self.timer = timer or StageTimer()
+        self.batch_size = batch_size
+        self.queued = self.compiled = 0
+        self._queue: queue.Queue[Optional[List[str]]] = queue.Queue(max_batches)
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def put(self, sources: Iterable[str]) -> None:
+        sources = list(sources)
+        if sources:
+            self.queued += len(sources)
+            self._queue.put(sources)
+
+    def _run(self) -> None:
+        batch: List[str] = []
+        while True:
+            sources = self._queue.get()
+            if sources is not None:
+                batch.extend(sources)
+            if batch and (sources is None or len(batch) >= self.batch_size):
+                try:
+                    with self.timer.measure("compile"):
+                        compile_bytecode(self.executable, batch)
+                except OSError as e:
+                    termui.logger.debug("Failed to compile bytecode: %s", e)
+                else:
+                    self.compiled += len(batch)
+                batch = []
+            if sources is None:
+                return
+
+    def close(self) -> int:
+        """Compile the remaining files and return the number of compiled files."""
+        self._queue.put(None)
+        self._thread.join()
+        return self.compiled
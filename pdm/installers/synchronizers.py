@@ -1,17 +1,32 @@
 from __future__ import annotations
 
+import contextlib
 import functools
 import multiprocessing
+import queue
 import traceback
 from concurrent.futures._base import Future
+from concurrent.futures.process import ProcessPoolExecutor
 from concurrent.futures.thread import ThreadPoolExecutor
-from typing import Any, Callable, Dict, List, Optional, Tuple, Union, cast
-
-from pip._vendor.pkg_resources import Distribution
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+    cast,
+)
+
+from pip._vendor.pkg_resources import Distribution, Requirement
 
 from pdm import termui
-from pdm.exceptions import InstallationError
+from pdm.exceptions import CandidateInfoNotFound, InstallationError, PdmUsageError
 from pdm.installers.installers import Installer, is_dist_editable
+from pdm.installers.pipeline import BytecodeCompiler, StageTimer
 from pdm.models.candidates import Candidate
 from pdm.models.environment import Environment
 from pdm.models.requirements import strip_extras
@@ -60,6 +75,10 @@ class DummyExecutor:
         return
 
 
+#: An install job of (kind, key), where kind is one of add, update and remove.
+Job = Tuple[str, str]
+
+
 class Synchronizer:
     """Synchronize the working set with given installation candidates"""
 
@@ -82,9 +101,17 @@ class Synchronizer:
         self.no_editable = no_editable
         self.install_self = install_self
 
-        self.parallel = environment.project.config["parallel_install"]
-        locked_repository = environment.project.locked_repository
-        self.all_candidate_keys = list(locked_repository.all_candidates)
+        config = environment.project.config
+        self.parallel = config["parallel_install"]
+        self.max_workers = config["install.max_workers"] or multiprocessing.cpu_count()
+        self.executor_kind = config["install.executor"]
+        if self.executor_kind not in ("thread", "process"):
+            raise PdmUsageError(
+                f"Unsupported install.executor {self.executor_kind!r}, "
+                "must be either thread or process"
+            )
+        self.locked_repository = environment.project.locked_repository
+        self.all_candidate_keys = list(self.locked_repository.all_candidates)
         self.working_set = environment.get_working_set()
         self.ui = environment.project.core.ui
 
@@ -92,17 +119,87 @@ class Synchronizer:
             for candidate in candidates.values():
                 candidate.req.editable = None  # type: ignore
         self.candidates = candidates
+        self.deferred_sources: List[str] = []
+        self.timer = StageTimer()
+        self.compiler: Optional[BytecodeCompiler] = None
+        self._prepared: Dict[str, Future[None]] = {}
+        self._wheel_executor: Optional[ProcessPoolExecutor] = None
 
-    def create_executor(
-        self,
-    ) -> Union[ThreadPoolExecutor, DummyExecutor]:
+    def create_executor(self) -> Union[ThreadPoolExecutor, DummyExecutor]:
         if self.parallel:
-            return ThreadPoolExecutor(max_workers=min(multiprocessing.cpu_count(), 8))
+            return ThreadPoolExecutor(max_workers=self.max_workers)
         else:
             return DummyExecutor()
 
+    @contextlib.contextmanager
+    def unpack_wheels_in_processes(self) -> Iterator[None]:
+        """Unpack the wheels in a pool of processes while in the context, if the
+        process executor is configured. The jobs still run in threads, and only
+        the unpacking with its explicit arguments is sent to the workers, which
+        are spawned instead of forked from this multi-threaded process.
+        """
+        if not self.parallel or self.executor_kind != "process":
+            yield
+            return
+        with ProcessPoolExecutor(
+            self.max_workers, mp_context=multiprocessing.get_context("spawn")
+        ) as executor:
+            self._wheel_executor = executor
+            try:
+                yield
+            finally:
+                self._wheel_executor = None
+
+    @property
+    def handlers(self) -> Dict[str, Callable[[str], Any]]:
+        return {
+            "add": self.install_candidate,
+            "update": self.update_candidate,
+            "remove": self.remove_distribution,
+        }
+
     def get_installer(self) -> Installer:
-        return Installer(self.environment)
+        return Installer(
+            self.environment,
+            deferred_sources=self.deferred_sources,
+            executor=self._wheel_executor,
+        )
+
+    def prepare_candidates(self, keys: List[str], executor: ThreadPoolExecutor) -> None:
+        """Download and build the candidates ahead of their install jobs."""
+        for key in keys:
+            if key in self.candidates and not self.candidates[key].req.editable:
+                self._prepared[key] = executor.submit(self._prepare_candidate, key)
+
+    def _prepare_candidate(self, key: str) -> None:
+        with self.timer.measure("download"):
+            self.get_installer().prepare(self.candidates[key])
+
+    def _wait_prepared(self, key: str) -> None:
+        future = self._prepared.pop(key, None)
+        if future is not None:
+            future.result()
+
+    def _feed_compiler(self) -> None:
+        if self.compiler is None:
+            return
+        # The list may be extended by the workers meanwhile.
+        count = len(self.deferred_sources)
+        self.compiler.put(self.deferred_sources[:count])
+        del self.deferred_sources[:count]
+
+    def compile_bytecode(self) -> None:
+        """Wait for the bytecode compilation of all installed wheels to finish."""
+        if self.compiler is None:
+            return
+        self._feed_compiler()
+        compiler, self.compiler = self.compiler, None
+        if not compiler.queued:
+            compiler.close()
+            return
+        with self.ui.open_spinner("Compiling bytecode...") as spinner:
+            compiled = compiler.close()
+            spinner.succeed(f"Compiled {compiled} files")
 
     @property
     def self_key(self) -> Optional[str]:
@@ -154,7 +251,9 @@ class Synchronizer:
         installer = self.get_installer()
         with self.ui.open_spinner(f"Installing {can.format()}...") as spinner:
             try:
-                installer.install(can)
+                self._wait_prepared(key)
+                with self.timer.measure("install"):
+                    installer.install(can)
             except Exception:
                 spinner.fail(f"Install {can.format()} failed")
                 raise
@@ -173,8 +272,18 @@ class Synchronizer:
             f"-> {termui.yellow(can.version)}..."
         ) as spinner:
             try:
-                installer.uninstall(dist)
-                installer.install(can)
+                self._wait_prepared(key)
+                with self.timer.measure("install"):
+                    removal = installer.stash(dist)
+                    try:
+                        installer.install(can)
+                    except Exception:
+                        # Restore the previous version.
+                        if removal:
+                            removal.rollback()
+                        raise
+                    if removal:
+                        removal.commit()
             except Exception:
                 spinner.fail(
                     f"Update {termui.green(key, bold=True)} "
@@ -198,7 +307,8 @@ class Synchronizer:
             f"Removing {termui.green(key, bold=True)} {termui.yellow(dist.version)}..."
         ) as spinner:
             try:
-                installer.uninstall(dist)
+                with self.timer.measure("remove"):
+                    installer.uninstall(dist)
             except Exception:
                 spinner.fail(
                     f"Remove {termui.green(key, bold=True)} "
@@ -212,6 +322,110 @@ class Synchronizer:
                 )
         return dist
 
+    def _get_dependency_keys(self, key: str) -> Set[str]:
+        """Return the keys of the locked dependencies of the candidate."""
+        try:
+            dependencies = self.locked_repository.get_dependencies(
+                self.candidates[key]
+            )[0]
+        except (KeyError, CandidateInfoNotFound):
+            return set()
+        return {strip_extras(dep.identify())[0] for dep in dependencies} - {key}
+
+    @staticmethod
+    def _get_requirement_keys(dist: Distribution) -> Set[str]:
+        """Return the keys of the requirements of the installed distribution."""
+        requirements: List[Requirement] = dist.requires()  # type: ignore
+        return {req.key for req in requirements}
+
+    def build_job_graph(self, to_do: Dict[str, List[str]]) -> Dict[Job, Set[Job]]:
+        """Return a map from each job to the jobs that must be done before it:
+
+        - The packaging tools are installed one by one before any other job.
+        - A package is installed after its dependencies in the lockfile.
+        - Editable packages are installed one by one after all other packages are
+          installed, as their build requirements may be among them.
+        - A package is removed after the packages that require it.
+        """
+        graph: Dict[Job, Set[Job]] = {}
+        installs: Dict[str, Job] = {}
+        removals: Dict[str, Job] = {}
+        for kind, keys in to_do.items():
+            for key in keys:
+                graph[(kind, key)] = set()
+                if kind == "remove":
+                    removals[key] = (kind, key)
+                else:
+                    installs[key] = (kind, key)
+
+        tools = [
+            job
+            for key in self.SEQUENTIAL_PACKAGES
+            for job in (removals.get(key), installs.get(key))
+            if job is not None
+        ]
+        editables = sorted(
+            job
+            for key, job in installs.items()
+            if key in self.candidates and self.candidates[key].req.editable
+        )
+        for job, deps in graph.items():
+            kind, key = job
+            if job in tools:
+                deps.update(tools[: tools.index(job)])
+                continue
+            deps.update(tools)
+            if job in editables:
+                deps.update(set(installs.values()) - set(tools) - set(editables))
+                deps.update(editables[: editables.index(job)])
+            elif kind == "remove":
+                deps.update(
+                    removals[other]
+                    for other in removals
+                    if key in self._get_requirement_keys(self.working_set[other])
+                )
+            else:
+                deps.update(
+                    installs[dep]
+                    for dep in self._get_dependency_keys(key)
+                    if dep in installs
+                )
+        return graph
+
+    def run_jobs(self, graph: Dict[Job, Set[Job]]) -> Dict[Job, BaseException]:
+        """Run the jobs with the executor, each as soon as the jobs it depends on
+        are done, whether they succeed or not. Return the errors of failed jobs.
+        """
+        pending = {job: set(deps) & set(graph) for job, deps in graph.items()}
+        done: queue.Queue[Tuple[Job, Union[Future, DummyFuture]]] = queue.Queue()
+        errors: Dict[Job, BaseException] = {}
+        running = 0
+
+        def on_done(job: Job, future: Union[Future, DummyFuture]) -> None:
+            done.put((job, future))
+
+        with self.create_executor() as executor, self.unpack_wheels_in_processes():
+            while pending or running:
+                ready = sorted(job for job, deps in pending.items() if not deps)
+                if not ready and not running:
+                    # Break the dependency cycle at an arbitrary job.
+                    ready = [min(pending)]
+                for job in ready:
+                    del pending[job]
+                    kind, key = job
+                    future = executor.submit(self.handlers[kind], key)
+                    running += 1
+                    future.add_done_callback(functools.partial(on_done, job))
+                job, future = done.get()
+                running -= 1
+                error = future.exception()
+                if error:
+                    errors[job] = error
+                self._feed_compiler()
+                for deps in pending.values():
+                    deps.discard(job)
+        return errors
+
     def _show_headline(self, packages: Dict[str, List[str]]) -> None:
         add, update, remove = packages["add"], packages["update"], packages["remove"]
         if not any((add, update, remove)):
@@ -265,33 +479,28 @@ class Synchronizer:
             return
 
         self._show_headline(to_do)
-        handlers = {
-            "add": self.install_candidate,
-            "update": self.update_candidate,
-            "remove": self.remove_distribution,
-        }
-        sequential_jobs = []
-        parallel_jobs = []
-
-        for kind in to_do:
-            for key in to_do[kind]:
-                if key in self.SEQUENTIAL_PACKAGES:
-                    sequential_jobs.append((kind, key))
-                elif key in self.candidates and self.candidates[key].req.editable:
-                    # Editable packages are installed sequentially.
-                    sequential_jobs.append((kind, key))
-                else:
-                    parallel_jobs.append((kind, key))
-
+        graph = self.build_job_graph(to_do)
         errors: List[str] = []
-        failed_jobs: List[Tuple[str, str]] = []
-
-        def update_progress(
-            future: Union[Future, DummyFuture], kind: str, key: str
-        ) -> None:
-            error = future.exception()
-            if error:
-                failed_jobs.append((kind, key))
+
+        with self.ui.logging("install"), self.environment.activate():
+            self.compiler = BytecodeCompiler(
+                self.environment.interpreter.executable, self.timer
+            )
+            with self.ui.indent("  "), contextlib.ExitStack() as stack:
+                if self.parallel:
+                    downloader = stack.enter_context(
+                        ThreadPoolExecutor(
+                            self.environment.project.config["pypi.max_connections"]
+                        )
+                    )
+                    self.prepare_candidates(to_update + to_add, downloader)
+                for i in range(self.retry_times + 1):
+                    failed = self.run_jobs(graph)
+                    if not failed or i == self.retry_times:
+                        break
+                    graph = {job: graph[job] for job in failed}
+                    self.ui.echo("Retry failed jobs")
+            for (kind, key), error in sorted(failed.items()):
                 errors.extend(
                     [f"{kind} {termui.green(key)} failed:\n"]
                     + traceback.format_exception(
@@ -299,24 +508,9 @@ class Synchronizer:
                     )
                 )
 
-        with self.ui.logging("install"), self.environment.activate():
             with self.ui.indent("  "):
-                for job in sequential_jobs:
-                    kind, key = job
-                    handlers[kind](key)
-                for i in range(self.retry_times + 1):
-                    with self.create_executor() as executor:
-                        for job in parallel_jobs:
-                            kind, key = job
-                            future = executor.submit(handlers[kind], key)
-                            future.add_done_callback(
-                                functools.partial(update_progress, kind=kind, key=key)
-                            )
-                    if not failed_jobs or i == self.retry_times:
-                        break
-                    parallel_jobs, failed_jobs = failed_jobs, []
-                    errors.clear()
-                    self.ui.echo("Retry failed jobs")
+                self.compile_bytecode()
+            self.ui.echo(self.timer.format(), verbosity=termui.DETAIL)
 
             if errors:
                 self.ui.echo(termui.red("\nERRORS:"))
@@ -0,0 +1,182 @@
+"""Remove installed distributions by the files recorded in their metadata.
+
+The files listed in ``RECORD`` (or ``installed-files.txt`` of egg-info
+distributions) are renamed into a stash directory in parallel, so that they can be
+restored at once if the following operations fail. Committing the removal deletes
+the stashed files and prunes the directories left empty.
+"""
+from __future__ import annotations
+
+import collections
+import csv
+import os
+import re
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, List, Optional, Set
+
+from pdm import termui
+from pdm.exceptions import InstallationError
+
+if TYPE_CHECKING:
+    from pip._vendor.pkg_resources import Distribution
+
+#: The name of a bytecode file in ``__pycache__``, capturing the source stem.
+BYTECODE_FILE_RE = re.compile(r"^(.+?)\.[^.]+(?:\.opt-\d+)?\.pyc$")
+
+
+def _default_workers() -> int:
+    return min(32, (os.cpu_count() or 1) + 4)
+
+
+def _move(source: str, target: str) -> None:
+    try:
+        os.rename(source, target)
+    except OSError:
+        # The target may be on another device.
+        shutil.move(source, target)
+
+
+def _add_bytecode_files(files: Set[str]) -> None:
+    """Add the bytecode files of the recorded sources, compiled by any interpreter.
+
+    They are matched by name in ``__pycache__`` instead of the cache tag of the
+    running interpreter, which may differ from the one that compiled them.
+    """
+    stems: Dict[str, Set[str]] = collections.defaultdict(set)
+    for path in list(files):
+        if not path.endswith(".py"):
+            continue
+        directory, filename = os.path.split(path)
+        stems[directory].add(filename[:-3])
+        # The legacy bytecode files next to the source.
+        files.update((f"{path}c", f"{path}o"))
+    for directory, names in stems.items():
+        cache_dir = os.path.join(directory, "__pycache__")
+        try:
+            cached = os.listdir(cache_dir)
+        except OSError:
+            continue
+        for filename in cached:
+            match = BYTECODE_FILE_RE.match(filename)
+            if match and match.group(1) in names:
+                files.add(os.path.join(cache_dir, filename))
+
+
+def get_installed_files(dist: Distribution) -> Optional[List[str]]:
+    """Return the absolute paths of the files installed by the distribution,
+    including the metadata and the bytecode files, or None if they are unknown.
+    """
+    info_dir = getattr(dist, "egg_info", None)
+    if not info_dir or not os.path.isdir(info_dir):
+        return None
+    if dist.has_metadata("RECORD"):
+        base = dist.location
+        paths = [row[0] for row in csv.reader(dist.get_metadata_lines("RECORD")) if row]
+    elif dist.has_metadata("installed-files.txt"):
+        base = info_dir
+        paths = list(dist.get_metadata_lines("installed-files.txt"))
+    else:
+        return None
+    files = {os.path.normpath(os.path.join(base, path)) for path in paths}
+    for root, _, filenames in os.walk(info_dir):
+        files.update(os.path.join(root, name) for name in filenames)
+    _add_bytecode_files(files)
+    return sorted(
+        path for path in files if os.path.isfile(path) or os.path.islink(path)
+    )
+
+
+class StashedRemoval:
+    """The files of a distribution moved aside, to be removed by :meth:`commit` or
+    restored by :meth:`rollback`.
+    """
+
+    def __init__(
+        self,
+        stash_dir: str,
+        moved: Dict[str, str],
+        roots: Iterable[str],
+        workers: int,
+    ) -> None:
+        self.stash_dir = stash_dir
+        self.moved = moved
+        self.roots = {os.path.normcase(os.path.abspath(root)) for root in roots}
+        self.workers = workers
+
+    def commit(self) -> None:
+        """Delete the stashed files and the directories left empty."""
+        with ThreadPoolExecutor(self.workers) as executor:
+            list(executor.map(os.unlink, self.moved.values()))
+        shutil.rmtree(self.stash_dir, ignore_errors=True)
+        directories = {os.path.dirname(path) for path in self.moved}
+        # Prune the deepest directories first.
+        for directory in sorted(directories, key=len, reverse=True):
+            while os.path.normcase(os.path.abspath(directory)) not in self.roots:
+                try:
+                    os.rmdir(directory)
+                except OSError:
+                    break
+                directory = os.path.dirname(directory)
+        self.moved.clear()
+
+    def rollback(self) -> None:
+        """Move the stashed files back to their original locations."""
+        with ThreadPoolExecutor(self.workers) as executor:
+            list(
+                executor.map(
+                    lambda item: _move(item[1], item[0]), list(self.moved.items())
+                )
+            )
+        shutil.rmtree(self.stash_dir, ignore_errors=True)
+        self.moved.clear()
+
+
+def stash_distribution(
+    dist: Distribution,
+    is_local: Callable[[str], bool],
+    roots: Iterable[str],
+    workers: Optional[int] = None,
+) -> Optional[StashedRemoval]:
+    """Move the files installed by the distribution into a stash directory in
+    parallel. Files outside of the environment are left untouched.
+
+    :param dist: the distribution to remove.
+    :param is_local: the function to tell if a path is in the environment.
+    :param roots: the directories of the environment that are never pruned.
+    :param workers: the number of threads to move the files.
+    :returns: the stashed removal, or None if the installed files are unknown.
+    """
+    files = get_installed_files(dist)
+    if files is None:
+        return None
+    files = [path for path in files if is_local(path)]
+    workers = workers or _default_workers()
+    stash_dir = tempfile.mkdtemp(prefix=".pdm-uninstall-", dir=dist.location)
+    targets = {
+        path: os.path.join(stash_dir, str(index)) for index, path in enumerate(files)
+    }
+    moved: Dict[str, str] = {}
+    errors: List[Exception] = []
+
+    def move(path: str) -> None:
+        try:
+            _move(path, targets[path])
+        except OSError as e:
+            errors.append(e)
+        else:
+            moved[path] = targets[path]
+
+    with ThreadPoolExecutor(workers) as executor:
+        list(executor.map(move, files))
+    removal = StashedRemoval(stash_dir, moved, [dist.location, *roots], workers)
+    if errors:
+        removal.rollback()
+        raise InstallationError(
+            f"Failed to uninstall {dist.project_name}: {errors[0]}"
+        ) from errors[0]
+    termui.logger.debug(
+        "Stashed %d files of %s in %s", len(moved), dist.project_name, stash_dir
+    )
+    return removal
@@ -0,0 +1,340 @@
+"""Install wheels by streaming the archive members to the destination.
+
+Unlike :meth:`distlib.wheel.Wheel.install`, the members are hashed while they are
+written, the RECORD file is produced in the same pass, and the bytecode is not
+compiled inline. Call :func:`compile_bytecode` with the returned source files,
+possibly collected from many wheels, to compile them in one go.
+
+Wheels can also be unpacked once into a content-addressed package store shared by
+all projects, and the files are then hardlinked into the environments.
+"""
+from __future__ import annotations
+
+import base64
+import configparser
+import csv
+import hashlib
+import io
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import zipfile
+from email.parser import Parser
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple, cast
+
+from pdm import termui
+from pdm.exceptions import InstallationError
+from pdm.utils import file_lock
+
+if TYPE_CHECKING:
+    from distlib.scripts import ScriptMaker
+
+#: The size of the chunks to copy from the archive.
+CHUNK_SIZE = 64 * 1024
+#: The ioctl request to clone a file on Linux.
+FICLONE = 0x40049409
+
+
+def _find_dist_info(zf: zipfile.ZipFile) -> str:
+    info_dirs = {
+        name.split("/", 1)[0]
+        for name in zf.namelist()
+        if name.split("/", 1)[0].endswith(".dist-info")
+    }
+    if len(info_dirs) != 1:
+        raise InstallationError(
+            f"{zf.filename} should contain exactly one .dist-info directory"
+        )
+    return info_dirs.pop()
+
+
+def _read_record(content: bytes) -> Dict[str, Tuple[str, str]]:
+    """Return a map from the paths to the (hash, size) in the RECORD file."""
+    reader = csv.reader(io.StringIO(content.decode("utf-8")))
+    return {row[0]: (row[1], row[2]) for row in reader if row}
+
+
+def _encode_digest(digest: bytes) -> str:
+    return base64.urlsafe_b64encode(digest).rstrip(b"=").decode("ascii")
+
+
+def _hash_file(path: str) -> Tuple[str, str]:
+    h = hashlib.sha256()
+    size = 0
+    with open(path, "rb") as fp:
+        for chunk in iter(lambda: fp.read(CHUNK_SIZE), b""):
+            h.update(chunk)
+            size += len(chunk)
+    return f"sha256={_encode_digest(h.digest())}", str(size)
+
+
+def _link_file(source: str, target: str) -> None:
+    """Hardlink the file from the store, or reflink or copy it if that fails."""
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    if os.path.lexists(target):
+        os.unlink(target)
+    try:
+        os.link(source, target)
+        return
+    except OSError:
+        pass
+    if _reflink(source, target):
+        shutil.copymode(source, target)
+    else:
+        shutil.copy2(source, target)
+
+
+def _reflink(source: str, target: str) -> bool:
+    """Clone the file with copy-on-write if the file system supports it."""
+    if not sys.platform.startswith("linux"):
+        return False
+    import fcntl
+
+    with open(source, "rb") as src, open(target, "wb") as dest:
+        try:
+            fcntl.ioctl(dest.fileno(), FICLONE, src.fileno())
+        except OSError:
+            return False
+    return True
+
+
+def _get_target(base: str, path: str) -> str:
+    target = os.path.normpath(os.path.join(base, path))
+    if os.path.commonpath([os.path.abspath(base), os.path.abspath(target)]) != (
+        os.path.abspath(base)
+    ):
+        raise InstallationError(f"The wheel member {path} is outside of {base}")
+    return target
+
+
+def _extract(
+    zf: zipfile.ZipFile, zinfo: zipfile.ZipInfo, target: str, expected_hash: str
+) -> Tuple[str, str]:
+    """Stream the member to the target, and verify its hash against the RECORD
+    while it is written. Return the (hash, size) of the written file.
+    """
+    algorithm = expected_hash.split("=", 1)[0] if expected_hash else "sha256"
+    try:
+        h = hashlib.new(algorithm)
+    except ValueError:
+        raise InstallationError(f"Unsupported hash algorithm {algorithm}")
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    if os.path.lexists(target):
+        # Don't write through the hardlinks to the package store.
+        os.unlink(target)
+    size = 0
+    with zf.open(zinfo) as src, open(target, "wb") as dest:
+        for chunk in iter(lambda: src.read(CHUNK_SIZE), b""):
+            h.update(chunk)
+            dest.write(chunk)
+            size += len(chunk)
+    file_hash = f"{algorithm}={_encode_digest(h.digest())}"
+    if expected_hash and file_hash != expected_hash:
+        os.unlink(target)
+        raise InstallationError(f"Hash mismatch for {zinfo.filename}")
+    if (zinfo.external_attr >> 16) & 0o111:
+        # Make the file executable if it is so in the archive.
+        os.chmod(target, os.stat(target).st_mode | 0o111)
+    if algorithm != "sha256":
+        return _hash_file(target)
+    return file_hash, str(size)
+
+
+def _get_entry_points(zf: zipfile.ZipFile, info_dir: str) -> configparser.ConfigParser:
+    parser = configparser.ConfigParser(delimiters=("=",), interpolation=None)
+    parser.optionxform = str  # type: ignore
+    try:
+        content = zf.read(f"{info_dir}/entry_points.txt")
+    except KeyError:
+        return parser
+    parser.read_string(content.decode("utf-8"))
+    return parser
+
+
+def unpack_to_store(
+    zf: zipfile.ZipFile, store: str, records: Dict[str, Tuple[str, str]]
+) -> Tuple[str, Dict[str, Tuple[str, str]]]:
+    """Unpack the wheel into the content-addressed store, keyed by the hash of the
+    wheel file, unless it is there already.
+
+    :returns: the directory of the unpacked tree, and the (hash, size) of the
+        members in the same format as RECORD.
+    """
+    digest = hashlib.sha256()
+    with open(cast(str, zf.filename), "rb") as fp:
+        for chunk in iter(lambda: fp.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    key = digest.hexdigest()
+    tree = os.path.join(store, key[:2], key)
+    manifest_file = f"{tree}.json"
+    os.makedirs(os.path.dirname(tree), exist_ok=True)
+    with file_lock(f"{tree}.lock"):
+        if os.path.exists(manifest_file):
+            with open(manifest_file) as f:
+                return tree, {k: (v[0], v[1]) for k, v in json.load(f).items()}
+        temp_dir = tempfile.mkdtemp(prefix=".tmp-", dir=os.path.dirname(tree))
+        try:
+            manifest = {
+                zinfo.filename: _extract(
+                    zf,
+                    zinfo,
+                    _get_target(temp_dir, zinfo.filename),
+                    records.get(zinfo.filename, ("", ""))[0],
+                )
+                for zinfo in zf.infolist()
+                if not zinfo.filename.endswith("/")
+            }
+            # Remove the leftovers of an interrupted unpacking.
+            shutil.rmtree(tree, ignore_errors=True)
+            os.replace(temp_dir, tree)
+        except BaseException:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+            raise
+        # The manifest marks the tree as complete.
+        with open(f"{manifest_file}.tmp", "w") as f:
+            json.dump(manifest, f)
+        os.replace(f"{manifest_file}.tmp", manifest_file)
+    return tree, manifest
+
+
+def install_wheel(
+    wheel_path: str,
+    paths: Dict[str, str],
+    maker: ScriptMaker,
+    store: Optional[str] = None,
+) -> List[str]:
+    """Install the wheel to the given scheme paths, with the scripts generated by
+    ``maker``. Files are removed again if the installation fails.
+
+    If ``store`` is given, the wheel is unpacked once into the package store under
+    that directory, and the files are linked from there instead of extracted.
+
+    :returns: the Python source files that are installed, to be compiled.
+    """
+    installed: Dict[str, Tuple[str, str]] = {}
+    with zipfile.ZipFile(wheel_path) as zf:
+        info_dir = _find_dist_info(zf)
+        data_dir = info_dir[: -len(".dist-info")] + ".data"
+        wheel_info = Parser().parsestr(zf.read(f"{info_dir}/WHEEL").decode("utf-8"))
+        if wheel_info.get("Root-Is-Purelib", "").lower() == "true":
+            libdir = paths["purelib"]
+        else:
+            libdir = paths["platlib"]
+        record_name = f"{info_dir}/RECORD"
+        records = _read_record(zf.read(record_name))
+        tree: Optional[str] = None
+        if store is not None:
+            tree, manifest = unpack_to_store(zf, store, records)
+            script_dir = os.path.join(tree, data_dir, "scripts")
+        else:
+            script_dir = tempfile.mkdtemp(prefix="pdm-scripts-")
+        try:
+            for zinfo in zf.infolist():
+                name = zinfo.filename
+                if name.endswith("/") or name.startswith(f"{record_name}"):
+                    # Skip directories, the RECORD and its signatures.
+                    continue
+                expected_hash = records.get(name, ("", ""))[0]
+                if name.startswith(f"{data_dir}/"):
+                    _, scheme, path = name.split("/", 2)
+                    if scheme not in paths:
+                        raise InstallationError(
+                            f"Unknown scheme {scheme} in {os.path.basename(wheel_path)}"
+                        )
+                    if scheme == "scripts":
+                        # Let the script maker copy the script and fix the shebang.
+                        if tree is None:
+                            _extract(
+                                zf, zinfo, _get_target(script_dir, path), expected_hash
+                            )
+                        maker.source_dir = script_dir
+                        maker.target_dir = paths["scripts"]
+                        os.makedirs(maker.target_dir, exist_ok=True)
+                        for script in maker.make(path):
+                            installed[script] = _hash_file(script)
+                        continue
+                    target = _get_target(paths[scheme], path)
+                else:
+                    target = _get_target(libdir, name)
+                if tree is None:
+                    installed[target] = _extract(zf, zinfo, target, expected_hash)
+                else:
+                    _link_file(_get_target(tree, name), target)
+                    installed[target] = manifest[name]
+
+            entry_points = _get_entry_points(zf, info_dir)
+            for section, options in (
+                ("console_scripts", None),
+                ("gui_scripts", {"gui": True}),
+            ):
+                if not entry_points.has_section(section):
+                    continue
+                maker.target_dir = paths["scripts"]
+                os.makedirs(maker.target_dir, exist_ok=True)
+                for script_name, value in entry_points.items(section):
+                    for script in maker.make(f"{script_name} = {value}", options):
+                        installed[script] = _hash_file(script)
+
+            installer_file = os.path.join(libdir, info_dir, "INSTALLER")
+            with open(installer_file, "w") as f:
+                f.write("pdm\n")
+            installed[installer_file] = _hash_file(installer_file)
+            record_file = os.path.join(libdir, record_name)
+            with open(record_file, "w", newline="") as f:
+                writer = csv.writer(f)
+                for path, (file_hash, size) in installed.items():
+                    relpath = os.path.relpath(path, libdir).replace(os.sep, "/")
+                    writer.writerow([relpath, file_hash, size])
+                writer.writerow([record_name, "", ""])
+        except BaseException:
+            for path in installed:
+                if os.path.exists(path):
+                    os.unlink(path)
+            raise
+        finally:
+            if tree is None:
+                shutil.rmtree(script_dir, ignore_errors=True)
+    return [path for path in installed if path.endswith(".py")]
+
+
+def compile_bytecode(
+    executable: str, files: Iterable[str], workers: Optional[int] = None
+) -> None:
+    """Compile the source files to bytecode with the given interpreter, in a pool
+    of ``workers`` processes. Failures are logged and ignored.
+
+    The bytecode files are not added to RECORD, since they are compiled after it is
+    written and possibly for a batch of several wheels. The uninstaller removes the
+    files in ``__pycache__`` that belong to the recorded sources instead.
+    """
+    files = list(files)
+    if not files:
+        return
+    workers = min(workers or os.cpu_count() or 1, len(files))
+    chunks = [files[i::workers] for i in range(workers)]
+    processes = []
+    for chunk in chunks:
+        process = subprocess.Popen(
+            [executable, "-m", "compileall", "-q", "-i", "-"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+        )
+        assert process.stdin is not None
+        # The file list is read before compiling, so all processes start working
+        # before waiting for any of them.
+        process.stdin.write("\n".join(chunk).encode("utf-8"))
+        process.stdin.close()
+        processes.append(process)
+    for process in processes:
+        assert process.stdout is not None
+        output = process.stdout.read()
+        process.stdout.close()
+        if process.wait():
+            termui.logger.debug(
+                "Failed to compile some files to bytecode:\n%s",
+                output.decode("utf-8", "replace"),
+            )
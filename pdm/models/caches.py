@@ -1,39 +1,154 @@
+import contextlib
 import hashlib
 import json
+import mmap
+import os
+import sqlite3
+import threading
+import time
+import weakref
 from pathlib import Path
-from typing import TYPE_CHECKING, Any, Dict, Optional
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Optional, Union
+
+from pip._vendor.cachecontrol.controller import CacheController
+from pip._vendor.requests.models import PreparedRequest
 
 from pdm._types import CandidateInfo
 from pdm.exceptions import CorruptedCacheError
 from pdm.models import pip_shims
 from pdm.models.candidates import Candidate
-from pdm.utils import open_file
+from pdm.utils import file_lock, open_file
 
 if TYPE_CHECKING:
     from pip._vendor import requests
 
 
+def _write_entries(
+    conn: sqlite3.Connection,
+    entries: Dict[str, CandidateInfo],
+    lock_file: Optional[Path],
+) -> None:
+    if not entries:
+        return
+    pending = dict(entries)
+    entries.clear()
+    # Hold a shared lock to keep the database from being removed by other
+    # processes meanwhile. Each entry replaces only its own row, so the entries
+    # written by other processes in the meantime are kept.
+    lock = (
+        file_lock(lock_file, shared=True)
+        if lock_file is not None
+        else contextlib.nullcontext()
+    )
+    with lock, conn:
+        conn.execute("BEGIN")
+        conn.executemany(
+            "INSERT OR REPLACE INTO candidates (key, value) VALUES (?, ?)",
+            ((key, json.dumps(value)) for key, value in pending.items()),
+        )
+
+
+def _close_connection(
+    conn: sqlite3.Connection,
+    entries: Dict[str, CandidateInfo],
+    lock_file: Optional[Path],
+) -> None:
+    try:
+        _write_entries(conn, entries, lock_file)
+    except sqlite3.Error:
+        # The cache directory may be gone already, the entries are lost.
+        pass
+    finally:
+        conn.close()
+
+
 class CandidateInfoCache:
-    """Cache manager to hold (dependencies, requires_python, summary) info."""
+    """Cache manager to hold (dependencies, requires_python, summary) info.
+
+    The entries are stored in a SQLite database in WAL mode, so that each entry
+    can be read and written individually instead of rewriting the whole cache.
+    New entries are buffered in memory and written in one transaction when
+    ``flush_interval`` seconds have passed since the last write, when
+    :meth:`flush` or :meth:`close` is called, or when the cache is collected or
+    the process exits.
+    """
 
-    def __init__(self, cache_file: Path) -> None:
+    def __init__(
+        self,
+        cache_file: Path,
+        flush_interval: float = 0,
+        lock_file: Optional[Path] = None,
+    ) -> None:
+        """
+        :param cache_file: the path of the database file.
+        :param flush_interval: the seconds to keep new entries in memory before
+            writing them, 0 to write them immediately.
+        :param lock_file: the file to hold a shared lock on while writing, to keep
+            the database from being removed by other processes meanwhile.
+        """
         self.cache_file = cache_file
-        self._cache: Dict[str, CandidateInfo] = {}
-        self._read_cache()
+        self.flush_interval = flush_interval
+        self.lock_file = lock_file
+        # The cache may be written from the prefetching threads of the resolver.
+        self._lock = threading.RLock()
+        self._pending: Dict[str, CandidateInfo] = {}
+        self._last_flush = time.monotonic()
+        self._open()
+        self._migrate_json_cache()
 
-    def _read_cache(self) -> None:
-        if not self.cache_file.exists():
-            self._cache = {}
-            return
-        with self.cache_file.open() as fp:
+    def _open(self) -> None:
+        self._conn = self._connect()
+        # The finalizer holds the connection and the buffer but not the cache
+        # itself, so it is called when the cache is collected or at exit.
+        self._finalizer = weakref.finalize(
+            self, _close_connection, self._conn, self._pending, self.lock_file
+        )
+
+    def _connect(self) -> sqlite3.Connection:
+        for _ in range(2):
+            conn = sqlite3.connect(
+                str(self.cache_file),
+                timeout=30,
+                isolation_level=None,
+                check_same_thread=False,
+            )
             try:
-                self._cache = json.load(fp)
-            except json.JSONDecodeError:
-                raise CorruptedCacheError("The dependencies cache seems to be broken.")
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS candidates "
+                    "(key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+                )
+            except sqlite3.DatabaseError:
+                # Not a valid database, start over with an empty one.
+                conn.close()
+                self._remove_database()
+            else:
+                return conn
+        raise CorruptedCacheError("The dependencies cache seems to be broken.")
 
-    def _write_cache(self) -> None:
-        with self.cache_file.open("w") as fp:
-            json.dump(self._cache, fp)
+    def _remove_database(self) -> None:
+        for suffix in ("", "-wal", "-shm"):
+            path = self.cache_file.with_name(self.cache_file.name + suffix)
+            if path.exists():
+                path.unlink()
+
+    def _migrate_json_cache(self) -> None:
+        """Import the entries from the JSON cache file used by older versions."""
+        legacy_file = self.cache_file.with_suffix(".json")
+        if not legacy_file.exists():
+            return
+        try:
+            with legacy_file.open() as fp:
+                data = json.load(fp)
+        except (OSError, json.JSONDecodeError):
+            data = {}
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN")
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO candidates (key, value) VALUES (?, ?)",
+                ((key, json.dumps(value)) for key, value in data.items()),
+            )
+        legacy_file.unlink()
 
     @staticmethod
     def _get_key(candidate: Candidate) -> str:
@@ -50,23 +165,61 @@ class CandidateInfoCache:
 
     def get(self, candidate: Candidate) -> CandidateInfo:
         key = self._get_key(candidate)
-        return self._cache[key]
+        with self._lock:
+            if key in self._pending:
+                return self._pending[key]
+            try:
+                row = self._conn.execute(
+                    "SELECT value FROM candidates WHERE key = ?", (key,)
+                ).fetchone()
+            except sqlite3.DatabaseError:
+                raise CorruptedCacheError("The dependencies cache seems to be broken.")
+        if row is None:
+            raise KeyError(key)
+        try:
+            dependencies, requires_python, summary = json.loads(row[0])
+        except (json.JSONDecodeError, ValueError):
+            raise CorruptedCacheError("The dependencies cache seems to be broken.")
+        return dependencies, requires_python, summary
 
     def set(self, candidate: Candidate, value: CandidateInfo) -> None:
         key = self._get_key(candidate)
-        self._cache[key] = value
-        self._write_cache()
+        dependencies, requires_python, summary = value
+        with self._lock:
+            self._pending[key] = (list(dependencies), requires_python, summary)
+            if time.monotonic() - self._last_flush >= self.flush_interval:
+                self.flush()
+
+    def flush(self) -> None:
+        """Write the buffered entries to the database."""
+        with self._lock:
+            self._last_flush = time.monotonic()
+            _write_entries(self._conn, self._pending, self.lock_file)
+
+    def close(self) -> None:
+        """Write the buffered entries and close the database."""
+        with self._lock:
+            self._finalizer()
 
     def delete(self, candidate: Candidate) -> None:
         try:
-            del self._cache[self._get_key(candidate)]
+            key = self._get_key(candidate)
         except KeyError:
-            pass
-        self._write_cache()
+            return
+        with self._lock:
+            self._pending.pop(key, None)
+            self._conn.execute("DELETE FROM candidates WHERE key = ?", (key,))
 
     def clear(self) -> None:
-        self._cache.clear()
-        self._write_cache()
+        with self._lock:
+            self._pending.clear()
+            try:
+                self._conn.execute("DELETE FROM candidates")
+            except sqlite3.DatabaseError:
+                self._finalizer.detach()
+                self._conn.close()
+                self._remove_database()
+                self._open()
 
 
 class HashCache(pip_shims.SafeFileCache):
@@ -78,6 +231,9 @@ class HashCache(pip_shims.SafeFileCache):
     avoid issues where the location on the server changes.
     """
 
+    #: The size of the chunks to read from the remote files
+    CHUNK_SIZE = 64 * 1024
+
     def __init__(self, *args: Any, **kwargs: Any) -> None:
         self.session: Optional[requests.Session] = None
         super(HashCache, self).__init__(*args, **kwargs)
@@ -85,19 +241,148 @@ class HashCache(pip_shims.SafeFileCache):
     def get_hash(self, link: pip_shims.Link) -> str:
         # If there is no link hash (i.e., md5, sha256, etc.), we don't want
         # to store it.
-        hash_value = self.get(link.url)
-        if not hash_value:
-            if link.hash and link.hash_name in pip_shims.STRONG_HASHES:
-                hash_value = f"{link.hash_name}:{link.hash}"
+        cached = self.get(link.url)
+        if cached:
+            return cached.decode("utf8")
+        if link.hash and link.hash_name in pip_shims.STRONG_HASHES:
+            hash_value = f"{link.hash_name}:{link.hash}"
+        else:
+            hash_value = self._get_file_hash(link)
+        self.set(link.url, hash_value.encode())
+        return hash_value
+
+    def get_hashes(
+        self, links: Iterable[pip_shims.Link], max_per_host: int = 10
+    ) -> Dict[str, str]:
+        """Return a map from the file names to the hashes of the links. The remote
+        files without known hashes are downloaded concurrently.
+        """
+        result: Dict[str, str] = {}
+        to_download: Dict[str, pip_shims.Link] = {}
+        for link in links:
+            cached = self.get(link.url)
+            if cached:
+                result[link.filename] = cached.decode("utf8")
+            elif link.scheme in ("http", "https") and not (
+                link.hash and link.hash_name in pip_shims.STRONG_HASHES
+            ):
+                to_download[link.url] = link
+                # Keep the order of the links.
+                result[link.filename] = ""
             else:
-                hash_value = self._get_file_hash(link)
-            hash_value = hash_value.encode()
-            self.set(link.url, hash_value)
-        return hash_value.decode("utf8")
+                result[link.filename] = self.get_hash(link)
+        if to_download:
+            from pdm.models.fetcher import AsyncFetcher
 
-    def _get_file_hash(self, link: pip_shims.Link) -> str:
+            assert self.session is not None
+            fetcher = AsyncFetcher(self.session, max_per_host)
+            hashes = fetcher.fetch_all(to_download, self._get_response_hash)
+            for link, file_hash in zip(to_download.values(), hashes):
+                self.set(link.url, file_hash.encode())
+                result[link.filename] = file_hash
+        return result
+
+    @staticmethod
+    def _hash_chunks(chunks: Iterable[Union[bytes, mmap.mmap]]) -> str:
         h = hashlib.new(pip_shims.FAVORITE_HASH)
-        with open_file(link.url, self.session) as fp:
-            for chunk in iter(lambda: fp.read(8096), b""):
-                h.update(chunk)
+        for chunk in chunks:
+            h.update(chunk)
         return ":".join([h.name, h.hexdigest()])
+
+    def _get_response_hash(self, resp: "requests.Response") -> str:
+        return self._hash_chunks(resp.iter_content(self.CHUNK_SIZE))  # type: ignore
+
+    def _get_file_hash(self, link: pip_shims.Link) -> str:
+        if link.is_file:
+            return self._get_local_file_hash(link.file_path)
+        with open_file(link.url, self.session) as fp:
+            return self._hash_chunks(iter(lambda: fp.read(self.CHUNK_SIZE), b""))
+
+    def _get_local_file_hash(self, path: str) -> str:
+        with open(path, "rb") as fp:
+            if os.fstat(fp.fileno()).st_size == 0:
+                # Empty files can't be mapped.
+                return self._hash_chunks([])
+            with mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return self._hash_chunks([mapped])
+
+
+class InterpreterInfoCache(pip_shims.SafeFileCache):
+    """Caches the probed information of Python interpreters. The entries are keyed
+    by the path, size and modification time of the executable, so that they are
+    invalidated when the interpreter is replaced or upgraded.
+    """
+
+    @staticmethod
+    def _get_key(executable: str) -> str:
+        stat = os.stat(executable)
+        path = os.path.normcase(os.path.abspath(executable))
+        return f"{path}:{stat.st_size}:{stat.st_mtime_ns}"
+
+    def get_info(self, executable: str) -> Optional[Dict[str, Any]]:
+        """Return the cached information of the interpreter, or None if not found."""
+        try:
+            content = self.get(self._get_key(executable))
+        except OSError:
+            return None
+        if content is None:
+            return None
+        try:
+            return json.loads(content)
+        except ValueError:
+            return None
+
+    def set_info(self, executable: str, info: Dict[str, Any]) -> None:
+        self.set(self._get_key(executable), json.dumps(info).encode())
+
+
+class FailureCache(pip_shims.SafeFileCache):
+    """Remembers the builds and metadata lookups that failed, so that they are
+    not retried until ``ttl`` seconds have passed.
+    """
+
+    def __init__(self, *args: Any, ttl: int = 0, **kwargs: Any) -> None:
+        self.ttl = ttl
+        super().__init__(*args, **kwargs)
+
+    def get_failure(self, key: str) -> Optional[str]:
+        """Return the reason of the recent failure, or None if not found."""
+        if self.ttl <= 0:
+            return None
+        content = self.get(key)
+        if content is None:
+            return None
+        try:
+            failure = json.loads(content)
+        except ValueError:
+            return None
+        if time.time() - failure["time"] >= self.ttl:
+            return None
+        return failure["reason"]
+
+    def set_failure(self, key: str, reason: str) -> None:
+        if self.ttl <= 0:
+            return
+        self.set(key, json.dumps({"reason": reason, "time": time.time()}).encode())
+
+
+class IndexCacheController(CacheController):
+    """The controller of pip's HTTP cache, serving the index pages cached less than
+    ``max_age`` seconds ago without revalidating them.
+
+    pip always asks to revalidate the index pages with ``Cache-Control: max-age=0``,
+    which is relaxed to ``max_age`` when looking up the cache.
+    """
+
+    def __init__(self, *args: Any, max_age: int = 0, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)  # type: ignore
+        self.max_age = max_age
+
+    def cached_request(self, request: PreparedRequest) -> Any:
+        if self.max_age <= 0 or request.headers.get("Cache-Control") != "max-age=0":
+            return super().cached_request(request)  # type: ignore
+        request.headers["Cache-Control"] = f"max-age={self.max_age}"
+        try:
+            return super().cached_request(request)  # type: ignore
+        finally:
+            request.headers["Cache-Control"] = "max-age=0"
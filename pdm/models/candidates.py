@@ -12,7 +12,7 @@ from distlib.wheel import Wheel
 from pip._vendor.pkg_resources import safe_extra
 
 from pdm import termui
-from pdm.exceptions import BuildError, ExtrasError, RequirementError
+from pdm.exceptions import BuildBackendError, BuildError, ExtrasError, RequirementError
 from pdm.models import pip_shims
 from pdm.models.markers import Marker
 from pdm.models.requirements import Requirement, filter_requirements_with_extras
@@ -89,6 +89,13 @@ def get_requirements_from_dist(
     return result
 
 
+def _metadata_from_setup(setup: Setup) -> Namespace:
+    meta_dict = setup.as_dict()
+    meta_dict["summary"] = meta_dict["summary"] or "UNKNOWN"
+    meta_dict["requires_python"] = meta_dict.pop("python_requires", None)
+    return Namespace(**meta_dict)
+
+
 class Candidate:
     """A concrete candidate that can be downloaded and installed.
     A candidate comes from the PyPI index of a package, or from the requirement itself
@@ -123,6 +130,7 @@ class Candidate:
 
         self.wheel: Optional[Wheel] = None
         self.metadata = None
+        self._metadata_only = False
 
     def __hash__(self):
         return hash((self.name, self.version))
@@ -175,23 +183,59 @@ class Candidate:
 
         If raising is True, error will pop when the package fails to build.
         """
-        if self.metadata is not None:
+        # Metadata read without building doesn't come with the wheel file, which is
+        # required by the installation(allow_all_wheels=False).
+        if self.metadata is not None and (allow_all_wheels or not self._metadata_only):
             return self.metadata
         ireq = self.ireq
         if self.link and not ireq.link:
             ireq.link = self.link
+        if allow_all_wheels and not self.req.editable:
+            metadata = self.environment.fetch_wheel_metadata(ireq)
+            if metadata is not None:
+                self._metadata_only = True
+                self.metadata = metadata
+                self._update_from_metadata()
+                return self.metadata
+        failures = self.environment.project.make_failure_cache()
+        failure_key = self._get_failure_key()
+        failure = None
         try:
-            built = self.environment.build(ireq, self.hashes, allow_all_wheels)
-        except BuildError:
+            built = self.environment.prepare_source(ireq, self.hashes, allow_all_wheels)
+            if built is None:
+                if failure_key and not raising:
+                    failure = failures.get_failure(failure_key)
+                if failure is not None:
+                    termui.logger.warning(
+                        "Skip building %s, which failed recently: %s", self, failure
+                    )
+                    raise BuildError(
+                        f"The build failed recently, run `pdm cache clear failures` "
+                        f"to retry: {failure}"
+                    )
+                if allow_all_wheels and not self.req.editable:
+                    # The wheel is built when the candidate is installed.
+                    setup = self._read_static_metadata(ireq)
+                    if setup is not None:
+                        metadata = _metadata_from_setup(setup)
+                    else:
+                        metadata = self.environment.build_metadata(ireq)
+                    self._metadata_only = True
+                    self.metadata = metadata
+                    self._update_from_metadata()
+                    return self.metadata
+                built = self.environment.build_source(ireq)
+        except BuildError as e:
+            # Only the failures of the backend are remembered, while the build
+            # environment may be set up successfully next time.
+            if failure_key and isinstance(e, BuildBackendError):
+                failures.set_failure(failure_key, str(e))
             if raising:
                 raise
             termui.logger.warn("Failed to build package, try parsing project files.")
-            meta_dict = Setup.from_directory(
-                Path(ireq.unpacked_source_directory)
-            ).as_dict()
-            meta_dict.update(summary="UNKNOWN")
-            meta_dict["requires_python"] = meta_dict.pop("python_requires", None)
-            self.metadata = Namespace(**meta_dict)
+            self.metadata = _metadata_from_setup(
+                Setup.from_directory(Path(ireq.unpacked_source_directory))
+            )
         else:
             if self.req.editable:
                 if not self.req.is_local_dir and not self.req.is_vcs:
@@ -205,13 +249,45 @@ class Candidate:
                 # It should be a wheel path.
                 self.wheel = Wheel(built)
                 self.metadata = self.wheel.metadata
+        self._metadata_only = False
+        self._update_from_metadata()
+        return self.metadata
+
+    def _get_failure_key(self) -> Optional[str]:
+        """Return the key to remember the failed builds of the candidate. Only the
+        archives from remote locations are remembered, as they never change.
+        """
+        link = self.ireq.link or self.link
+        if link is None or link.is_vcs or link.is_file:
+            return None
+        return (
+            f"build:{link.url_without_fragment}:{link.hash or ''}:"
+            f"{self.environment.interpreter.for_tag()}"
+        )
+
+    def _read_static_metadata(
+        self, ireq: pip_shims.InstallRequirement
+    ) -> Optional[Setup]:
+        """Read the metadata from the static project files, so that the candidate
+        doesn't need to be built just to get the dependencies.
+        """
+        if not self.environment.project.config["strategy.static_metadata"]:
+            return None
+        setup = Setup.from_directory_static(Path(ireq.unpacked_source_directory))
+        if setup is None or not (self.name or setup.name):
+            return None
+        if not (self.version or setup.version):
+            return None
+        termui.logger.debug("Read static metadata of %s", self.req.as_line())
+        return setup
+
+    def _update_from_metadata(self) -> None:
         if not self.name:
             self.name = self.metadata.name
             self.req.name = self.name
         if not self.version:
             self.version = self.metadata.version
-        self.link = ireq.link
-        return self.metadata
+        self.link = self.ireq.link
 
     def __repr__(self) -> str:
         source = getattr(self.link, "comes_from", "unknown")
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import collections
+import io
 import os
 import re
 import shutil
@@ -8,26 +9,32 @@ import subprocess
 import sys
 import sysconfig
 import tempfile
+import threading
+import zipfile
 from contextlib import contextmanager
-from os import PathLike
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, Dict, Generator, Iterator, List, Optional
+from urllib import parse
 
+from distlib.metadata import Metadata
 from distlib.scripts import ScriptMaker
 from pip._vendor import packaging, pkg_resources
+from pip._vendor.cachecontrol.adapter import CacheControlAdapter
+from pip._vendor.requests.adapters import HTTPAdapter
 
 from pdm import termui
 from pdm.exceptions import BuildError
 from pdm.models import pip_shims
 from pdm.models.auth import make_basic_auth
+from pdm.models.caches import IndexCacheController
 from pdm.models.in_process import (
     get_pep508_environment,
     get_python_abi_tag,
     get_sys_config_paths,
 )
 from pdm.models.pip_shims import misc, patch_bin_prefix, req_uninstall
+from pdm.models.specifiers import PySpecSet
 from pdm.utils import (
-    allow_all_wheels,
     cached_property,
     convert_hashes,
     create_tracked_tempdir,
@@ -38,6 +45,8 @@ from pdm.utils import (
 )
 
 if TYPE_CHECKING:
+    from pip._vendor.requests import Session
+
     from pdm._types import Source
     from pdm.models.python import PythonInfo
     from pdm.project import Project
@@ -45,6 +54,26 @@ if TYPE_CHECKING:
 _egg_info_re = re.compile(r"([a-z0-9_.]+)-([a-z0-9_.!+-]+)", re.IGNORECASE)
 
 
+def _read_wheel_metadata(url: str, session: Session) -> Metadata:
+    """Read the METADATA file of a remote wheel, only the central directory
+    of the zip file and the METADATA member are downloaded.
+    """
+    with pip_shims.LazyZipOverHTTP(url, session) as wheel:
+        zf = zipfile.ZipFile(wheel)
+        metadata_file = next(
+            (
+                name
+                for name in zf.namelist()
+                if name.count("/") == 1 and name.endswith(".dist-info/METADATA")
+            ),
+            None,
+        )
+        if metadata_file is None:
+            raise zipfile.BadZipFile(f"No METADATA is found in {url}")
+        content = zf.read(metadata_file).decode("utf-8")
+    return Metadata(fileobj=io.StringIO(content))
+
+
 class WorkingSet(collections.abc.Mapping):
     """A dict-like class that holds all installed packages in the lib directory."""
 
@@ -95,6 +124,8 @@ class Environment:
         self.auth = make_basic_auth(
             self.project.sources, self.project.core.ui.verbosity >= termui.DETAIL
         )
+        self._session: Optional[Session] = None
+        self._session_lock = threading.Lock()
 
     def get_paths(self) -> Dict[str, str]:
         """Get paths like ``sysconfig.get_paths()`` for installation."""
@@ -140,7 +171,7 @@ class Environment:
             misc.site_packages = _old_sitepackages
             pkg_resources.working_set = _old_ws
 
-    def is_local(self, path: PathLike) -> bool:
+    def is_local(self, path: str) -> bool:
         """PEP 582 version of ``is_local()`` function."""
         return misc.normalize_path(path).startswith(
             misc.normalize_path(self.packages_path.as_posix())
@@ -190,11 +221,13 @@ class Environment:
         self,
         sources: Optional[List[Source]] = None,
         ignore_requires_python: bool = False,
+        ignore_compatibility: bool = False,
     ) -> Generator[pip_shims.PackageFinder, None, None]:
         """Return the package finder of given index sources.
 
         :param sources: a list of sources the finder should search in.
         :param ignore_requires_python: whether to ignore the python version constraint.
+        :param ignore_compatibility: whether to accept the wheels of all platforms.
         """
         if sources is None:
             sources = self.project.sources
@@ -203,17 +236,96 @@ class Environment:
 
         python_version = self.interpreter.version_tuple
         python_abi_tag = get_python_abi_tag(self.interpreter.executable)
-        finder = get_finder(
-            sources,
-            self.project.cache_dir.as_posix(),
-            python_version,
-            python_abi_tag,
-            ignore_requires_python,
-        )
-        # Reuse the auth across sessions to avoid prompting repeatly.
-        finder.session.auth = self.auth
+        with self._session_lock:
+            finder = get_finder(
+                sources,
+                self.project.cache_dir.as_posix(),
+                python_version,
+                python_abi_tag,
+                ignore_requires_python,
+                session=self._session,
+                ignore_compatibility=ignore_compatibility,
+            )
+            session = finder.session
+            if self._session is None:
+                # The session is kept to reuse the connections, and closed at exit.
+                self._session = session
+                session.auth = self.auth
+                self._configure_pools(session)
+                self._configure_http_cache(session)
+            for source in sources:
+                if not source.get("verify_ssl", True):
+                    host = parse.urlparse(source["url"]).hostname or ""
+                    session.add_trusted_host(host, suppress_logging=True)
         yield finder
-        finder.session.close()
+
+    @property
+    def session(self) -> Session:
+        """The HTTP session shared by the finders of the environment."""
+        if self._session is None:
+            # The session is created along with the first finder.
+            with self.get_finder():
+                pass
+        assert self._session is not None
+        return self._session
+
+    def _configure_pools(self, session: Session) -> None:
+        """Resize the connection pools of the session, so that the threads fetching
+        from the same host don't discard the connections of each other.
+        """
+        max_connections = int(self.project.config["pypi.max_connections"])
+        for adapter in set(session.adapters.values()) | {session._trusted_host_adapter}:
+            if isinstance(adapter, HTTPAdapter):
+                adapter.init_poolmanager(
+                    adapter._pool_connections, max_connections, adapter._pool_block
+                )
+
+    def _configure_http_cache(self, session: Session) -> None:
+        """Let pip's HTTP cache serve the index pages cached less than
+        ``cache.index_max_age`` seconds ago without revalidating them.
+        """
+        max_age = int(self.project.config["cache.index_max_age"])
+        if max_age <= 0:
+            return
+        for adapter in set(session.adapters.values()) | {session._trusted_host_adapter}:
+            if isinstance(adapter, CacheControlAdapter):
+                adapter.controller = IndexCacheController(
+                    adapter.cache, cache_etags=True, max_age=max_age
+                )
+
+    def fetch_wheel_metadata(
+        self, ireq: pip_shims.InstallRequirement, allow_all: bool = True
+    ) -> Optional[Metadata]:
+        """Read the metadata of a remote wheel with HTTP range requests, without
+        downloading the whole file.
+
+        :param ireq: the InstallRequirment of the candidate.
+        :param allow_all: Allow incompatible wheels.
+        :returns: The metadata, or None if the candidate isn't a remote wheel or
+            the server doesn't support range requests.
+        """
+        if (
+            ireq.editable
+            or not self.project.config["pypi.lazy_wheel"]
+            or pip_shims.LazyZipOverHTTP is None
+        ):
+            return None
+        if ireq.link is None:
+            # The link is kept on the ireq and reused to prepare the source later.
+            with self.get_finder(
+                ignore_requires_python=True, ignore_compatibility=allow_all
+            ) as finder:
+                populate_link(finder, ireq, False)
+        link = ireq.link
+        if not link or not link.is_wheel or link.scheme not in ("http", "https"):
+            return None
+        try:
+            return _read_wheel_metadata(link.url_without_fragment, self.session)
+        except pip_shims.HTTPRangeRequestUnsupported:
+            termui.logger.debug("Range requests are not supported by %s", link)
+        except zipfile.BadZipFile as e:
+            termui.logger.debug("Failed to read metadata from %s: %s", link, e)
+        return None
 
     def build(
         self,
@@ -229,17 +341,68 @@ class Environment:
         :param allow_all: Allow building incompatible wheels.
         :returns: The full path of the built artifact.
         """
-        from pdm.builders import EnvEggInfoBuilder, EnvWheelBuilder
+        # Keep the wheel cache from being cleared by other processes while building.
+        with self.project.cache_lock("wheels", shared=True):
+            prepared = self._prepare_source(ireq, hashes, allow_all)
+            return prepared or self._build_source(ireq)
+
+    def prepare_source(
+        self,
+        ireq: pip_shims.InstallRequirement,
+        hashes: Optional[Dict[str, str]] = None,
+        allow_all: bool = True,
+    ) -> Optional[str]:
+        """Download and unpack the candidate without building it.
+
+        :param ireq: the InstallRequirment of the candidate.
+        :param hashes: a dictionary of filename: hash_value to check against downloaded
+        artifacts.
+        :param allow_all: Allow incompatible wheels.
+        :returns: The full path of the wheel if the candidate is a wheel or a built
+            wheel is cached, otherwise None and the source is ready to be built by
+            :meth:`build_source`.
+        """
+        with self.project.cache_lock("wheels", shared=True):
+            return self._prepare_source(ireq, hashes, allow_all)
+
+    def build_source(self, ireq: pip_shims.InstallRequirement) -> str:
+        """Build the source prepared by :meth:`prepare_source`.
 
+        :param ireq: the InstallRequirment of the candidate.
+        :returns: The full path of the built artifact.
+        """
+        with self.project.cache_lock("wheels", shared=True):
+            return self._build_source(ireq)
+
+    def build_metadata(self, ireq: pip_shims.InstallRequirement) -> Metadata:
+        """Get the metadata of the source prepared by :meth:`prepare_source` with the
+        ``prepare_metadata_for_build_wheel`` hook, which is much cheaper than building
+        the wheel.
+
+        :param ireq: the InstallRequirment of the candidate.
+        :returns: The metadata of the wheel that would be built.
+        """
+        from pdm.builders import EnvMetadataBuilder
+
+        with EnvMetadataBuilder(ireq.unpacked_source_directory, self) as builder:
+            metadata_dir = builder.build(self._get_build_dir(ireq))
+        return Metadata(path=os.path.join(metadata_dir, "METADATA"))
+
+    def _prepare_source(
+        self,
+        ireq: pip_shims.InstallRequirement,
+        hashes: Optional[Dict[str, str]],
+        allow_all: bool,
+    ) -> Optional[str]:
         build_dir = self._get_build_dir(ireq)
         wheel_cache = self.project.make_wheel_cache()
         supported_tags = pip_shims.get_supported(self.interpreter.for_tag())
         if hashes:
             ireq.hash_options = convert_hashes(hashes)
-        with self.get_finder(ignore_requires_python=True) as finder:
-            with allow_all_wheels(allow_all):
-                # temporarily allow all wheels to get a link.
-                populate_link(finder, ireq, False)
+        with self.get_finder(
+            ignore_requires_python=True, ignore_compatibility=allow_all
+        ) as finder:
+            populate_link(finder, ireq, False)
             if hashes is None and not ireq.editable:
                 # If hashes are not given and cache is hit, replace the link with the
                 # cached one. This can speed up by skipping the download and build.
@@ -279,12 +442,17 @@ class Environment:
             if cache_entry is not None:
                 termui.logger.debug("Using cached wheel link: %s", cache_entry.link)
                 return cache_entry.link.file_path
+        return None
+
+    def _build_source(self, ireq: pip_shims.InstallRequirement) -> str:
+        from pdm.builders import EnvEggInfoBuilder, EnvWheelBuilder
 
-        # Otherwise, as all source is already prepared, build it.
+        build_dir = self._get_build_dir(ireq)
         if ireq.editable:
-            builder = EnvEggInfoBuilder(ireq.unpacked_source_directory, self)
-            ret = ireq.metadata_directory = builder.build(build_dir)
+            with EnvEggInfoBuilder(ireq.unpacked_source_directory, self) as builder:
+                ret = ireq.metadata_directory = builder.build(build_dir)
             return ret
+        wheel_cache = self.project.make_wheel_cache()
         should_cache = False
         if ireq.link.is_vcs:
             vcs = pip_shims.VcsSupport()
@@ -301,7 +469,18 @@ class Environment:
         )
         if not os.path.exists(output_dir):
             os.makedirs(output_dir, exist_ok=True)
-        return EnvWheelBuilder(ireq.unpacked_source_directory, self).build(output_dir)
+        with EnvWheelBuilder(ireq.unpacked_source_directory, self) as builder:
+            if not should_cache:
+                return builder.build(output_dir)
+            # Build in a temporary directory and move the wheel into the cache at
+            # once, so that other processes never see a partially written wheel.
+            with tempfile.TemporaryDirectory(
+                prefix="pdm-build-", dir=output_dir
+            ) as temp_dir:
+                built = builder.build(temp_dir)
+                target = os.path.join(output_dir, os.path.basename(built))
+                os.replace(built, target)
+        return target
 
     def get_working_set(self) -> WorkingSet:
         """Get the working set based on local packages directory."""
@@ -401,7 +580,7 @@ class GlobalEnvironment(Environment):
         paths["headers"] = paths["include"]
         return paths
 
-    def is_local(self, path: PathLike) -> bool:
+    def is_local(self, path: str) -> bool:
         return misc.normalize_path(path).startswith(
             misc.normalize_path(self.get_paths()["prefix"])
         )
@@ -409,3 +588,32 @@ class GlobalEnvironment(Environment):
     @property
     def packages_path(self) -> Optional[Path]:
         return None
+
+
+class PrefixEnvironment(Environment):
+    """An environment installing packages into the given prefix, such as the
+    isolated build environments.
+    """
+
+    def __init__(self, project: Project, prefix: str) -> None:
+        super().__init__(project)
+        self.prefix = prefix
+        self.python_requires = PySpecSet(f"=={self.interpreter.version}")
+
+    def get_paths(self) -> Dict[str, str]:
+        paths = get_sys_config_paths(
+            self.interpreter.executable,
+            vars={"base": self.prefix, "platbase": self.prefix},
+        )
+        paths["prefix"] = paths["data"]
+        paths["headers"] = paths["include"]
+        # Wheels with scripts can't be installed unless the directory exists.
+        os.makedirs(paths["scripts"], exist_ok=True)
+        return paths
+
+    def is_local(self, path: str) -> bool:
+        return misc.normalize_path(path).startswith(misc.normalize_path(self.prefix))
+
+    @property
+    def packages_path(self) -> Optional[Path]:
+        return None
@@ -0,0 +1,123 @@
+"""An asyncio engine to send HTTP requests concurrently through a requests session.
+
+The requests are sent by the (thread-safe) session in a thread pool, so that they
+reuse the connection pools and the authentication of PDM. The event loop bounds
+the concurrency per host and schedules the retries, while the callers keep using
+plain synchronous functions through :meth:`AsyncFetcher.fetch_all`.
+"""
+from __future__ import annotations
+
+import asyncio
+import collections
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, List, TypeVar
+from urllib import parse
+
+from pip._vendor.requests import RequestException
+
+from pdm import termui
+
+if TYPE_CHECKING:
+    from pip._vendor.requests import Response, Session
+
+T = TypeVar("T")
+
+#: The status codes of the responses worth retrying.
+RETRY_STATUSES = frozenset({408, 429, 500, 502, 503, 504})
+
+
+class AsyncFetcher:
+    """Fetch URLs concurrently with bounded connections per host and retries
+    with exponential backoff.
+    """
+
+    def __init__(
+        self,
+        session: Session,
+        max_per_host: int = 10,
+        retries: int = 2,
+        backoff: float = 0.5,
+    ) -> None:
+        """
+        :param session: the session to send the requests.
+        :param max_per_host: the max number of concurrent requests to one host.
+        :param retries: the times to retry a request on connection errors and
+            temporary failures of the server.
+        :param backoff: the seconds to wait before the first retry, which is
+            doubled for each following retry.
+        """
+        self.session = session
+        self.max_per_host = max(max_per_host, 1)
+        self.retries = retries
+        self.backoff = backoff
+
+    async def _request(
+        self,
+        url: str,
+        handler: Callable[[Response], T],
+        semaphore: asyncio.Semaphore,
+        executor: ThreadPoolExecutor,
+    ) -> T:
+        loop = asyncio.get_running_loop()
+        get = functools.partial(
+            self.session.get,
+            url,
+            headers={"Accept-Encoding": "identity"},
+            stream=True,
+        )
+        attempt = 0
+        while True:
+            async with semaphore:
+                try:
+                    resp = await loop.run_in_executor(executor, get)
+                except RequestException:
+                    if attempt >= self.retries:
+                        raise
+                else:
+                    try:
+                        if (
+                            resp.status_code not in RETRY_STATUSES
+                            or attempt >= self.retries
+                        ):
+                            resp.raise_for_status()
+                            # The body is streamed to the handler in the thread.
+                            return await loop.run_in_executor(executor, handler, resp)
+                    finally:
+                        resp.close()
+            delay = self.backoff * 2 ** attempt
+            attempt += 1
+            termui.logger.debug("Retrying %s in %.1f seconds", url, delay)
+            await asyncio.sleep(delay)
+
+    async def _fetch_all(
+        self, urls: List[str], handler: Callable[[Response], T]
+    ) -> List[T]:
+        semaphores: Dict[str, asyncio.Semaphore] = collections.defaultdict(
+            lambda: asyncio.Semaphore(self.max_per_host)
+        )
+        hosts = {parse.urlparse(url).netloc for url in urls}
+        with ThreadPoolExecutor(self.max_per_host * len(hosts)) as executor:
+            tasks = [
+                self._request(
+                    url, handler, semaphores[parse.urlparse(url).netloc], executor
+                )
+                for url in urls
+            ]
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        return results
+
+    def fetch_all(
+        self, urls: Iterable[str], handler: Callable[[Response], T]
+    ) -> List[T]:
+        """Fetch the URLs concurrently and return the results of ``handler`` called
+        with each response, in the same order as the URLs. The response bodies are
+        streamed, the first error is raised after all requests are done.
+        """
+        urls = list(urls)
+        if not urls:
+            return []
+        return asyncio.run(self._fetch_all(urls, handler))
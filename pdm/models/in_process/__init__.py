@@ -1,22 +1,50 @@
 """
 A collection of functions that need to be called via a subprocess call.
 """
-import functools
 import json
 import os
 import platform
 import subprocess
 import sys
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import TYPE_CHECKING, Any, Dict, Optional
+
+if TYPE_CHECKING:
+    from pdm.models.caches import InterpreterInfoCache
 
 FOLDER_PATH = Path(__file__).parent
 
 
-@functools.lru_cache()
+# The probed information of interpreters, keyed by the normalized executable path.
+_interpreter_infos: Dict[str, Dict[str, Any]] = {}
+
+
+def get_interpreter_info(
+    executable: str, cache: Optional["InterpreterInfoCache"] = None
+) -> Dict[str, Any]:
+    """Probe the version, architecture, ABI tag, PEP 508 environment and sysconfig
+    paths of the interpreter in one subprocess call.
+
+    :param executable: the path of the python interpreter.
+    :param cache: the cache to look up and store the result, if given.
+    """
+    key = os.path.normcase(os.path.abspath(executable))
+    if key in _interpreter_infos:
+        return _interpreter_infos[key]
+    info = cache.get_info(executable) if cache is not None else None
+    if info is None:
+        script = str(FOLDER_PATH / "interpreter_info.py")
+        info = json.loads(subprocess.check_output(args=[executable, "-Es", script]))
+        # Wrappers like pyenv shims can launch a different interpreter each time,
+        # only persist the result of the real interpreter.
+        if cache is not None and info["executable"] == os.path.realpath(executable):
+            cache.set_info(executable, info)
+    _interpreter_infos[key] = info
+    return info
+
+
 def get_python_abi_tag(executable: str) -> str:
-    script = str(FOLDER_PATH / "get_abi_tag.py")
-    return json.loads(subprocess.check_output(args=[executable, "-Es", script]))
+    return get_interpreter_info(executable)["abi_tag"]
 
 
 def get_sys_config_paths(
@@ -24,12 +52,7 @@ def get_sys_config_paths(
 ) -> Dict[str, str]:
     """Return the sys_config.get_paths() result for the python interpreter"""
     if not vars:
-        args = [
-            executable,
-            "-Esc",
-            "import sysconfig,json;print(json.dumps(sysconfig.get_paths()))",
-        ]
-        return json.loads(subprocess.check_output(args))
+        return dict(get_interpreter_info(executable)["sys_config_paths"])
     else:
         env = os.environ.copy()
         env.update(SYSCONFIG_VARS=json.dumps(vars))
@@ -44,26 +67,11 @@ def get_sys_config_paths(
 
 def get_pep508_environment(executable: str) -> Dict[str, Any]:
     """Get PEP 508 environment markers dict."""
-    script = str(FOLDER_PATH / "pep508.py")
-    args = [executable, "-Es", script]
-    return json.loads(subprocess.check_output(args))
+    return dict(get_interpreter_info(executable)["pep508_environment"])
 
 
-@functools.lru_cache()
 def get_architecture(executable: str) -> str:
     """Get the architecture bits for the given python executable"""
     if os.path.normpath(executable) == os.path.normpath(sys.executable):
         return platform.architecture()[0]
-    bits, _ = platform.architecture(executable, "_DEFAULT")
-    if bits != "_DEFAULT":
-        return bits
-    # On non-Unix platforms that do not support 'file' command,
-    # platform.architecture(executable) cannot return the correct arch.
-    # Retrieve it in subprocess instead.
-    return (
-        subprocess.check_output(
-            [executable, "-Esc", "import platform;print(platform.architecture()[0])"]
-        )
-        .decode("utf8")
-        .strip()
-    )
+    return get_interpreter_info(executable)["architecture"]
@@ -41,7 +41,8 @@ def get_flag(var, fallback, expected=True, warn=True):
     return val == expected
 
 
-if __name__ == "__main__":
+def get_abi_tag():
+    """Returns the ABI tag of the running interpreter."""
     soabi = get_config_var("SOABI")
     impl = get_abbr_impl()
     python_version = sys.version_info[:2]
@@ -71,4 +72,8 @@ if __name__ == "__main__":
     elif soabi:
         abi = soabi.replace(".", "_").replace("-", "_")
 
-    print(json.dumps(abi))
+    return abi
+
+
+if __name__ == "__main__":
+    print(json.dumps(get_abi_tag()))
@@ -0,0 +1,27 @@
+# mypy: ignore-errors
+import json
+import os
+import platform
+import sys
+import sysconfig
+
+from get_abi_tag import get_abi_tag
+from pep508 import default_environment
+
+
+def get_interpreter_info():
+    """Collect the information of the running interpreter needed by PDM,
+    so that it can be probed with only one subprocess call.
+    """
+    return {
+        "executable": os.path.realpath(sys.executable),
+        "version": ".".join(str(v) for v in sys.version_info[:3]),
+        "architecture": platform.architecture()[0],
+        "abi_tag": get_abi_tag(),
+        "pep508_environment": default_environment(),
+        "sys_config_paths": sysconfig.get_paths(),
+    }
+
+
+if __name__ == "__main__":
+    print(json.dumps(get_interpreter_info()))
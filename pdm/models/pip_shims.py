@@ -12,7 +12,12 @@ from typing import TYPE_CHECKING, Iterator, Optional, Tuple
 
 from pip._internal.cache import WheelCache
 from pip._internal.commands.install import InstallCommand as _InstallCommand
-from pip._internal.index.package_finder import PackageFinder
+from pip._internal.exceptions import InvalidWheelFilename
+from pip._internal.index.package_finder import (
+    CandidateEvaluator,
+    LinkEvaluator,
+    PackageFinder,
+)
 from pip._internal.models.candidate import InstallationCandidate
 from pip._internal.models.format_control import FormatControl
 from pip._internal.models.link import Link
@@ -21,6 +26,7 @@ from pip._internal.models.wheel import Wheel as PipWheel
 from pip._internal.network.auth import MultiDomainBasicAuth
 from pip._internal.network.cache import SafeFileCache
 from pip._internal.network.download import Downloader
+from pip._internal.network.session import PipSession
 from pip._internal.operations.prepare import unpack_url
 from pip._internal.req import InstallRequirement, req_uninstall
 from pip._internal.req.constructors import (
@@ -38,6 +44,18 @@ from pip._internal.utils.temp_dir import global_tempdir_manager
 from pip._internal.utils.urls import path_to_url, url_to_path
 from pip._internal.vcs.versioncontrol import VcsSupport
 
+try:
+    from pip._internal.network.lazy_wheel import (
+        HTTPRangeRequestUnsupported,
+        LazyZipOverHTTP,
+    )
+except ImportError:  # pip < 20.2, the wheels are always downloaded.
+    LazyZipOverHTTP = None
+
+    class HTTPRangeRequestUnsupported(Exception):  # type: ignore
+        pass
+
+
 if TYPE_CHECKING:
     from optparse import Values
 
@@ -53,6 +71,7 @@ def get_package_finder(
     python_version: Optional[Tuple[int, ...]] = None,
     python_abi_tag: Optional[str] = None,
     ignore_requires_python: Optional[bool] = None,
+    session: Optional[PipSession] = None,
 ) -> PackageFinder:
     """Shim for compatibility to generate package finders.
 
@@ -62,8 +81,9 @@ def get_package_finder(
     """
     if options is None:
         options, _ = install_cmd.parser.parse_args([])
-    session = install_cmd._build_session(options)
-    atexit.register(session.close)
+    if session is None:
+        session = install_cmd._build_session(options)
+        atexit.register(session.close)
     build_kwargs = {"options": options, "session": session}
     if python_version:
         assert python_abi_tag is not None
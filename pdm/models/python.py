@@ -1,13 +1,18 @@
 import dataclasses
 import os
-from typing import Any, Tuple
+import subprocess
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Optional, Tuple
 
 from packaging.version import Version
 from pythonfinder.models.python import PythonVersion
 
-from pdm.models.in_process import get_architecture
+from pdm.models.in_process import get_architecture, get_interpreter_info
 from pdm.utils import cached_property
 
+if TYPE_CHECKING:
+    from pdm.models.caches import InterpreterInfoCache
+
 
 @dataclasses.dataclass
 class PythonInfo:
@@ -23,8 +28,22 @@ class PythonInfo:
         return cls(executable=py_version.executable, version=py_version.version)
 
     @classmethod
-    def from_path(cls, path: os.PathLike) -> "PythonInfo":
-        return cls.from_python_version(PythonVersion.from_path(str(path)))
+    def from_path(
+        cls, path: os.PathLike, cache: Optional["InterpreterInfoCache"] = None
+    ) -> "PythonInfo":
+        """Create an instance by probing the interpreter at the given path.
+
+        :param path: the path of the python interpreter.
+        :param cache: the cache of the probed results, to avoid spawning
+            the interpreter again.
+        """
+        try:
+            info = get_interpreter_info(str(path), cache)
+        except FileNotFoundError:
+            raise
+        except (OSError, subprocess.CalledProcessError, ValueError) as e:
+            raise ValueError(f"Not a valid python path: {path}") from e
+        return cls(executable=Path(path).as_posix(), version=Version(info["version"]))
 
     def __hash__(self) -> int:
         return hash(os.path.normpath(self.executable))
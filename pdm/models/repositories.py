@@ -2,6 +2,8 @@ from __future__ import annotations
 
 import dataclasses
 import sys
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from functools import lru_cache, wraps
 from typing import (
     TYPE_CHECKING,
@@ -20,6 +22,7 @@ from pip._vendor.html5lib import parse
 from pdm import termui
 from pdm._types import CandidateInfo, Package, SearchResult, Source
 from pdm.exceptions import CandidateInfoNotFound, CandidateNotFound, CorruptedCacheError
+from pdm.models import pip_shims
 from pdm.models.candidates import Candidate
 from pdm.models.requirements import (
     Requirement,
@@ -27,7 +30,7 @@ from pdm.models.requirements import (
     parse_requirement,
 )
 from pdm.models.specifiers import PySpecSet, get_specifier
-from pdm.utils import allow_all_wheels, normalize_name, url_without_fragments
+from pdm.utils import normalize_name, url_without_fragments
 
 if TYPE_CHECKING:
     from pdm.models.environment import Environment
@@ -60,6 +63,13 @@ class BaseRepository:
         self._candidate_info_cache = environment.project.make_candidate_info_cache()
         self._hash_cache = environment.project.make_hash_cache()
 
+    def flush_cache(self) -> None:
+        """Write the buffered metadata of candidates to the cache."""
+        self._candidate_info_cache.flush()
+
+    def close(self) -> None:
+        """Release the threads held by the repository."""
+
     def get_filtered_sources(self, req: Requirement) -> List[Source]:
         """Get matching sources based on the index attribute."""
         return self.sources
@@ -93,6 +103,19 @@ class BaseRepository:
     def _find_candidates(self, requirement: Requirement) -> Iterable[Candidate]:
         raise NotImplementedError
 
+    def find_candidates_many(
+        self, requirements: Iterable[Requirement]
+    ) -> Dict[str, List[Candidate]]:
+        """Find candidates of many named requirements at once and remember them, so
+        that the following calls of ``find_candidates()`` can be served locally.
+        Nothing is done by default, override it in repositories that can fetch
+        candidates concurrently.
+
+        :param requirements: an iterable of requirements
+        :returns: a dict of identifier: candidates for what are found
+        """
+        return {}
+
     def find_candidates(
         self,
         requirement: Requirement,
@@ -203,10 +226,10 @@ class BaseRepository:
             matching_candidates = self.find_candidates(req, allow_all=True)
         with self.environment.get_finder(self.sources) as finder:
             self._hash_cache.session = finder.session
-            return {
-                c.link.filename: self._hash_cache.get_hash(c.link)
-                for c in matching_candidates
-            }
+            return self._hash_cache.get_hashes(
+                (c.link for c in matching_candidates),
+                int(self.environment.project.config["pypi.max_connections"]),
+            )
 
     def dependency_generators(self) -> Iterable[Callable[[Candidate], CandidateInfo]]:
         """Return an iterable of getter functions to get dependencies, which will be
@@ -227,6 +250,19 @@ class PyPIRepository(BaseRepository):
     """Get package and metadata from PyPI source."""
 
     DEFAULT_INDEX_URL = "https://pypi.org"
+    #: The max number of threads to fetch index pages concurrently
+    FETCH_WORKERS = 8
+
+    def __init__(self, sources: List[Source], environment: Environment) -> None:
+        super().__init__(sources, environment)
+        self._index_lock = threading.Lock()
+        self._index_pages: Dict[Tuple[str, ...], Future] = {}
+        self._fetch_executor: Optional[ThreadPoolExecutor] = None
+
+    def close(self) -> None:
+        if self._fetch_executor is not None:
+            self._fetch_executor.shutdown(wait=True)
+            self._fetch_executor = None
 
     @cache_result
     def _get_dependencies_from_json(self, candidate: Candidate) -> CandidateInfo:
@@ -242,11 +278,16 @@ class PyPIRepository(BaseRepository):
             )
             if proc_url.endswith("/simple")
         ]
+        failures = self.environment.project.make_failure_cache()
         with self.environment.get_finder(sources) as finder:
             session = finder.session
             for prefix in url_prefixes:
                 json_url = f"{prefix}/pypi/{candidate.name}/{candidate.version}/json"
+                if failures.get_failure(f"json:{json_url}") is not None:
+                    continue
                 resp = session.get(json_url)
+                if resp.status_code == 404:
+                    failures.set_failure(f"json:{json_url}", resp.reason)
                 if not resp.ok:
                     continue
 
@@ -270,14 +311,45 @@ class PyPIRepository(BaseRepository):
             yield self._get_dependencies_from_json
         yield self._get_dependencies_from_metadata
 
+    def _find_installation_candidates(
+        self, project_name: str, sources: List[Source]
+    ) -> List[pip_shims.InstallationCandidate]:
+        """Fetch the index pages of the project from the sources. Results are shared
+        between requirements of the same project, and a concurrent call for the same
+        project waits for the one in flight instead of fetching again.
+        """
+        key = (normalize_name(project_name),) + tuple(
+            source["url"] for source in sources
+        )
+        with self._index_lock:
+            future = self._index_pages.get(key)
+            is_owner = future is None
+            if is_owner:
+                future = self._index_pages[key] = Future()
+        if is_owner:
+            try:
+                with self.environment.get_finder(
+                    sources, True, ignore_compatibility=True
+                ) as finder:
+                    found = list(finder.find_all_candidates(project_name))
+            except BaseException as e:
+                # Don't remember the failure so that it can be retried later.
+                with self._index_lock:
+                    del self._index_pages[key]
+                future.set_exception(e)
+            else:
+                future.set_result(found)
+        return future.result()
+
     @lru_cache()
     def _find_candidates(self, requirement: Requirement) -> Iterable[Candidate]:
         sources = self.get_filtered_sources(requirement)
-        with self.environment.get_finder(sources, True) as finder, allow_all_wheels():
-            cans = [
-                Candidate.from_installation_candidate(c, requirement, self.environment)
-                for c in finder.find_all_candidates(requirement.project_name)
-            ]
+        cans = [
+            Candidate.from_installation_candidate(c, requirement, self.environment)
+            for c in self._find_installation_candidates(
+                requirement.project_name, sources
+            )
+        ]
         if not cans:
             raise CandidateNotFound(
                 f"Unable to find candidates for {requirement.project_name}. There may "
@@ -285,6 +357,27 @@ class PyPIRepository(BaseRepository):
             )
         return cans
 
+    def find_candidates_many(
+        self, requirements: Iterable[Requirement]
+    ) -> Dict[str, List[Candidate]]:
+        named = {req.identify(): req for req in requirements if req.is_named}
+        if not named:
+            return {}
+        if self._fetch_executor is None:
+            self._fetch_executor = ThreadPoolExecutor(self.FETCH_WORKERS)
+        futures = {
+            key: self._fetch_executor.submit(self._find_candidates, req)
+            for key, req in named.items()
+        }
+        result = {}
+        for key, future in futures.items():
+            try:
+                result[key] = list(future.result())
+            except Exception as e:
+                # Errors are left to be raised when the resolver asks for it.
+                termui.logger.debug("\tFailed to fetch candidates of %s: %s", key, e)
+        return result
+
     def search(self, query: str) -> SearchResult:
         pypi_simple = self.sources[0]["url"].rstrip("/")
         results = []
@@ -16,6 +16,7 @@ class Setup:
     install_requires: List[str] = field(default_factory=list)
     extras_require: Dict[str, List[str]] = field(default_factory=dict)
     python_requires: Optional[str] = None
+    summary: Optional[str] = None
 
     def update(self, other: "Setup") -> None:
         if other.name:
@@ -28,6 +29,8 @@ class Setup:
             self.extras_require = other.extras_require
         if other.python_requires:
             self.python_requires = other.python_requires
+        if other.summary:
+            self.summary = other.summary
 
     def as_dict(self) -> Dict[str, Any]:
         return asdict(self)
@@ -36,6 +39,13 @@ class Setup:
     def from_directory(cls, dir: Path) -> "Setup":
         return _SetupReader.read_from_directory(dir)
 
+    @classmethod
+    def from_directory_static(cls, dir: Path) -> Optional["Setup"]:
+        """Read the metadata without building the project, return None if the
+        dependencies or the python requirement are computed at build time.
+        """
+        return _SetupReader.read_static_from_directory(dir)
+
 
 class _SetupReader:
     """
@@ -61,6 +71,180 @@ class _SetupReader:
 
         return result
 
+    @classmethod
+    def read_static_from_directory(cls, directory: Path) -> Optional[Setup]:
+        for filename, file_reader in [
+            ("PKG-INFO", cls.read_pkg_info_static),
+            ("pyproject.toml", cls.read_pyproject_toml_static),
+        ]:
+            filepath = directory / filename
+            if filepath.exists():
+                result = file_reader(filepath)
+                if result is not None:
+                    return result
+
+        setup_cfg = directory / "setup.cfg"
+        setup_py = directory / "setup.py"
+        if not setup_cfg.exists() and not setup_py.exists():
+            return None
+        result = Setup()
+        if setup_cfg.exists():
+            new_result = cls.read_setup_cfg_static(setup_cfg)
+            if new_result is None:
+                return None
+            result.update(new_result)
+        if setup_py.exists():
+            new_result = cls.read_setup_py_static(setup_py)
+            if new_result is None:
+                return None
+            result.update(new_result)
+        return result
+
+    @staticmethod
+    def read_pkg_info_static(file: Path) -> Optional[Setup]:
+        """PKG-INFO is reliable since metadata version 2.2, where the fields computed
+        at build time are marked as dynamic.
+        """
+        from email.parser import HeaderParser
+
+        from pdm.models.markers import split_marker_extras
+        from pdm.models.requirements import parse_requirement
+
+        with file.open(encoding="utf-8") as f:
+            info = HeaderParser().parse(f)
+        try:
+            metadata_version = tuple(
+                int(p) for p in info.get("Metadata-Version", "").split(".")
+            )
+        except ValueError:
+            return None
+        dynamic = {field.lower() for field in info.get_all("Dynamic", [])}
+        if metadata_version < (2, 2) or dynamic & {"requires-dist", "requires-python"}:
+            return None
+
+        install_requires: List[str] = []
+        extras_require: Dict[str, List[str]] = {}
+        for extra in info.get_all("Provides-Extra", []):
+            extras_require[extra] = []
+        for line in info.get_all("Requires-Dist", []):
+            req = parse_requirement(line)
+            extras, rest = split_marker_extras(req.marker) if req.marker else ((), None)
+            req.marker = rest
+            if not extras:
+                install_requires.append(req.as_line())
+            for extra in extras:
+                extras_require.setdefault(extra, []).append(req.as_line())
+        return Setup(
+            name=info.get("Name"),
+            version=info.get("Version"),
+            install_requires=install_requires,
+            extras_require=extras_require,
+            python_requires=info.get("Requires-Python"),
+            summary=info.get("Summary"),
+        )
+
+    @classmethod
+    def read_pyproject_toml_static(cls, file: Path) -> Optional[Setup]:
+        from pdm.project.metadata import MutableMetadata
+
+        try:
+            metadata = MutableMetadata(file)
+        except ValueError:
+            return None
+        dynamic = set(metadata.dynamic or [])
+        if dynamic & {"dependencies", "optional-dependencies", "requires-python"}:
+            return None
+        return cls.read_pyproject_toml(file)
+
+    @classmethod
+    def read_setup_cfg_static(cls, file: Path) -> Optional[Setup]:
+        result = cls.read_setup_cfg(file)
+        values = [
+            *result.install_requires,
+            *(dep for deps in result.extras_require.values() for dep in deps),
+            result.python_requires or "",
+        ]
+        if any(value.startswith(("file:", "attr:")) for value in values):
+            return None
+        if result.version and result.version.startswith(("file:", "attr:")):
+            result.version = None
+        return result
+
+    @no_type_check
+    @classmethod
+    def read_setup_py_static(cls, file: Path) -> Optional[Setup]:
+        """Only accept setup() calls whose dependencies and python requirement are
+        given as literals, or as variables assigned once to literals.
+        """
+        with file.open(encoding="utf-8") as f:
+            content = f.read()
+
+        try:
+            tree = ast.parse(content)
+        except SyntaxError:
+            return None
+        setup_call, body = cls._find_setup_call(tree.body)
+        if not setup_call or cls._find_call_kwargs(setup_call) is not None:
+            return None
+        for name in ("install_requires", "extras_require", "python_requires"):
+            value = cls._find_in_call(setup_call, name)
+            if value is not None and not cls._is_literal(value, tree):
+                return None
+
+        result = Setup(
+            install_requires=cls._find_install_requires(setup_call, body),
+            extras_require=cls._find_extras_require(setup_call, body),
+            python_requires=cls._find_single_string(
+                setup_call, body, "python_requires"
+            ),
+        )
+        for field_name, name in [
+            ("name", "name"),
+            ("version", "version"),
+            ("summary", "description"),
+        ]:
+            value = cls._find_in_call(setup_call, name)
+            if value is not None and cls._is_literal(value, tree):
+                setattr(
+                    result, field_name, cls._find_single_string(setup_call, body, name)
+                )
+        return result
+
+    @classmethod
+    def _is_literal(cls, value: Any, tree: ast.Module) -> bool:
+        if isinstance(value, ast.Name):
+            assignments = [
+                node
+                for node in ast.walk(tree)
+                if isinstance(node, (ast.Assign, ast.AugAssign, ast.AnnAssign))
+                and any(
+                    isinstance(target, ast.Name) and target.id == value.id
+                    for target in (
+                        node.targets if isinstance(node, ast.Assign) else [node.target]
+                    )
+                )
+            ]
+            # A variable that is assigned more than once or modified in place
+            # can't be evaluated statically.
+            modified = any(
+                isinstance(node, ast.Attribute)
+                and isinstance(node.value, ast.Name)
+                and node.value.id == value.id
+                for node in ast.walk(tree)
+            )
+            if (
+                len(assignments) != 1
+                or not isinstance(assignments[0], ast.Assign)
+                or modified
+            ):
+                return False
+            value = assignments[0].value
+        try:
+            ast.literal_eval(value)
+        except (ValueError, TypeError):
+            return False
+        return True
+
     @staticmethod
     def read_pyproject_toml(file: Path) -> Setup:
         from pdm.project.metadata import MutableMetadata
@@ -75,6 +259,7 @@ class _SetupReader:
             install_requires=metadata.dependencies,
             extras_require=metadata.optional_dependencies,
             python_requires=metadata.requires_python,
+            summary=metadata.description,
         )
 
     @no_type_check
@@ -98,6 +283,7 @@ class _SetupReader:
             python_requires=cls._find_single_string(
                 setup_call, body, "python_requires"
             ),
+            summary=cls._find_single_string(setup_call, body, "description"),
         )
 
     @staticmethod
@@ -108,12 +294,16 @@ class _SetupReader:
 
         name = None
         version = None
+        summary = None
         if parser.has_option("metadata", "name"):
             name = parser.get("metadata", "name")
 
         if parser.has_option("metadata", "version"):
             version = parser.get("metadata", "version")
 
+        if parser.has_option("metadata", "description"):
+            summary = parser.get("metadata", "description")
+
         install_requires = []
         extras_require: Dict[str, List[str]] = {}
         python_requires = None
@@ -146,6 +336,7 @@ class _SetupReader:
             install_requires=install_requires,
             extras_require=extras_require,
             python_requires=python_requires,
+            summary=summary,
         )
 
     @classmethod
@@ -76,6 +76,30 @@ class Config(MutableMapping[str, str]):
         "cache_dir": ConfigItem(
             "The root directory of cached files", appdirs.user_cache_dir("pdm"), True
         ),
+        "cache.index_max_age": ConfigItem(
+            "Seconds to serve index pages from the cache without revalidating them",
+            0,
+            env_var="PDM_INDEX_MAX_AGE",
+            coerce=int,
+        ),
+        "cache.metadata_flush_interval": ConfigItem(
+            "Seconds to buffer new package metadata before writing it to the cache",
+            10,
+            env_var="PDM_METADATA_FLUSH_INTERVAL",
+            coerce=int,
+        ),
+        "cache.max_build_envs": ConfigItem(
+            "The number of isolated build environments to keep in the cache",
+            10,
+            env_var="PDM_MAX_BUILD_ENVS",
+            coerce=int,
+        ),
+        "cache.failure_ttl": ConfigItem(
+            "Seconds to remember failed builds and missing metadata, 0 to disable",
+            86400,
+            env_var="PDM_CACHE_FAILURE_TTL",
+            coerce=int,
+        ),
         "auto_global": ConfigItem(
             "Use global package implicity if no local project is found",
             False,
@@ -95,12 +119,58 @@ class Config(MutableMapping[str, str]):
             env_var="PDM_RESOLVE_MAX_ROUDNS",
             coerce=int,
         ),
+        "strategy.prefetch_candidates": ConfigItem(
+            "The number of top-ranked candidates whose metadata is fetched ahead of "
+            "time during resolution, 0 to disable",
+            2,
+            env_var="PDM_PREFETCH_CANDIDATES",
+            coerce=int,
+        ),
+        "strategy.build_workers": ConfigItem(
+            "The number of local and VCS packages built in parallel during resolution, "
+            "0 to decide by the CPU count and the available memory",
+            0,
+            env_var="PDM_BUILD_WORKERS",
+            coerce=int,
+        ),
+        "strategy.static_metadata": ConfigItem(
+            "Read the dependencies of source distributions and local directories from "
+            "static project files, and only build them when the dependencies are "
+            "dynamic",
+            False,
+            env_var="PDM_STATIC_METADATA",
+            coerce=ensure_boolean,
+        ),
         "parallel_install": ConfigItem(
             "Whether to perform installation and uninstallation in parallel",
             True,
             env_var="PDM_PARALLEL_INSTALL",
             coerce=ensure_boolean,
         ),
+        "install.max_workers": ConfigItem(
+            "The number of packages installed in parallel, 0 to use the CPU count",
+            0,
+            env_var="PDM_INSTALL_MAX_WORKERS",
+            coerce=int,
+        ),
+        "install.executor": ConfigItem(
+            "Unpack the wheels of the parallel installation in a thread or process "
+            "pool",
+            "thread",
+            env_var="PDM_INSTALL_EXECUTOR",
+        ),
+        "install.cache": ConfigItem(
+            "Link the installed files from a package store in the cache",
+            False,
+            env_var="PDM_INSTALL_CACHE",
+            coerce=ensure_boolean,
+        ),
+        "install.compile_bytecode": ConfigItem(
+            "Compile the installed Python files to bytecode",
+            True,
+            env_var="PDM_COMPILE_BYTECODE",
+            coerce=ensure_boolean,
+        ),
         "python.path": ConfigItem("The Python interpreter path", env_var="PDM_PYTHON"),
         "python.use_pyenv": ConfigItem(
             "Use the pyenv interpreter", True, coerce=ensure_boolean
@@ -119,6 +189,18 @@ class Config(MutableMapping[str, str]):
             env_var="PDM_PYPI_JSON_API",
             coerce=ensure_boolean,
         ),
+        "pypi.max_connections": ConfigItem(
+            "The max number of connections to keep open to each host",
+            10,
+            env_var="PDM_PYPI_MAX_CONNECTIONS",
+            coerce=int,
+        ),
+        "pypi.lazy_wheel": ConfigItem(
+            "Read the metadata of remote wheels with HTTP range requests",
+            True,
+            env_var="PDM_PYPI_LAZY_WHEEL",
+            coerce=ensure_boolean,
+        ),
         "use_venv": ConfigItem(
             "Install packages into the activated venv site packages instead of PEP 582",
             False,
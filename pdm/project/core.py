@@ -7,7 +7,17 @@ import re
 import shutil
 import sys
 from pathlib import Path
-from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Type, Union
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    ContextManager,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Type,
+    Union,
+)
 
 import atoml
 from pythonfinder import Finder
@@ -17,7 +27,12 @@ from pdm import termui
 from pdm._types import Source
 from pdm.exceptions import NoPythonVersion, PdmUsageError, ProjectError
 from pdm.models import pip_shims
-from pdm.models.caches import CandidateInfoCache, HashCache
+from pdm.models.caches import (
+    CandidateInfoCache,
+    FailureCache,
+    HashCache,
+    InterpreterInfoCache,
+)
 from pdm.models.candidates import Candidate
 from pdm.models.environment import Environment, GlobalEnvironment
 from pdm.models.python import PythonInfo
@@ -30,6 +45,7 @@ from pdm.utils import (
     atomic_open_for_write,
     cached_property,
     cd,
+    file_lock,
     find_project_root,
     find_python_in_path,
     get_in_project_venv_python,
@@ -158,12 +174,13 @@ class Project:
     def resolve_interpreter(self) -> PythonInfo:
         """Get the Python interpreter path."""
         config = self.config
+        interpreter_cache = self.make_interpreter_cache()
         if self.project_config.get("python.path") and not os.getenv(
             "PDM_IGNORE_SAVED_PYTHON"
         ):
             saved_path = self.project_config["python.path"]
             try:
-                return PythonInfo.from_path(saved_path)
+                return PythonInfo.from_path(saved_path, interpreter_cache)
             except (ValueError, FileNotFoundError):
                 del self.project_config["python.path"]
         if os.name == "nt":
@@ -175,7 +192,7 @@ class Project:
         virtual_env = os.getenv("VIRTUAL_ENV")
         if config["use_venv"] and virtual_env:
             return PythonInfo.from_path(
-                os.path.join(virtual_env, scripts, f"python{suffix}")
+                os.path.join(virtual_env, scripts, f"python{suffix}"), interpreter_cache
             )
 
         for py_version in self.find_interpreters():
@@ -511,6 +528,15 @@ dependencies = ["pip", "setuptools", "wheel"]
         path.mkdir(parents=True, exist_ok=True)
         return path
 
+    def cache_lock(self, name: str, shared: bool = False) -> ContextManager[None]:
+        """Lock the cache of the given type against other processes.
+
+        Processes using the cache hold shared locks, while removing files from it
+        requires an exclusive lock.
+        """
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        return file_lock(self.cache_dir / f"{name}.lock", shared)
+
     def make_wheel_cache(self) -> pip_shims.WheelCache:
         return pip_shims.WheelCache(
             self.cache_dir.as_posix(), pip_shims.FormatControl(set(), set())
@@ -521,12 +547,25 @@ dependencies = ["pip", "setuptools", "wheel"]
         python_hash = hashlib.sha1(
             str(self.environment.python_requires).encode()
         ).hexdigest()
-        file_name = f"package_meta_{python_hash}.json"
-        return CandidateInfoCache(self.cache("metadata") / file_name)
+        file_name = f"package_meta_{python_hash}.db"
+        return CandidateInfoCache(
+            self.cache("metadata") / file_name,
+            int(self.config["cache.metadata_flush_interval"]),
+            self.cache_dir / "metadata.lock",
+        )
 
     def make_hash_cache(self) -> HashCache:
         return HashCache(directory=self.cache("hashes").as_posix())
 
+    def make_interpreter_cache(self) -> InterpreterInfoCache:
+        return InterpreterInfoCache(directory=self.cache("interpreters").as_posix())
+
+    def make_failure_cache(self) -> FailureCache:
+        return FailureCache(
+            directory=self.cache("failures").as_posix(),
+            ttl=int(self.config["cache.failure_ttl"]),
+        )
+
     def find_interpreters(
         self, python_spec: Optional[str] = None
     ) -> Iterable[PythonInfo]:
@@ -539,30 +578,31 @@ dependencies = ["pip", "setuptools", "wheel"]
         """
         config = self.config
         python: Optional[os.PathLike] = None
+        interpreter_cache = self.make_interpreter_cache()
 
         if not python_spec:
             if config.get("python.use_pyenv", True) and PYENV_INSTALLED:
                 pyenv_shim = os.path.join(PYENV_ROOT, "shims", "python")
                 if os.path.exists(pyenv_shim):
-                    yield PythonInfo.from_path(pyenv_shim)
+                    yield PythonInfo.from_path(pyenv_shim, interpreter_cache)
             if config.get("use_venv"):
                 python = get_in_project_venv_python(self.root)
                 if python:
-                    yield PythonInfo.from_path(python)
+                    yield PythonInfo.from_path(python, interpreter_cache)
             python = shutil.which("python")
             if python:
-                yield PythonInfo.from_path(python)
+                yield PythonInfo.from_path(python, interpreter_cache)
             args = []
         else:
             if not all(c.isdigit() for c in python_spec.split(".")):
                 if Path(python_spec).exists():
                     python = find_python_in_path(python_spec)
                     if python:
-                        yield PythonInfo.from_path(python)
+                        yield PythonInfo.from_path(python, interpreter_cache)
                 else:
                     python = shutil.which(python_spec)
                     if python:
-                        yield PythonInfo.from_path(python)
+                        yield PythonInfo.from_path(python, interpreter_cache)
                 return
             args = [int(v) for v in python_spec.split(".") if v != ""]
         finder = Finder()
@@ -570,4 +610,4 @@ dependencies = ["pip", "setuptools", "wheel"]
             yield PythonInfo.from_python_version(entry.py_version)
         if not python_spec:
             this_python = getattr(sys, "_base_executable", sys.executable)
-            yield PythonInfo.from_path(this_python)
+            yield PythonInfo.from_path(this_python, interpreter_cache)
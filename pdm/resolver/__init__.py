@@ -1 +1 @@
-from pdm.resolver.core import resolve  # noqa
+from pdm.resolver.core import resolve, walk_lockfile  # noqa
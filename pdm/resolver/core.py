@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import collections
 from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
 
 from resolvelib.resolvers import Resolution
@@ -10,6 +11,7 @@ if TYPE_CHECKING:
     from resolvelib.resolvers import Criterion, Resolver
 
     from pdm.models.candidates import Candidate
+    from pdm.models.repositories import LockedRepository
     from pdm.models.requirements import Requirement
     from pdm.models.specifiers import PySpecSet
 
@@ -46,7 +48,14 @@ def resolve(
         3. A map of package descriptions fetched from PyPI source.
     """
     provider = resolver.provider
-    result = resolver.resolve(requirements, max_rounds)
+    # Fetch the candidates of all direct requirements at once.
+    provider.repository.find_candidates_many(requirements)
+    # Build the local and VCS requirements in parallel.
+    provider.schedule_builds(requirements)
+    try:
+        result = resolver.resolve(requirements, max_rounds)
+    finally:
+        provider.shutdown()
 
     mapping = result.mapping
     for key, candidate in list(result.mapping.items()):
@@ -60,6 +69,61 @@ def resolve(
             del mapping[key]
         else:
             candidate.requires_python = str(candidate_requires)
-            candidate.hashes = provider.get_hashes(candidate)
+    pinned = [candidate for key, candidate in mapping.items() if key is not None]
+    for candidate, hashes in zip(pinned, provider.get_hashes_many(pinned)):
+        candidate.hashes = hashes
 
     return mapping, provider.fetched_dependencies, provider.summary_collection
+
+
+def _is_pinned_by(requirement: Requirement, candidate: Candidate) -> bool:
+    if not requirement.specifier:
+        return True
+    return requirement.specifier.contains(candidate.version, True)
+
+
+def walk_lockfile(
+    repository: LockedRepository,
+    requirements: List[Requirement],
+    requires_python: PySpecSet,
+) -> Optional[Dict[str, Candidate]]:
+    """Select the locked candidates needed by the requirements by walking the
+    dependency graph recorded in the lockfile, without running the resolver.
+
+    Return None if the lockfile can't satisfy the requirements in a single pass,
+    in which case the caller should fall back to :func:`resolve`.
+    """
+    mapping: Dict[str, Candidate] = {}
+    queue = collections.deque(requirements)
+    while queue:
+        requirement = queue.popleft()
+        if not requirement.key:
+            # The name of a local requirement is unknown until it is built.
+            return None
+        key = requirement.identify()
+        if key in mapping:
+            if not _is_pinned_by(requirement, mapping[key]):
+                return None
+            continue
+        candidates = [
+            can
+            for can in repository.find_candidates(requirement, requires_python)
+            if _is_pinned_by(requirement, can)
+        ]
+        if len(candidates) != 1:
+            return None
+        candidate = candidates[0]
+        dependencies, candidate_requires, _ = repository.get_dependencies(candidate)
+        if (requires_python & candidate_requires).is_impossible:
+            continue
+        candidate.requires_python = str(candidate_requires)
+        candidate.hashes = repository.get_hashes(candidate)
+        mapping[key] = candidate
+        queue.extend(
+            dep
+            for dep in dependencies
+            if not (
+                dep.requires_python & candidate_requires & requires_python
+            ).is_impossible
+        )
+    return mapping
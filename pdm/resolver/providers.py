@@ -1,8 +1,23 @@
-from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Union
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
 
 from resolvelib import AbstractProvider
 from resolvelib.resolvers import RequirementInformation
 
+from pdm.models import pip_shims
 from pdm.models.candidates import Candidate
 from pdm.models.repositories import BaseRepository
 from pdm.models.requirements import Requirement
@@ -11,6 +26,13 @@ from pdm.utils import url_without_fragments
 
 
 class BaseProvider(AbstractProvider):
+    #: The max number of threads to fetch candidate metadata ahead of time
+    PREFETCH_WORKERS = 4
+    #: The max number of candidates whose hashes are collected at the same time
+    HASH_WORKERS = 4
+    #: The estimated memory needed by a build, to limit the number of parallel builds
+    BUILD_MEMORY = 512 * 1024 * 1024
+
     def __init__(
         self,
         repository: BaseRepository,
@@ -23,6 +45,19 @@ class BaseProvider(AbstractProvider):
         self.requires_python_collection: Dict[str, PySpecSet] = {}
         self.summary_collection: Dict[str, str] = {}
         self.fetched_dependencies: Dict[str, List[Requirement]] = {}
+        self.prefetch_candidates = int(
+            repository.environment.project.config["strategy.prefetch_candidates"]
+        )
+        self._prefetch_executor: Optional[ThreadPoolExecutor] = None
+        self._prefetched: Dict[Tuple[str, str], Future] = {}
+        self._prefetched_requirements: Set[str] = set()
+        self._prefetch_jobs: List[Future] = []
+        self.build_workers = (
+            int(repository.environment.project.config["strategy.build_workers"])
+            or self._default_build_workers()
+        )
+        self._build_executor: Optional[ThreadPoolExecutor] = None
+        self._builds: Dict[str, Future] = {}
 
     def identify(self, requirement_or_candidate: Union[Requirement, Candidate]) -> str:
         return requirement_or_candidate.identify()
@@ -46,20 +81,136 @@ class BaseProvider(AbstractProvider):
         file_req = next((req for req in reqs if not req.is_named), None)
         incompat = list(incompatibilities[identifier])
         if file_req:
-            can = Candidate(file_req, self.repository.environment)
-            can.get_metadata()
-            candidates = [can]
+            candidates = [self._get_built_candidate(file_req)]
         else:
             candidates = self.repository.find_candidates(
                 reqs[0],
                 self.requires_python,
                 self.allow_prereleases,
             )
-        return [
+        matches = [
             can
             for can in candidates
             if all(self.is_satisfied_by(r, can) for r in reqs) and can not in incompat
         ]
+        if not file_req:
+            self.prefetch_dependencies(matches)
+        return matches
+
+    @staticmethod
+    def _prefetch_key(candidate: Candidate) -> Tuple[str, str]:
+        return candidate.identify(), str(candidate.version)
+
+    def _submit_prefetch(self, func: Callable, *args: Any) -> Future:
+        if self._prefetch_executor is None:
+            self._prefetch_executor = ThreadPoolExecutor(self.PREFETCH_WORKERS)
+        future = self._prefetch_executor.submit(func, *args)
+        self._prefetch_jobs.append(future)
+        return future
+
+    def prefetch_dependencies(self, candidates: Iterable[Candidate]) -> None:
+        """Fetch the dependencies of the top-ranked candidates in background threads,
+        so that they are already available when the resolver asks for them.
+
+        Only wheels are prefetched, speculative builds of sdists are too expensive.
+        """
+        if self.prefetch_candidates <= 0:
+            return
+        seen = set()
+        for candidate in candidates:
+            if len(seen) >= self.prefetch_candidates:
+                break
+            key = self._prefetch_key(candidate)
+            if key in seen:
+                continue
+            seen.add(key)
+            if key in self._prefetched or not getattr(
+                candidate.link, "is_wheel", False
+            ):
+                continue
+            self._prefetched[key] = self._submit_prefetch(
+                self.repository.get_dependencies, candidate
+            )
+
+    def prefetch_candidates_of(self, requirements: Iterable[Requirement]) -> None:
+        """Find the candidates of newly discovered requirements in the background."""
+        if self.prefetch_candidates <= 0:
+            return
+        new_reqs = [
+            req
+            for req in requirements
+            if req.is_named and req.identify() not in self._prefetched_requirements
+        ]
+        if not new_reqs:
+            return
+        self._prefetched_requirements.update(req.identify() for req in new_reqs)
+        self._submit_prefetch(self.repository.find_candidates_many, new_reqs)
+
+    @classmethod
+    def _default_build_workers(cls) -> int:
+        workers = os.cpu_count() or 1
+        try:
+            memory = os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+        except (AttributeError, ValueError, OSError):
+            return workers
+        return max(1, min(workers, memory // cls.BUILD_MEMORY))
+
+    def _build_candidate(self, requirement: Requirement) -> Candidate:
+        # XXX: Patch pip to make it work under multi-thread mode
+        pip_shims.pip_logging._log_state.indentation = 0
+        candidate = Candidate(requirement, self.repository.environment)
+        candidate.get_metadata()
+        return candidate
+
+    def schedule_builds(self, requirements: Iterable[Requirement]) -> None:
+        """Start building the metadata of file, URL and VCS requirements in
+        background threads, so that they are ready when the resolver needs them.
+        """
+        if self.build_workers <= 1:
+            return
+        for req in requirements:
+            if req.is_named:
+                continue
+            key = url_without_fragments(req.url)
+            if key in self._builds:
+                continue
+            if self._build_executor is None:
+                self._build_executor = ThreadPoolExecutor(self.build_workers)
+            self._builds[key] = self._build_executor.submit(self._build_candidate, req)
+
+    def _get_built_candidate(self, requirement: Requirement) -> Candidate:
+        future = self._builds.get(url_without_fragments(requirement.url))
+        if future is not None and not future.cancelled():
+            return future.result()
+        return self._build_candidate(requirement)
+
+    def shutdown(self) -> None:
+        """Cancel all pending prefetching jobs and builds and release the threads,
+        including those of the repository.
+        """
+        for future in self._prefetch_jobs:
+            future.cancel()
+        self._prefetch_jobs.clear()
+        self._prefetched.clear()
+        if self._prefetch_executor is not None:
+            self._prefetch_executor.shutdown(wait=False)
+            self._prefetch_executor = None
+        for future in self._builds.values():
+            future.cancel()
+        self._builds.clear()
+        if self._build_executor is not None:
+            # Running builds can't be interrupted, wait for them to clean up.
+            self._build_executor.shutdown(wait=True)
+            self._build_executor = None
+        self.repository.close()
+
+    def _fetch_dependencies(
+        self, candidate: Candidate
+    ) -> Tuple[List[Requirement], PySpecSet, str]:
+        future = self._prefetched.pop(self._prefetch_key(candidate), None)
+        if future is not None and not future.cancel():
+            return future.result()
+        return self.repository.get_dependencies(candidate)
 
     def is_satisfied_by(self, requirement: Requirement, candidate: Candidate) -> bool:
         if not requirement.is_named:
@@ -82,7 +233,7 @@ class BaseProvider(AbstractProvider):
         ) and requires_python.is_subset(candidate.requires_python)
 
     def get_dependencies(self, candidate: Candidate) -> List[Requirement]:
-        deps, requires_python, summary = self.repository.get_dependencies(candidate)
+        deps, requires_python, summary = self._fetch_dependencies(candidate)
 
         # Filter out incompatible dependencies(e.g. functools32) early so that
         # we don't get errors when building wheels.
@@ -95,6 +246,8 @@ class BaseProvider(AbstractProvider):
             dep.requires_python &= candidate.req.requires_python
             valid_deps.append(dep)
 
+        self.prefetch_candidates_of(valid_deps)
+        self.schedule_builds(valid_deps)
         candidate_key = self.identify(candidate)
         self.fetched_dependencies[candidate_key] = valid_deps
         self.summary_collection[candidate.req.key] = summary
@@ -104,6 +257,51 @@ class BaseProvider(AbstractProvider):
     def get_hashes(self, candidate: Candidate) -> Optional[Dict[str, str]]:
         return self.repository.get_hashes(candidate)
 
+    def get_hashes_many(
+        self, candidates: Iterable[Candidate]
+    ) -> List[Optional[Dict[str, str]]]:
+        """Get the hashes of the candidates concurrently, in the same order."""
+        candidates = list(candidates)
+        if len(candidates) <= 1:
+            return [self.get_hashes(candidate) for candidate in candidates]
+        with ThreadPoolExecutor(self.HASH_WORKERS) as executor:
+            return list(executor.map(self.get_hashes, candidates))
+
+
+class BuildEnvProvider(BaseProvider):
+    """A provider to resolve the build requirements for the isolated environment of
+    one interpreter.
+
+    The index may not tell the Requires-Python of a file, so the candidates whose
+    metadata turns out to exclude the interpreter are skipped lazily, before the
+    resolver tries to pin them.
+    """
+
+    def get_preference(
+        self,
+        identifier: str,
+        resolutions: Dict[str, Candidate],
+        candidates: Dict[str, Iterator[Candidate]],
+        information: Dict[str, Iterator[RequirementInformation]],
+    ) -> int:
+        # Counting the candidates would fetch the metadata of all of them.
+        return 0
+
+    def _is_python_compatible(self, candidate: Candidate) -> bool:
+        requires_python = self.repository.get_dependencies(candidate)[1]
+        return self.requires_python.is_subset(requires_python)
+
+    def find_matches(
+        self,
+        identifier: str,
+        requirements: Mapping[str, Iterator[Requirement]],
+        incompatibilities: Mapping[str, Iterator[Candidate]],
+    ) -> Callable[[], Iterator[Candidate]]:
+        matches = list(
+            super().find_matches(identifier, requirements, incompatibilities)
+        )
+        return lambda: (can for can in matches if self._is_python_compatible(can))
+
 
 class ReusePinProvider(BaseProvider):
     """A provider that reuses preferred pins if possible.
@@ -2,6 +2,8 @@
 Utility functions
 """
 import atexit
+import copy
+import errno
 import functools
 import os
 import re
@@ -9,6 +11,7 @@ import shutil
 import subprocess
 import sys
 import tempfile
+import threading
 import urllib.parse as parse
 from contextlib import contextmanager
 from os import PathLike
@@ -16,6 +19,7 @@ from pathlib import Path
 from re import Match
 from typing import (
     Any,
+    BinaryIO,
     Callable,
     Dict,
     Generic,
@@ -25,20 +29,28 @@ from typing import (
     TextIO,
     Tuple,
     TypeVar,
+    Union,
     cast,
     overload,
 )
 
 from distlib.wheel import Wheel
-from pip._vendor.packaging.tags import Tag
 from pip._vendor.pkg_resources import safe_name
 from pip._vendor.requests import Session
 
 from pdm._types import Source
 from pdm.models.pip_shims import (
+    CandidateEvaluator,
+    InstallationCandidate,
     InstallCommand,
     InstallRequirement,
+    InvalidWheelFilename,
+    Link,
+    LinkEvaluator,
     PackageFinder,
+    PipSession,
+    PipWheel,
+    TargetPython,
     get_package_finder,
     url_to_path,
 )
@@ -115,6 +127,8 @@ def get_finder(
     python_version: Optional[Tuple[int, ...]] = None,
     python_abi_tag: Optional[str] = None,
     ignore_requires_python: bool = False,
+    session: Optional[PipSession] = None,
+    ignore_compatibility: bool = False,
 ) -> PackageFinder:
     install_cmd = InstallCommand()
     pip_args = prepare_pip_source_args(sources)
@@ -127,9 +141,13 @@ def get_finder(
         python_version=python_version,
         python_abi_tag=python_abi_tag,
         ignore_requires_python=ignore_requires_python,
+        session=session,
     )
     if not hasattr(finder, "session"):
         finder.session = finder._link_collector.session
+    if ignore_compatibility:
+        # The finder is created by pip, so the class is switched afterwards.
+        finder.__class__ = CompatibleFinder
     return finder
 
 
@@ -162,39 +180,59 @@ def join_list_with(items: List[Any], sep: Any) -> List[Any]:
     return new_items[:-1]
 
 
-def _wheel_supported(self: Any, tags: List[Tag] = None) -> bool:
-    # Ignore current platform. Support everything.
-    return True
+def _with_wheel_tags(target_python: TargetPython, wheel: PipWheel) -> TargetPython:
+    """Return a copy of the target Python that supports the tags of the wheel."""
+    target_python = copy.copy(target_python)
+    target_python._valid_tags = list(wheel.file_tags)
+    return target_python
 
 
-def _wheel_support_index_min(self: Any, tags: Optional[str] = None) -> int:
-    # All wheels are equal priority for sorting.
-    return 0
+class _CompatibleLinkEvaluator(LinkEvaluator):
+    """Accept the wheels of all platforms and Python versions."""
 
+    def evaluate_link(self, link: Link) -> Any:
+        if link.is_wheel:
+            try:
+                wheel = PipWheel(link.filename)
+            except InvalidWheelFilename:
+                pass
+            else:
+                evaluator = copy.copy(self)
+                evaluator._target_python = _with_wheel_tags(self._target_python, wheel)
+                return super(_CompatibleLinkEvaluator, evaluator).evaluate_link(link)
+        return super().evaluate_link(link)
 
-@contextmanager
-def allow_all_wheels(enable: bool = True) -> Iterator:
-    """Monkey patch pip.Wheel to allow all wheels
+
+class _CompatibleCandidateEvaluator(CandidateEvaluator):
+    """Sort the wheels of all platforms and Python versions with equal priority."""
+
+    def _sort_key(self, candidate: InstallationCandidate) -> Any:
+        if candidate.link.is_wheel:
+            tags = list(PipWheel(candidate.link.filename).file_tags)
+            evaluator = copy.copy(self)
+            evaluator._supported_tags = tags
+            # Only present in newer versions of pip.
+            evaluator._wheel_tag_preferences = dict.fromkeys(tags, 0)
+            return super(_CompatibleCandidateEvaluator, evaluator)._sort_key(candidate)
+        return super()._sort_key(candidate)
+
+
+class CompatibleFinder(PackageFinder):
+    """A package finder that ignores the compatibility of wheels.
 
     The usual checks against platforms and Python versions are ignored to allow
-    fetching all available entries in PyPI. This also saves the candidate cache
-    and set a new one, or else the results from the previous non-patched calls
-    will interfere.
+    fetching all available entries in PyPI.
     """
-    from pdm.models.pip_shims import PipWheel
-
-    if not enable:
-        yield
-        return
 
-    original_wheel_supported = PipWheel.supported
-    original_support_index_min = PipWheel.support_index_min
+    def make_link_evaluator(self, project_name: str) -> LinkEvaluator:
+        evaluator = super().make_link_evaluator(project_name)
+        evaluator.__class__ = _CompatibleLinkEvaluator
+        return evaluator
 
-    PipWheel.supported = _wheel_supported
-    PipWheel.support_index_min = _wheel_support_index_min
-    yield
-    PipWheel.supported = original_wheel_supported
-    PipWheel.support_index_min = original_support_index_min
+    def make_candidate_evaluator(self, *args: Any, **kwargs: Any) -> CandidateEvaluator:
+        evaluator = super().make_candidate_evaluator(*args, **kwargs)
+        evaluator.__class__ = _CompatibleCandidateEvaluator
+        return evaluator
 
 
 def find_project_root(cwd: str = ".", max_depth: int = 5) -> Optional[str]:
@@ -301,6 +339,174 @@ def atomic_open_for_write(
         shutil.move(name, filename)
 
 
+def _lock_file(fp: BinaryIO, shared: bool, blocking: bool) -> None:
+    if sys.platform == "win32":
+        import ctypes
+        import msvcrt
+        from ctypes import wintypes
+
+        class Overlapped(ctypes.Structure):
+            _fields_ = [
+                ("Internal", ctypes.c_void_p),
+                ("InternalHigh", ctypes.c_void_p),
+                ("Offset", wintypes.DWORD),
+                ("OffsetHigh", wintypes.DWORD),
+                ("hEvent", wintypes.HANDLE),
+            ]
+
+        kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+        flags = 0 if shared else 0x2  # LOCKFILE_EXCLUSIVE_LOCK
+        if not blocking:
+            flags |= 0x1  # LOCKFILE_FAIL_IMMEDIATELY
+        handle = msvcrt.get_osfhandle(fp.fileno())
+        if not kernel32.LockFileEx(
+            wintypes.HANDLE(handle), flags, 0, 1, 0, ctypes.byref(Overlapped())
+        ):
+            error = ctypes.get_last_error()
+            if error == 33:  # ERROR_LOCK_VIOLATION
+                raise BlockingIOError(errno.EWOULDBLOCK, "File is locked", fp.name)
+            raise ctypes.WinError(error)
+    else:
+        import fcntl
+
+        flags = fcntl.LOCK_SH if shared else fcntl.LOCK_EX
+        if not blocking:
+            flags |= fcntl.LOCK_NB
+        fcntl.flock(fp.fileno(), flags)
+
+
+def _unlock_file(fp: BinaryIO) -> None:
+    if sys.platform == "win32":
+        import ctypes
+        import msvcrt
+        from ctypes import wintypes
+
+        handle = msvcrt.get_osfhandle(fp.fileno())
+        ctypes.windll.kernel32.UnlockFile(wintypes.HANDLE(handle), 0, 0, 1, 0)
+    else:
+        import fcntl
+
+        fcntl.flock(fp.fileno(), fcntl.LOCK_UN)
+
+
+class _ProcessFileLock:
+    """The lock on a file held by the threads of this process.
+
+    The file is locked once for all the holders in this process, and a thread
+    holding the lock can take it again, so that nested use doesn't wait for
+    itself. The lock can't be upgraded from shared to exclusive though.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._cond = threading.Condition()
+        self._fp: Optional[BinaryIO] = None
+        # The thread idents of the holders, mapped to the nesting depths.
+        self._readers: Dict[int, int] = {}
+        self._writer: Optional[int] = None
+        self._writer_depth = 0
+
+    def _wait_for(self, predicate: Callable[[], bool], blocking: bool) -> None:
+        if blocking:
+            self._cond.wait_for(predicate)
+        elif not predicate():
+            raise BlockingIOError(errno.EWOULDBLOCK, "File is locked", self.path)
+
+    def _lock(self, shared: bool, blocking: bool) -> None:
+        fp = open(self.path, "a+b")
+        try:
+            _lock_file(fp, shared, blocking)
+        except BaseException:
+            fp.close()
+            raise
+        self._fp = fp
+
+    def _unlock(self) -> None:
+        assert self._fp is not None
+        try:
+            _unlock_file(self._fp)
+        finally:
+            self._fp.close()
+            self._fp = None
+            self._cond.notify_all()
+
+    def acquire(self, shared: bool, blocking: bool) -> None:
+        me = threading.get_ident()
+        with self._cond:
+            if self._writer == me:
+                self._writer_depth += 1
+            elif me in self._readers:
+                if not shared:
+                    if not blocking:
+                        raise BlockingIOError(
+                            errno.EWOULDBLOCK, "File is locked", self.path
+                        )
+                    # Waiting for the shared lock held by this thread never ends.
+                    raise RuntimeError(
+                        f"Can't lock {self.path} exclusively while holding "
+                        "a shared lock on it"
+                    )
+                self._readers[me] += 1
+            elif shared:
+                self._wait_for(lambda: self._writer is None, blocking)
+                if not self._readers:
+                    self._lock(True, blocking)
+                self._readers[me] = 1
+            else:
+                self._wait_for(
+                    lambda: self._writer is None and not self._readers, blocking
+                )
+                self._lock(False, blocking)
+                self._writer = me
+                self._writer_depth = 1
+
+    def release(self) -> None:
+        me = threading.get_ident()
+        with self._cond:
+            if self._writer == me:
+                self._writer_depth -= 1
+                if not self._writer_depth:
+                    self._writer = None
+                    self._unlock()
+            else:
+                self._readers[me] -= 1
+                if not self._readers[me]:
+                    del self._readers[me]
+                    if not self._readers:
+                        self._unlock()
+
+
+_process_file_locks: Dict[str, _ProcessFileLock] = {}
+_process_file_locks_guard = threading.Lock()
+
+
+@contextmanager
+def file_lock(
+    path: Union[str, PathLike], shared: bool = False, blocking: bool = True
+) -> Iterator[None]:
+    """Hold an advisory lock on the given file, which is created if missing.
+
+    Shared locks can be held by several processes at the same time, while an
+    exclusive lock waits for all other holders. A thread may take a lock it
+    already holds again, unless to upgrade a shared lock to an exclusive one.
+
+    :param path: the path of the lock file.
+    :param shared: whether to take a shared lock instead of an exclusive one.
+    :param blocking: whether to wait for the lock, or raise
+        :exc:`BlockingIOError` at once if it is held by others.
+    """
+    key = os.path.normcase(os.path.abspath(path))
+    with _process_file_locks_guard:
+        lock = _process_file_locks.get(key)
+        if lock is None:
+            lock = _process_file_locks[key] = _ProcessFileLock(key)
+    lock.acquire(shared, blocking)
+    try:
+        yield
+    finally:
+        lock.release()
+
+
 @contextmanager
 def cd(path: str) -> Iterator:
     _old_cwd = os.getcwd()
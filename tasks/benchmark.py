@@ -0,0 +1,292 @@
+"""Measure the startup time and the imported modules of PDM subcommands.
+
+The commands are run with the PDM of this repository against a copy of a local
+fixture project, so no network access is needed. Pass ``--check`` to compare the
+results with the budgets in ``benchmark_thresholds.json`` and exit with an error on
+regressions. The budgets of module counts and import times are loose, as they
+depend on the machine. Compare with a baseline measured on the same machine to
+also catch smaller regressions of the timings, e.g.::
+
+    git checkout main && python tasks/benchmark.py -o baseline.json
+    git checkout - && python tasks/benchmark.py --check --baseline baseline.json
+"""
+import argparse
+import json
+import os
+import re
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+PROJECT_DIR = Path(__file__).parent.parent
+FIXTURE_PROJECT = PROJECT_DIR / "tests/fixtures/projects/demo-package"
+THRESHOLDS_FILE = Path(__file__).with_name("benchmark_thresholds.json")
+
+# The subcommands to measure, all of them work offline.
+COMMANDS: Dict[str, List[str]] = {
+    "--version": ["--version"],
+    "--help": ["--help"],
+    "config": ["config", "pypi.url"],
+    "info": ["info"],
+    "list": ["list"],
+    "run": ["run", "python", "-c", "pass"],
+}
+# The module groups to report in the import time breakdown.
+IMPORT_GROUPS = ("pdm.core", "pdm.project", "pdm.models", "pdm.cli.commands")
+
+_MODULES_SCRIPT = """\
+import json, os, sys
+output = sys.argv.pop(1)
+def dump():
+    with open(output, "w") as f:
+        json.dump(sorted(sys.modules), f)
+# `pdm run` replaces the process with the command.
+_execv = os.execv
+def execv(*args):
+    dump()
+    _execv(*args)
+os.execv = execv
+from pdm.core import main
+try:
+    main(sys.argv[1:])
+except SystemExit:
+    pass
+dump()
+"""
+_IMPORTTIME_RE = re.compile(r"import time:\s*(\d+) \|\s*(\d+) \|( *)(\S+)")
+
+
+def _subprocess_env() -> Dict[str, str]:
+    """Return the environment to import PDM from this repository."""
+    env = dict(os.environ)
+    paths = [str(PROJECT_DIR), env.get("PYTHONPATH", "")]
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, paths))
+    return env
+
+
+def time_command(args: List[str], cwd: Path, rounds: int) -> Dict[str, float]:
+    """Return the median and minimum seconds to run the pdm command."""
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, "-m", "pdm", *args],
+            cwd=cwd,
+            env=_subprocess_env(),
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        timings.append(time.perf_counter() - start)
+    return {"median": statistics.median(timings), "min": min(timings)}
+
+
+def imported_modules(args: List[str], cwd: Path) -> List[str]:
+    """Return the names of modules imported when running the pdm command."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        output = os.path.join(temp_dir, "modules.json")
+        proc = subprocess.run(
+            [sys.executable, "-c", _MODULES_SCRIPT, output, *args],
+            cwd=cwd,
+            env=_subprocess_env(),
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            universal_newlines=True,
+        )
+        if not os.path.exists(output):
+            raise RuntimeError(f"Failed to run pdm {' '.join(args)}:\n{proc.stderr}")
+        with open(output) as f:
+            return json.load(f)
+
+
+def parse_importtime(output: str) -> Dict[str, Dict[str, int]]:
+    """Parse the ``-X importtime`` output into {module: {"self", "cumulative",
+    "level"}}, with the times in microseconds and the nesting level of the import.
+    """
+    result = {}
+    for line in output.splitlines():
+        match = _IMPORTTIME_RE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            result[name] = {
+                "self": int(self_us),
+                "cumulative": int(cumulative_us),
+                "level": len(indent) // 2,
+            }
+    return result
+
+
+def summarize_imports(times: Dict[str, Dict[str, int]]) -> Dict[str, Any]:
+    """Summarize the parsed import times, in milliseconds, in total and for each
+    of :data:`IMPORT_GROUPS`.
+    """
+    groups = {}
+    for group in IMPORT_GROUPS:
+        members = {
+            name: value
+            for name, value in times.items()
+            if name == group or name.startswith(group + ".")
+        }
+        groups[group] = {
+            "modules": len(members),
+            "self_ms": sum(v["self"] for v in members.values()) / 1000,
+            "cumulative_ms": times.get(group, {}).get("cumulative", 0) / 1000,
+        }
+    slowest = sorted(times.items(), key=lambda item: item[1]["self"], reverse=True)
+    return {
+        "total_ms": sum(v["cumulative"] for v in times.values() if v["level"] == 0)
+        / 1000,
+        "groups": groups,
+        "slowest": [[name, value["self"] / 1000] for name, value in slowest[:5]],
+    }
+
+
+def import_breakdown(args: List[str], cwd: Path) -> Dict[str, Any]:
+    """Run the pdm command with ``-X importtime`` and summarize the import times."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "pdm", *args],
+        cwd=cwd,
+        env=_subprocess_env(),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+    )
+    return summarize_imports(parse_importtime(proc.stderr))
+
+
+def run_benchmark(rounds: int = 5) -> Dict[str, Any]:
+    result: Dict[str, Any] = {"commands": {}}
+    with tempfile.TemporaryDirectory() as temp_dir:
+        project = Path(temp_dir) / FIXTURE_PROJECT.name
+        shutil.copytree(FIXTURE_PROJECT, project)
+        for name, args in COMMANDS.items():
+            modules = imported_modules(args, project)
+            result["commands"][name] = {
+                "seconds": time_command(args, project, rounds),
+                "modules": len(modules),
+                "command_modules": [
+                    m for m in modules if m.startswith("pdm.cli.commands.")
+                ],
+                "imports": import_breakdown(args, project),
+            }
+    return result
+
+
+def check_thresholds(
+    result: Dict[str, Any],
+    thresholds: Dict[str, Any],
+    baseline: Optional[Dict[str, Any]] = None,
+) -> List[str]:
+    """Return the descriptions of the measurements exceeding the thresholds.
+
+    The command modules, the imported modules and the import time of each command
+    are limited by the budgets, while the timings and the module counts may exceed
+    those of the baseline, if given, by the relative margins.
+    """
+    errors = []
+    margins = thresholds.get("margins", {})
+
+    def check(name: str, key: str, measured: float, base: float) -> None:
+        limit = base * (1 + margins[key])
+        if measured > limit:
+            errors.append(f"{name}: {key} {measured:.3f} > {limit:.3f} ({base:.3f})")
+
+    for name, limits in thresholds.get("commands", {}).items():
+        measured = result["commands"].get(name)
+        if measured is None:
+            continue
+        if (
+            "command_modules" in limits
+            and len(measured["command_modules"]) > limits["command_modules"]
+        ):
+            errors.append(
+                f"{name}: imports command modules {measured['command_modules']}"
+            )
+        if "modules" in limits and measured["modules"] > limits["modules"]:
+            errors.append(
+                f"{name}: modules {measured['modules']} > {limits['modules']}"
+            )
+        import_ms = measured["imports"]["total_ms"]
+        if "import_ms" in limits and import_ms > limits["import_ms"]:
+            errors.append(
+                f"{name}: import_ms {import_ms:.3f} > {limits['import_ms']:.3f}"
+            )
+        base = (baseline or {}).get("commands", {}).get(name)
+        if base is None:
+            continue
+        check(
+            name,
+            "seconds",
+            measured["seconds"]["median"],
+            base["seconds"]["median"],
+        )
+        check(name, "modules", measured["modules"], base["modules"])
+        check(
+            name,
+            "import_ms",
+            measured["imports"]["total_ms"],
+            base["imports"]["total_ms"],
+        )
+    return errors
+
+
+def print_report(result: Dict[str, Any]) -> None:
+    print(f"{'Command':<12} {'Median':>9} {'Min':>9} {'Modules':>8}")
+    for name, measured in result["commands"].items():
+        seconds = measured["seconds"]
+        print(
+            f"{name:<12} {seconds['median']:>8.3f}s {seconds['min']:>8.3f}s "
+            f"{measured['modules']:>8}"
+        )
+    for name, measured in result["commands"].items():
+        imports = measured["imports"]
+        print(f"\nImports of pdm {name}: {imports['total_ms']:.1f}ms")
+        for group, value in imports["groups"].items():
+            print(
+                f"  {group:<18} {value['modules']:>4} modules, "
+                f"self {value['self_ms']:.1f}ms, "
+                f"cumulative {value['cumulative_ms']:.1f}ms"
+            )
+        print("  Slowest modules:")
+        for module, self_ms in imports["slowest"]:
+            print(f"    {module:<48} {self_ms:.1f}ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "-r", "--rounds", type=int, default=5, help="Times to run each command"
+    )
+    parser.add_argument("-o", "--output", help="Save the result to a JSON file")
+    parser.add_argument(
+        "--check", action="store_true", help="Fail if thresholds are exceeded"
+    )
+    parser.add_argument(
+        "--baseline", help="Compare with the result saved by a previous run"
+    )
+    options = parser.parse_args()
+
+    result = run_benchmark(options.rounds)
+    print_report(result)
+    if options.output:
+        with open(options.output, "w") as f:
+            json.dump(result, f, indent=2)
+    if options.check:
+        thresholds = json.loads(THRESHOLDS_FILE.read_text())
+        baseline = None
+        if options.baseline:
+            with open(options.baseline) as f:
+                baseline = json.load(f)
+        errors = check_thresholds(result, thresholds, baseline)
+        if errors:
+            print("\nStartup regressions found:", *errors, sep="\n  ", file=sys.stderr)
+            sys.exit(1)
+        print("\nAll measurements are within the thresholds.")
+
+
+if __name__ == "__main__":
+    main()
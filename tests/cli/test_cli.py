@@ -359,3 +359,42 @@ def test_lock_legacy_project(invoke, fixture_project, repository):
     result = invoke(["lock"], obj=project)
     assert result.exit_code == 0
     assert "urllib3" in project.locked_repository.all_candidates
+
+
+def test_command_registry_matches_modules():
+    import importlib
+
+    from pdm.cli.commands import COMMANDS
+
+    for name, (module_name, help_text) in COMMANDS.items():
+        command = importlib.import_module(f"pdm.cli.commands.{module_name}").Command
+        assert (command.name or module_name) == name
+        assert (command.description or command.__doc__) == help_text
+
+
+def test_command_parsers_are_created_lazily(core, mocker):
+    from pdm import core as core_module
+    from pdm.cli.commands import COMMANDS
+
+    loaded = []
+    command_loader = core_module._command_loader
+
+    def make_loader(module_name):
+        load = command_loader(module_name)
+
+        def loader():
+            loaded.append(module_name)
+            return load()
+
+        return loader
+
+    mocker.patch.object(core_module, "_command_loader", make_loader)
+    core.init_parser()
+    options = core.parser.parse_args(["config", "pypi.url"])
+    assert options.key == "pypi.url"
+    assert loaded == ["config"]
+    # The parsers can still be inspected, and they are created on access.
+    parsers = core.subparsers.choices
+    assert list(parsers) == list(COMMANDS)
+    assert parsers["search"].prog.endswith("search")
+    assert loaded == ["config", "search"]
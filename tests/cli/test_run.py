@@ -7,7 +7,7 @@ from tempfile import TemporaryDirectory
 
 import pytest
 
-from pdm.cli.actions import PEP582_PATH
+from pdm.cli.utils import PEP582_PATH
 from pdm.utils import cd, temp_environ
 
 
@@ -1,7 +1,11 @@
+from concurrent.futures import ProcessPoolExecutor
+
 import pytest
 
+from pdm import termui
 from pdm.cli import actions
-from pdm.exceptions import PdmException
+from pdm.exceptions import PdmException, PdmUsageError
+from pdm.installers import Synchronizer, synchronizers
 from pdm.models.requirements import parse_requirement
 from tests.conftest import Distribution
 
@@ -117,3 +121,91 @@ def test_sync_without_self(project, working_set):
     actions.do_lock(project)
     actions.do_sync(project, no_self=True)
     assert project.meta.name not in working_set
+
+
+@pytest.mark.usefixtures("repository")
+def test_sync_installs_dependencies_first(project, working_set):
+    project.project_config["install.max_workers"] = 4
+    project.add_dependencies({"requests": parse_requirement("requests")})
+    actions.do_lock(project)
+    actions.do_sync(project, no_self=True)
+    installed = list(working_set)
+    for dep in ("certifi", "chardet", "idna", "urllib3"):
+        assert installed.index(dep) < installed.index("requests")
+
+
+@pytest.mark.usefixtures("repository")
+def test_synchronizer_job_graph(project, working_set):
+    project.add_dependencies({"requests": parse_requirement("requests")})
+    actions.do_lock(project)
+    candidates = actions.resolve_candidates_from_lockfile(
+        project, project.get_dependencies().values()
+    )
+    foo, bar = Distribution("foo", "0.1.0"), Distribution("bar", "0.1.0")
+    foo.dependencies = [parse_requirement("bar")]
+    working_set.add_distribution(foo)
+    working_set.add_distribution(bar)
+    synchronizer = Synchronizer(candidates, project.environment)
+    graph = synchronizer.build_job_graph(
+        {
+            "add": ["certifi", "chardet", "idna", "requests", "urllib3"],
+            "update": [],
+            "remove": ["bar", "foo"],
+        }
+    )
+    assert graph[("add", "requests")] == {
+        ("add", "certifi"),
+        ("add", "chardet"),
+        ("add", "idna"),
+        ("add", "urllib3"),
+    }
+    assert not graph[("add", "idna")]
+    assert graph[("remove", "bar")] == {("remove", "foo")}
+    assert not graph[("remove", "foo")]
+
+
+def test_synchronizer_unpacks_wheels_in_processes(project, working_set):
+    project.project_config["install.executor"] = "process"
+    synchronizer = Synchronizer({}, project.environment)
+    executors = []
+    synchronizer.install_candidate = lambda key: executors.append(
+        synchronizer._wheel_executor
+    )
+    graph = {("add", "foo"): set(), ("add", "bar"): {("add", "foo")}}
+    assert not synchronizer.run_jobs(graph)
+    assert len(executors) == 2
+    assert isinstance(executors[0], ProcessPoolExecutor)
+    assert executors[0]._mp_context.get_start_method() == "spawn"
+    assert synchronizer._wheel_executor is None
+
+
+def test_synchronizer_removes_packaging_tools_first(project, working_set):
+    working_set.add_distribution(Distribution("pip", "21.0"))
+    working_set.add_distribution(Distribution("foo", "0.1.0"))
+    synchronizer = Synchronizer({}, project.environment)
+    graph = synchronizer.build_job_graph(
+        {"add": [], "update": [], "remove": ["foo", "pip"]}
+    )
+    assert not graph[("remove", "pip")]
+    assert graph[("remove", "foo")] == {("remove", "pip")}
+
+
+def test_synchronizer_rejects_unknown_executor(project, working_set):
+    project.project_config["install.executor"] = "fiber"
+    with pytest.raises(PdmUsageError):
+        Synchronizer({}, project.environment)
+
+
+@pytest.mark.usefixtures("repository")
+def test_sync_prepares_candidates_ahead(project, working_set, capsys):
+    project.core.ui.verbosity = termui.DETAIL
+    project.add_dependencies({"requests": parse_requirement("requests")})
+    actions.do_lock(project)
+    actions.do_sync(project, no_self=True)
+    installer = synchronizers.Installer.return_value
+    calls = [(call[0], call[1][0].name) for call in installer.mock_calls]
+    for name in ("certifi", "chardet", "idna", "requests", "urllib3"):
+        assert calls.index(("prepare", name)) < calls.index(("install", name))
+    out, _ = capsys.readouterr()
+    assert "Stage timings: " in out
+    assert "download" in out and "install" in out
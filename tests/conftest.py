@@ -201,9 +201,14 @@ def working_set(mocker, repository):
     def uninstall(dist):
         del rv[dist.key]
 
+    def stash(dist):
+        uninstall(dist)
+        return mocker.MagicMock()
+
     installer = mocker.MagicMock()
     installer.install.side_effect = install
     installer.uninstall.side_effect = uninstall
+    installer.stash.side_effect = stash
     mocker.patch("pdm.installers.synchronizers.Installer", return_value=installer)
     mocker.patch("pdm.installers.Installer", return_value=installer)
 
@@ -0,0 +1,157 @@
+import gc
+import hashlib
+import json
+import time
+from email.utils import formatdate
+from io import BytesIO
+
+import pytest
+from pip._vendor.cachecontrol.cache import DictCache
+from pip._vendor.requests import Request
+from pip._vendor.urllib3 import HTTPResponse
+
+from pdm.models import pip_shims
+from pdm.models.caches import (
+    CandidateInfoCache,
+    FailureCache,
+    HashCache,
+    IndexCacheController,
+)
+from pdm.models.candidates import Candidate
+from pdm.models.requirements import parse_requirement
+
+
+def make_candidate(project, line):
+    return Candidate(parse_requirement(line), project.environment)
+
+
+def test_candidate_info_cache_get_set(project, tmp_path):
+    cache = CandidateInfoCache(tmp_path / "package_meta.db")
+    foo = make_candidate(project, "foo==1.0")
+    foo_extras = make_candidate(project, "foo[bar]==1.0")
+    cache.set(foo, (["idna"], ">=3.6", "Foo"))
+    cache.set(foo_extras, (["idna", "chardet"], ">=3.6", "Foo"))
+
+    reopened = CandidateInfoCache(tmp_path / "package_meta.db")
+    assert reopened.get(foo) == (["idna"], ">=3.6", "Foo")
+    assert reopened.get(foo_extras) == (["idna", "chardet"], ">=3.6", "Foo")
+
+    reopened.delete(foo)
+    assert reopened.get(foo_extras)
+    with pytest.raises(KeyError):
+        reopened.get(foo)
+
+
+def test_candidate_info_cache_migrate_json(project, tmp_path):
+    legacy_file = tmp_path / "package_meta.json"
+    legacy_file.write_text(json.dumps({"foo-1.0": [["idna"], "", "Foo"]}))
+
+    cache = CandidateInfoCache(tmp_path / "package_meta.db")
+    assert cache.get(make_candidate(project, "foo==1.0")) == (["idna"], "", "Foo")
+    assert not legacy_file.exists()
+
+
+def test_candidate_info_cache_recover_from_corrupted_file(project, tmp_path):
+    cache_file = tmp_path / "package_meta.db"
+    cache_file.write_text("this is not a database")
+
+    cache = CandidateInfoCache(cache_file)
+    foo = make_candidate(project, "foo==1.0")
+    cache.set(foo, (["idna"], "", "Foo"))
+    assert cache.get(foo) == (["idna"], "", "Foo")
+
+
+def test_candidate_info_cache_write_behind(project, tmp_path):
+    cache = CandidateInfoCache(tmp_path / "package_meta.db", flush_interval=600)
+    foo = make_candidate(project, "foo==1.0")
+    cache.set(foo, (["idna"], "", "Foo"))
+    assert cache.get(foo) == (["idna"], "", "Foo")
+    with pytest.raises(KeyError):
+        CandidateInfoCache(tmp_path / "package_meta.db").get(foo)
+
+    cache.flush()
+    assert CandidateInfoCache(tmp_path / "package_meta.db").get(foo) == (
+        ["idna"],
+        "",
+        "Foo",
+    )
+
+
+def test_candidate_info_cache_flush_on_close(project, tmp_path):
+    cache_file = tmp_path / "package_meta.db"
+    foo = make_candidate(project, "foo==1.0")
+    bar = make_candidate(project, "bar==1.0")
+    cache = CandidateInfoCache(cache_file, flush_interval=600)
+    cache.set(foo, (["idna"], "", "Foo"))
+    cache.close()
+    assert CandidateInfoCache(cache_file).get(foo) == (["idna"], "", "Foo")
+
+    cache = CandidateInfoCache(cache_file, flush_interval=600)
+    cache.set(bar, ([], "", "Bar"))
+    del cache
+    gc.collect()
+    assert CandidateInfoCache(cache_file).get(bar) == ([], "", "Bar")
+
+
+def test_failure_cache_expires(tmp_path, mocker):
+    cache = FailureCache(directory=str(tmp_path), ttl=60)
+    assert cache.get_failure("build:foo") is None
+    cache.set_failure("build:foo", "broken")
+    assert cache.get_failure("build:foo") == "broken"
+
+    mocker.patch("time.time", return_value=time.time() + 61)
+    assert cache.get_failure("build:foo") is None
+
+
+def test_failure_cache_disabled(tmp_path):
+    cache = FailureCache(directory=str(tmp_path), ttl=0)
+    cache.set_failure("build:foo", "broken")
+    assert cache.get_failure("build:foo") is None
+
+
+@pytest.mark.parametrize("content", [b"", b"demo" * 100000])
+def test_hash_cache_hash_local_file(tmp_path, content):
+    artifact = tmp_path / "demo-0.0.1.tar.gz"
+    artifact.write_bytes(content)
+    cache = HashCache(directory=str(tmp_path / "hashes"))
+    link = pip_shims.Link(pip_shims.path_to_url(str(artifact)))
+    assert cache.get_hash(link) == f"sha256:{hashlib.sha256(content).hexdigest()}"
+
+
+def cache_index_page(controller, url):
+    request = Request("GET", url, headers={"Cache-Control": "max-age=0"}).prepare()
+    response = HTTPResponse(
+        body=BytesIO(b"<html>foo</html>"),
+        headers={
+            "Content-Type": "text/html",
+            "ETag": '"v1"',
+            "Date": formatdate(usegmt=True),
+        },
+        status=200,
+        preload_content=False,
+    )
+    controller.cache_response(request, response, b"<html>foo</html>")
+    return request
+
+
+def test_index_cache_revalidate():
+    controller = IndexCacheController(DictCache(), cache_etags=True)
+    request = cache_index_page(controller, "https://my.pypi/simple/foo/")
+
+    assert not controller.cached_request(request)
+    assert controller.conditional_headers(request) == {"If-None-Match": '"v1"'}
+
+
+def test_index_cache_max_age():
+    controller = IndexCacheController(DictCache(), cache_etags=True, max_age=600)
+    request = cache_index_page(controller, "https://my.pypi/simple/foo/")
+
+    assert controller.cached_request(request).read() == b"<html>foo</html>"
+    assert request.headers["Cache-Control"] == "max-age=0"
+
+
+def test_index_cache_max_age_configured(project):
+    project.project_config["cache.index_max_age"] = 600
+    adapter = project.environment.session.get_adapter("https://my.pypi/simple/")
+    assert isinstance(adapter.controller, IndexCacheController)
+    assert adapter.controller.max_age == 600
@@ -1,6 +1,13 @@
+import http.server
+import os
+import re
+import threading
+import zipfile
+
 import pytest
 
-from pdm.exceptions import ExtrasError
+from pdm.exceptions import BuildBackendError, BuildError, ExtrasError
+from pdm.models import pip_shims
 from pdm.models.candidates import Candidate
 from pdm.models.requirements import parse_requirement
 from tests import FIXTURES
@@ -154,12 +161,122 @@ def test_parse_project_file_on_build_error_no_dep(project):
     assert candidate.version == "0.0.1"
 
 
+def test_remember_failed_build(project, mocker):
+    mocker.patch.object(Candidate, "_get_failure_key", return_value="build:demo")
+    build_metadata = mocker.patch.object(
+        project.environment,
+        "build_metadata",
+        side_effect=BuildBackendError("broken"),
+    )
+    req = parse_requirement(f"{(FIXTURES / 'projects/demo-failure').as_posix()}")
+    for _ in range(2):
+        candidate = Candidate(req, project.environment)
+        assert candidate.get_dependencies_from_metadata() == [
+            "chardet; os_name=='nt'",
+            "idna",
+        ]
+    build_metadata.assert_called_once()
+    assert project.make_failure_cache().get_failure("build:demo") == "broken"
+
+    # The build is always attempted when the error is to be raised.
+    with pytest.raises(BuildError):
+        Candidate(req, project.environment).get_metadata(raising=True)
+    assert build_metadata.call_count == 2
+
+
+def test_failed_build_env_is_not_remembered(project, mocker):
+    mocker.patch.object(Candidate, "_get_failure_key", return_value="build:demo")
+    build_metadata = mocker.patch.object(
+        project.environment,
+        "build_metadata",
+        side_effect=BuildError("Can't resolve the build requirements"),
+    )
+    req = parse_requirement(f"{(FIXTURES / 'projects/demo-failure').as_posix()}")
+    for _ in range(2):
+        Candidate(req, project.environment).get_dependencies_from_metadata()
+    assert build_metadata.call_count == 2
+    assert project.make_failure_cache().get_failure("build:demo") is None
+
+
+def test_failure_key_of_remote_archives_only(project):
+    remote = Candidate(
+        parse_requirement("demo==0.0.1"),
+        project.environment,
+        name="demo",
+        version="0.0.1",
+        link=pip_shims.Link("https://example.org/demo-0.0.1.tar.gz#sha256=abc"),
+    )
+    assert remote._get_failure_key().startswith(
+        "build:https://example.org/demo-0.0.1.tar.gz:abc:"
+    )
+    local = Candidate(
+        parse_requirement(f"{(FIXTURES / 'projects/demo').as_posix()}"),
+        project.environment,
+    )
+    assert local._get_failure_key() is None
+
+
+@pytest.mark.parametrize(
+    "name,dependencies",
+    [
+        ("demo", ["chardet; os_name=='nt'", "idna"]),
+        ("poetry-demo", ["requests<3.0,>=2.6"]),
+    ],
+)
+def test_parse_static_metadata_without_building(project, mocker, name, dependencies):
+    project.project_config["strategy.static_metadata"] = True
+    build_source = mocker.patch.object(project.environment, "build_source")
+    req = parse_requirement(f"{(FIXTURES / 'projects' / name).as_posix()}")
+    candidate = Candidate(req, project.environment)
+    assert candidate.get_dependencies_from_metadata() == dependencies
+    assert candidate.name == name
+    build_source.assert_not_called()
+
+
+def test_prepare_metadata_when_it_is_dynamic(project, mocker, tmp_path):
+    project.project_config["strategy.static_metadata"] = True
+    project_dir = tmp_path / "demo"
+    project_dir.mkdir()
+    project_dir.joinpath("setup.py").write_text(
+        "from setuptools import setup\n"
+        "setup(name='demo', version='0.0.1', install_requires=get_requires())\n"
+    )
+    build_metadata = mocker.patch.object(
+        project.environment, "build_metadata", side_effect=BuildError
+    )
+    req = parse_requirement(project_dir.as_posix())
+    candidate = Candidate(req, project.environment)
+    candidate.get_metadata()
+    build_metadata.assert_called_once()
+
+
+def test_prepare_metadata_without_building_wheel(project, mocker):
+    build_source = mocker.spy(project.environment, "build_source")
+    req = parse_requirement(f"{(FIXTURES / 'projects/demo').as_posix()}")
+    candidate = Candidate(req, project.environment)
+    assert candidate.get_dependencies_from_metadata() == [
+        "idna",
+        'chardet; os_name == "nt"',
+    ]
+    assert candidate.version == "0.0.1"
+    assert candidate.wheel is None
+    build_source.assert_not_called()
+
+    # The wheel is built for installation
+    candidate.get_metadata(allow_all_wheels=False)
+    assert candidate.wheel is not None
+    build_source.assert_called_once()
+
+
 def test_parse_poetry_project_metadata(project, is_editable):
     req = parse_requirement(
         f"{(FIXTURES / 'projects/poetry-demo').as_posix()}", is_editable
     )
     candidate = Candidate(req, project.environment)
-    assert candidate.get_dependencies_from_metadata() == ["requests<3.0,>=2.6"]
+    assert [
+        parse_requirement(line).as_line()
+        for line in candidate.get_dependencies_from_metadata()
+    ] == ["requests<3.0,>=2.6"]
     assert candidate.name == "poetry-demo"
     assert candidate.version == "0.1.0"
 
@@ -177,3 +294,100 @@ def test_parse_flit_project_metadata(project, is_editable):
         assert dep in deps
     assert candidate.name == "pyflit"
     assert candidate.version == "0.1.0"
+
+
+WHEEL_METADATA = """\
+Metadata-Version: 2.1
+Name: demo
+Version: 0.0.1
+Requires-Dist: idna
+Requires-Dist: chardet; os_name == "nt"
+"""
+
+
+class WheelRequestHandler(http.server.BaseHTTPRequestHandler):
+    root = None
+    support_range = True
+    requests = []
+
+    def do_HEAD(self):
+        self.send_file(head=True)
+
+    def do_GET(self):
+        self.send_file()
+
+    def send_file(self, head=False):
+        content = (self.root / self.path.lstrip("/")).read_bytes()
+        match = re.match(r"bytes=(\d+)-(\d+)", self.headers.get("Range", ""))
+        if self.support_range and match:
+            start, end = int(match.group(1)), int(match.group(2))
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{end}/{len(content)}")
+            content = content[start : end + 1]
+        else:
+            self.send_response(200)
+        if self.support_range:
+            self.send_header("Accept-Ranges", "bytes")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        if not head:
+            self.requests.append(len(content))
+            self.wfile.write(content)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture()
+def wheel_server(request, tmp_path):
+    """Serve a wheel with a large payload, yield the URL of the wheel and
+    the request handler recording the sizes of the responses.
+    """
+    wheel_name = "demo-0.0.1-py2.py3-none-any.whl"
+    with zipfile.ZipFile(tmp_path / wheel_name, "w") as zf:
+        zf.writestr("demo/data.bin", os.urandom(4 * 1024 * 1024))
+        zf.writestr("demo-0.0.1.dist-info/METADATA", WHEEL_METADATA)
+        zf.writestr("demo-0.0.1.dist-info/WHEEL", "Wheel-Version: 1.0\n")
+        zf.writestr("demo-0.0.1.dist-info/RECORD", "")
+    handler = type(
+        "Handler",
+        (WheelRequestHandler,),
+        {"root": tmp_path, "support_range": request.param, "requests": []},
+    )
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}/{wheel_name}", handler
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.parametrize("wheel_server", [True, False], indirect=True)
+def test_parse_remote_wheel_metadata_lazily(project, wheel_server):
+    url, handler = wheel_server
+    candidate = Candidate(parse_requirement(f"demo @ {url}"), project.environment)
+    assert candidate.get_dependencies_from_metadata() == [
+        "idna",
+        'chardet; os_name == "nt"',
+    ]
+    assert candidate.version == "0.0.1"
+    if handler.support_range:
+        assert candidate.wheel is None
+        assert sum(handler.requests) < 1024 * 1024
+        # The wheel file is required for installation
+        candidate.get_metadata(allow_all_wheels=False)
+        assert candidate.wheel is not None
+    else:
+        # Fall back to downloading the whole wheel
+        assert candidate.wheel is not None
+        assert sum(handler.requests) > 4 * 1024 * 1024
+
+
+@pytest.mark.parametrize("wheel_server", [True], indirect=True)
+def test_lazy_wheel_metadata_reuses_known_link(project, wheel_server, mocker):
+    url, _ = wheel_server
+    candidate = Candidate(parse_requirement(f"demo @ {url}"), project.environment)
+    populate_link = mocker.patch("pdm.models.environment.populate_link")
+    assert candidate.get_metadata() is not None
+    populate_link.assert_not_called()
+    assert candidate.wheel is None
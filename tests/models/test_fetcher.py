@@ -0,0 +1,99 @@
+import hashlib
+import http.server
+import threading
+import time
+
+import pytest
+from pip._vendor import requests
+
+from pdm.models import pip_shims
+from pdm.models.caches import HashCache
+from pdm.models.fetcher import AsyncFetcher
+
+
+class IndexRequestHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.active += 1
+            server.max_active = max(server.max_active, server.active)
+            server.hits[self.path] = server.hits.get(self.path, 0) + 1
+            hits = server.hits[self.path]
+        time.sleep(0.05)
+        with server.lock:
+            server.active -= 1
+        if self.path.startswith("/missing"):
+            self.send_response(404)
+            content = b""
+        elif self.path.startswith("/flaky") and hits == 1:
+            self.send_response(503)
+            content = b""
+        else:
+            self.send_response(200)
+            content = self.path.encode() * 100
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture()
+def index_server():
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), IndexRequestHandler)
+    server.lock = threading.Lock()
+    server.active = server.max_active = 0
+    server.hits = {}
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def server_url(server, path):
+    return f"http://127.0.0.1:{server.server_address[1]}{path}"
+
+
+def test_fetch_all_with_bounded_concurrency(index_server):
+    urls = [server_url(index_server, f"/file{i}") for i in range(8)]
+    fetcher = AsyncFetcher(requests.Session(), max_per_host=3)
+    results = fetcher.fetch_all(urls, lambda resp: resp.content)
+    assert results == [f"/file{i}".encode() * 100 for i in range(8)]
+    assert 1 < index_server.max_active <= 3
+
+
+def test_fetch_all_retries_temporary_failures(index_server):
+    fetcher = AsyncFetcher(requests.Session(), backoff=0)
+    url = server_url(index_server, "/flaky")
+    assert fetcher.fetch_all([url], lambda resp: resp.status_code) == [200]
+    assert index_server.hits["/flaky"] == 2
+
+
+def test_fetch_all_raises_errors(index_server):
+    fetcher = AsyncFetcher(requests.Session(), backoff=0)
+    urls = [server_url(index_server, "/file"), server_url(index_server, "/missing")]
+    with pytest.raises(requests.HTTPError):
+        fetcher.fetch_all(urls, lambda resp: resp.content)
+    assert index_server.hits["/missing"] == 1
+
+
+def test_hash_cache_get_hashes_concurrently(index_server, tmp_path):
+    cache = HashCache(directory=str(tmp_path))
+    cache.session = requests.Session()
+    links = [
+        pip_shims.Link(server_url(index_server, f"/demo-0.0.{i}.tar.gz"))
+        for i in range(4)
+    ]
+    hashes = cache.get_hashes(links)
+    assert list(hashes) == [f"demo-0.0.{i}.tar.gz" for i in range(4)]
+    expected = hashlib.sha256(b"/demo-0.0.0.tar.gz" * 100).hexdigest()
+    assert hashes["demo-0.0.0.tar.gz"] == f"sha256:{expected}"
+    assert index_server.max_active > 1
+
+    # The hashes are served from the cache afterwards.
+    assert cache.get_hashes(links) == hashes
+    assert all(hits == 1 for hits in index_server.hits.values())
@@ -0,0 +1,73 @@
+import contextlib
+import threading
+import time
+
+from pdm.models import pip_shims
+from pdm.models.repositories import PyPIRepository
+from pdm.models.requirements import parse_requirement
+
+
+class FakeFinder:
+    def __init__(self):
+        self.fetched = []
+        self._lock = threading.Lock()
+
+    def find_all_candidates(self, project_name):
+        with self._lock:
+            self.fetched.append(project_name)
+        time.sleep(0.1)
+        return [
+            pip_shims.InstallationCandidate(
+                project_name,
+                "1.0",
+                pip_shims.Link(f"https://my.pypi/{project_name}-1.0.tar.gz"),
+            )
+        ]
+
+
+def test_find_candidates_many(project, mocker):
+    finder = FakeFinder()
+
+    @contextlib.contextmanager
+    def get_finder(*args, **kwargs):
+        yield finder
+
+    mocker.patch.object(project.environment, "get_finder", get_finder)
+    repository = PyPIRepository(project.sources, project.environment)
+    requirements = [
+        parse_requirement("foo"),
+        parse_requirement("foo[bar]"),
+        parse_requirement("bar>=1.0"),
+        parse_requirement("baz; os_name=='nt'"),
+    ]
+    result = repository.find_candidates_many(requirements)
+
+    assert sorted(finder.fetched) == ["bar", "baz", "foo"]
+    assert sorted(result) == ["bar", "baz", "foo", "foo[bar]"]
+    assert result["foo[bar]"][0].req.extras == ("bar",)
+
+    found = repository.find_candidates(parse_requirement("foo"))
+    assert [str(can.version) for can in found] == ["1.0"]
+    assert len(finder.fetched) == 3
+
+
+def test_close_repository_shuts_down_fetch_executor(project, mocker):
+    finder = FakeFinder()
+
+    @contextlib.contextmanager
+    def get_finder(*args, **kwargs):
+        yield finder
+
+    mocker.patch.object(project.environment, "get_finder", get_finder)
+    repository = PyPIRepository(project.sources, project.environment)
+    repository.find_candidates_many([parse_requirement("foo")])
+    executor = repository._fetch_executor
+    assert executor is not None
+
+    repository.close()
+    assert repository._fetch_executor is None
+    assert not any(thread.is_alive() for thread in executor._threads)
+    # The executor is created again if the repository is used after closing.
+    repository.find_candidates_many([parse_requirement("bar")])
+    assert repository._fetch_executor is not None
+    repository.close()
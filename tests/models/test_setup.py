@@ -0,0 +1,93 @@
+import pytest
+
+from pdm.models.setup import Setup
+
+PKG_INFO = """\
+Metadata-Version: {version}
+Name: demo
+Version: 0.0.1
+Summary: test demo
+Requires-Python: >=3.6
+Requires-Dist: idna
+Requires-Dist: pytest; extra == "tests"
+Provides-Extra: tests
+"""
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        # literal arguments
+        "setup(name='demo', version='0.0.1', install_requires=['idna'],\n"
+        "      extras_require={'tests': ['pytest']}, python_requires='>=3.6')\n",
+        # variables assigned once
+        "requires = ['idna']\n"
+        "extras = {'tests': ['pytest']}\n"
+        "setup(name='demo', version='0.0.1', install_requires=requires,\n"
+        "      extras_require=extras, python_requires='>=3.6')\n",
+    ],
+)
+def test_read_static_setup_py(tmp_path, content):
+    (tmp_path / "setup.py").write_text("from setuptools import setup\n" + content)
+    setup = Setup.from_directory_static(tmp_path)
+    assert setup.name == "demo"
+    assert setup.version == "0.0.1"
+    assert setup.install_requires == ["idna"]
+    assert setup.extras_require == {"tests": ["pytest"]}
+    assert setup.python_requires == ">=3.6"
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        "setup(name='demo', install_requires=get_requires())\n",
+        "requires = ['idna']\n"
+        "if sys.platform == 'win32':\n"
+        "    requires.append('colorama')\n"
+        "setup(name='demo', install_requires=requires)\n",
+        "kwargs = {'install_requires': ['idna']}\n" "setup(name='demo', **kwargs)\n",
+    ],
+)
+def test_read_dynamic_setup_py(tmp_path, content):
+    (tmp_path / "setup.py").write_text("from setuptools import setup\n" + content)
+    assert Setup.from_directory_static(tmp_path) is None
+
+
+def test_read_static_setup_cfg(tmp_path):
+    (tmp_path / "setup.cfg").write_text(
+        "[metadata]\nname = demo\nversion = attr: demo.__version__\n"
+        "[options]\ninstall_requires =\n    idna\n"
+    )
+    (tmp_path / "setup.py").write_text("from setuptools import setup\nsetup()\n")
+    setup = Setup.from_directory_static(tmp_path)
+    assert setup.name == "demo"
+    assert setup.version is None
+    assert setup.install_requires == ["idna"]
+
+
+def test_read_dynamic_setup_cfg(tmp_path):
+    (tmp_path / "setup.cfg").write_text(
+        "[metadata]\nname = demo\n[options]\ninstall_requires = file: reqs.txt\n"
+    )
+    assert Setup.from_directory_static(tmp_path) is None
+
+
+@pytest.mark.parametrize("version,is_static", [("2.2", True), ("2.1", False)])
+def test_read_static_pkg_info(tmp_path, version, is_static):
+    (tmp_path / "PKG-INFO").write_text(PKG_INFO.format(version=version))
+    setup = Setup.from_directory_static(tmp_path)
+    if not is_static:
+        assert setup is None
+        return
+    assert setup.name == "demo"
+    assert setup.summary == "test demo"
+    assert setup.install_requires == ["idna"]
+    assert setup.extras_require == {"tests": ["pytest"]}
+    assert setup.python_requires == ">=3.6"
+
+
+def test_read_dynamic_pyproject(tmp_path):
+    (tmp_path / "pyproject.toml").write_text(
+        '[project]\nname = "demo"\nversion = "0.0.1"\ndynamic = ["dependencies"]\n'
+    )
+    assert Setup.from_directory_static(tmp_path) is None
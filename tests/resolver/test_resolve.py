@@ -1,3 +1,5 @@
+import threading
+
 import pytest
 from resolvelib.resolvers import ResolutionImpossible, Resolver
 
@@ -58,6 +60,12 @@ def test_resolve_named_requirement(project, repository):
     assert result["idna"].version == "2.7"
 
 
+def test_resolve_closes_repository(project, repository, mocker):
+    close = mocker.patch.object(repository, "close")
+    resolve_requirements(repository, ["requests"])
+    close.assert_called_once()
+
+
 def test_resolve_requires_python(project, repository):
     result = resolve_requirements(repository, ["django"])
     assert result["django"].version == "1.11.8"
@@ -267,3 +275,103 @@ def test_resolve_candidates_to_install(project):
     assert result["py"].version == "3.6.0"
     assert result["configparser"].version == "1.2.0"
     assert result["backports"].version == "2.2.0"
+
+
+def test_resolve_prefetch_candidate_dependencies(project, repository, mocker):
+    from tests.conftest import _FakeLink
+
+    mocker.patch.object(_FakeLink, "is_wheel", True)
+    main_thread = threading.current_thread()
+    fetch_threads = []
+    get_dependencies = repository.get_dependencies
+
+    def record_thread(candidate):
+        fetch_threads.append(threading.current_thread())
+        return get_dependencies(candidate)
+
+    mocker.patch.object(repository, "get_dependencies", side_effect=record_thread)
+    result = resolve_requirements(repository, ["requests"])
+    assert result["requests"].version == "2.19.1"
+    assert result["urllib3"].version == "1.22"
+    assert any(thread is not main_thread for thread in fetch_threads)
+
+    project.project_config["strategy.prefetch_candidates"] = 0
+    fetch_threads.clear()
+    result = resolve_requirements(repository, ["requests"])
+    assert result["requests"].version == "2.19.1"
+    assert all(thread is main_thread for thread in fetch_threads)
+
+
+def test_build_local_requirements_in_parallel(project, repository, mocker):
+    project.project_config["strategy.build_workers"] = 2
+    provider = BaseProvider(repository, PySpecSet(), None)
+    barrier = threading.Barrier(2, timeout=5)
+
+    def build(requirement):
+        # Both builds must be running at the same time to pass the barrier.
+        barrier.wait()
+        return requirement.url
+
+    mocker.patch.object(provider, "_build_candidate", side_effect=build)
+    requirements = [
+        parse_requirement((FIXTURES / "projects/demo").as_posix()),
+        parse_requirement("git+https://github.com/test-root/demo.git#egg=demo"),
+        parse_requirement("requests"),
+    ]
+    try:
+        provider.schedule_builds(requirements)
+        assert len(provider._builds) == 2
+        for req in requirements[:2]:
+            assert provider._get_built_candidate(req) == req.url
+    finally:
+        provider.shutdown()
+
+
+def test_resolve_collect_hashes_concurrently(project, repository, mocker):
+    main_thread = threading.current_thread()
+    hash_threads = []
+
+    def get_hashes(candidate):
+        hash_threads.append(threading.current_thread())
+        return {f"{candidate.name}-{candidate.version}.tar.gz": "sha256:abc"}
+
+    mocker.patch.object(repository, "get_hashes", side_effect=get_hashes)
+    result = resolve_requirements(repository, ["requests"])
+    for candidate in result.values():
+        assert candidate.hashes == {
+            f"{candidate.name}-{candidate.version}.tar.gz": "sha256:abc"
+        }
+    assert all(thread is not main_thread for thread in hash_threads)
+
+
+def test_resolve_candidates_from_lockfile_without_resolver(project, mocker):
+    project.lockfile = {
+        "package": [
+            {
+                "name": "pytest",
+                "version": "4.6.0",
+                "summary": "pytest module",
+                "dependencies": ["py>=3.0", "pluggy"],
+            },
+            {"name": "py", "version": "3.6.0", "summary": "py module"},
+            {
+                "name": "pluggy",
+                "version": "0.12.0",
+                "summary": "pluggy module",
+                "dependencies": ["pytest"],
+            },
+        ]
+    }
+    resolve = mocker.patch("pdm.cli.actions.resolve")
+    result = resolve_candidates_from_lockfile(project, [parse_requirement("pytest")])
+    resolve.assert_not_called()
+    assert {key: can.version for key, can in result.items()} == {
+        "pytest": "4.6.0",
+        "py": "3.6.0",
+        "pluggy": "0.12.0",
+    }
+
+    # Fall back to the resolver if the lockfile doesn't satisfy the requirements.
+    resolve.return_value = ({}, {}, {})
+    resolve_candidates_from_lockfile(project, [parse_requirement("py<3")])
+    resolve.assert_called_once()
@@ -0,0 +1,78 @@
+import json
+
+from tasks import benchmark
+
+IMPORTTIME_OUTPUT = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   pdm.models
+import time:       300 |        420 | pdm.project
+import time:      1000 |       1420 | pdm.core
+"""
+
+
+def make_result(seconds=1.0, modules=250, command_modules=None, import_ms=300):
+    return {
+        "commands": {
+            "--version": {
+                "seconds": {"median": seconds, "min": seconds},
+                "modules": modules,
+                "command_modules": command_modules or [],
+                "imports": {"total_ms": import_ms},
+            }
+        },
+    }
+
+
+def test_parse_importtime():
+    assert benchmark.parse_importtime(IMPORTTIME_OUTPUT) == {
+        "pdm.models": {"self": 120, "cumulative": 120, "level": 1},
+        "pdm.project": {"self": 300, "cumulative": 420, "level": 0},
+        "pdm.core": {"self": 1000, "cumulative": 1420, "level": 0},
+    }
+
+
+def test_summarize_imports():
+    summary = benchmark.summarize_imports(benchmark.parse_importtime(IMPORTTIME_OUTPUT))
+    assert summary["total_ms"] == 1.84
+    assert summary["groups"]["pdm.project"] == {
+        "modules": 1,
+        "self_ms": 0.3,
+        "cumulative_ms": 0.42,
+    }
+    assert summary["groups"]["pdm.cli.commands"]["modules"] == 0
+    assert summary["slowest"][0] == ["pdm.core", 1.0]
+
+
+def test_import_breakdown_of_command(tmp_path):
+    imports = benchmark.import_breakdown(["--version"], tmp_path)
+    assert imports["groups"]["pdm.core"]["modules"] == 1
+    assert imports["groups"]["pdm.cli.commands"]["modules"] <= 1
+    assert imports["total_ms"] > imports["groups"]["pdm.core"]["cumulative_ms"] > 0
+
+
+def test_check_thresholds():
+    thresholds = json.loads(benchmark.THRESHOLDS_FILE.read_text())
+    assert set(thresholds["commands"]) == set(benchmark.COMMANDS)
+    for limits in thresholds["commands"].values():
+        assert {"command_modules", "modules", "import_ms"} <= set(limits)
+    baseline = make_result()
+    assert not benchmark.check_thresholds(make_result(), thresholds)
+    assert not benchmark.check_thresholds(
+        make_result(seconds=1.1, modules=254, import_ms=350), thresholds, baseline
+    )
+
+    result = make_result(
+        seconds=1.5,
+        modules=1000,
+        command_modules=["pdm.cli.commands.base"],
+        import_ms=1000,
+    )
+    # The timings are only checked against a baseline.
+    assert len(benchmark.check_thresholds(result, thresholds)) == 3
+    assert len(benchmark.check_thresholds(result, thresholds, baseline)) == 6
+
+
+def test_version_does_not_import_command_modules(tmp_path):
+    modules = benchmark.imported_modules(["--version"], tmp_path)
+    assert "pdm.core" in modules
+    assert not [m for m in modules if m.startswith("pdm.cli.commands.")]
@@ -0,0 +1,163 @@
+import os
+
+import pytest
+from resolvelib.resolvers import ResolverException
+
+from pdm.builders.base import BUILD_ENV_MARKER, EnvBuilder, remove_stale_build_envs
+from pdm.exceptions import BuildBackendError, BuildError
+
+
+def make_project_dir(path, requires):
+    path.mkdir()
+    path.joinpath("pyproject.toml").write_text(
+        f"[build-system]\nrequires = {requires!r}\n"
+        'build-backend = "setuptools.build_meta"\n'
+    )
+    return path
+
+
+def test_shared_build_env_is_keyed_by_requirements(project, tmp_path):
+    first = EnvBuilder(
+        make_project_dir(tmp_path / "first", ["Setuptools>=40", "wheel"]),
+        project.environment,
+    )
+    second = EnvBuilder(
+        make_project_dir(tmp_path / "second", ["wheel", "setuptools >= 40"]),
+        project.environment,
+    )
+    third = EnvBuilder(
+        make_project_dir(tmp_path / "third", ["flit_core"]), project.environment
+    )
+    assert first._shared_path == second._shared_path
+    assert first._shared_path != third._shared_path
+    assert first._path != second._path
+
+
+def test_incomplete_shared_build_env_is_recreated(project, tmp_path, mocker):
+    builder = EnvBuilder(
+        make_project_dir(tmp_path / "demo", ["setuptools"]), project.environment
+    )
+    os.makedirs(builder._shared_path)
+    leftover = os.path.join(builder._shared_path, "leftover")
+    open(leftover, "w").close()
+    install = mocker.patch.object(builder, "_install")
+
+    with builder:
+        builder.install(["setuptools"], shared=True)
+        builder.install(["setuptools"], shared=True)
+    install.assert_called_once_with(["setuptools"], builder._shared_path)
+    assert not os.path.exists(leftover)
+    assert os.path.exists(os.path.join(builder._shared_path, BUILD_ENV_MARKER))
+
+
+def test_shared_build_env_in_use_is_not_removed(project, tmp_path, mocker):
+    project.project_config["cache.max_build_envs"] = 0
+    builder = EnvBuilder(
+        make_project_dir(tmp_path / "demo", ["setuptools"]), project.environment
+    )
+    mocker.patch.object(builder, "_install")
+    marker = os.path.join(builder._shared_path, BUILD_ENV_MARKER)
+
+    with builder:
+        builder.install(["setuptools"], shared=True)
+        # A nested builder with the same requirements reuses the environment.
+        nested = EnvBuilder(
+            make_project_dir(tmp_path / "nested", ["setuptools"]), project.environment
+        )
+        with nested:
+            nested.install(["setuptools"], shared=True)
+        remove_stale_build_envs(project)
+        assert os.path.exists(marker)
+    remove_stale_build_envs(project)
+    assert not os.path.exists(marker)
+
+
+def test_remove_least_recently_used_build_envs(project):
+    project.project_config["cache.max_build_envs"] = 2
+    root = project.cache("build_envs")
+    for i, name in enumerate(["old", "recent", "current"]):
+        root.joinpath(name).mkdir()
+        marker = root.joinpath(name, BUILD_ENV_MARKER)
+        marker.write_text("{}")
+        os.utime(marker, (1000 + i, 1000 + i))
+
+    remove_stale_build_envs(project, keep=str(root / "old"))
+    assert sorted(root.glob("*/" + BUILD_ENV_MARKER)) == [
+        root / "current" / BUILD_ENV_MARKER,
+        root / "old" / BUILD_ENV_MARKER,
+    ]
+
+
+def test_build_requirements_installed_by_pdm(project, tmp_path, mocker):
+    builder = EnvBuilder(
+        make_project_dir(tmp_path / "demo", ["setuptools"]), project.environment
+    )
+    installed = set()
+    mocker.patch.object(
+        builder,
+        "check_requirements",
+        side_effect=lambda reqs: [r for r in reqs if r not in installed],
+    )
+    pip_install = mocker.patch.object(
+        builder, "_pip_install", side_effect=lambda reqs, path: installed.update(reqs)
+    )
+
+    def nested_install(requirements, path):
+        builder._install(["wheel"], path)
+        installed.update(requirements)
+
+    pdm_install = mocker.patch.object(
+        builder, "_pdm_install", side_effect=nested_install
+    )
+    builder._install(["setuptools"], builder._path)
+    pdm_install.assert_called_once_with(["setuptools"], builder._path)
+    pip_install.assert_called_once_with(["wheel"], builder._path)
+
+
+def test_build_requirements_missed_by_pdm_installed_by_pip(project, tmp_path, mocker):
+    builder = EnvBuilder(
+        make_project_dir(tmp_path / "demo", ["setuptools"]), project.environment
+    )
+    mocker.patch.object(builder, "check_requirements", side_effect=lambda reqs: reqs)
+    mocker.patch.object(builder, "_pdm_install")
+    pip_install = mocker.patch.object(builder, "_pip_install")
+
+    builder._install(["setuptools"], builder._path)
+    pip_install.assert_called_once_with(["setuptools"], builder._path)
+
+
+def test_build_requirements_installed_by_pip_if_pdm_fails(project, tmp_path, mocker):
+    builder = EnvBuilder(
+        make_project_dir(tmp_path / "demo", ["setuptools"]), project.environment
+    )
+    mocker.patch.object(builder, "check_requirements", side_effect=lambda reqs: reqs)
+    mocker.patch.object(
+        builder, "_pdm_install", side_effect=ResolverException("inconsistent")
+    )
+    pip_install = mocker.patch.object(builder, "_pip_install")
+
+    builder._install(["setuptools"], builder._path)
+    pip_install.assert_called_once_with(["setuptools"], builder._path)
+
+
+def test_backend_failures_are_told_from_env_failures(project, tmp_path, mocker):
+    builder = EnvBuilder(
+        make_project_dir(tmp_path / "demo", ["setuptools"]), project.environment
+    )
+    mocker.patch("pdm.builders.base.log_subprocessor", side_effect=BuildError("failed"))
+    with pytest.raises(BuildBackendError):
+        builder._hook.get_requires_for_build_wheel()
+    with pytest.raises(BuildError) as excinfo:
+        builder._pip_install(["wheel"], builder._path)
+    assert not isinstance(excinfo.value, BuildBackendError)
+
+
+def test_prefix_environment_paths(project, tmp_path):
+    from pdm.models.environment import PrefixEnvironment
+
+    environment = PrefixEnvironment(project, str(tmp_path / "prefix"))
+    paths = environment.get_paths()
+    for key in ("purelib", "platlib", "scripts", "data"):
+        assert paths[key].startswith(str(tmp_path / "prefix"))
+    assert os.path.isdir(paths["scripts"])
+    assert environment.python_requires.contains(str(environment.interpreter.version))
@@ -0,0 +1,252 @@
+import base64
+import csv
+import hashlib
+import io
+import multiprocessing
+import os
+import sys
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+from distlib.scripts import ScriptMaker
+from distlib.wheel import Wheel
+from pip._vendor import pkg_resources
+
+from pdm.exceptions import InstallationError
+from pdm.installers import Installer
+from pdm.installers.pipeline import BytecodeCompiler
+from pdm.installers.uninstallers import stash_distribution
+from pdm.installers.wheels import compile_bytecode, install_wheel
+
+
+def record_hash(content):
+    digest = hashlib.sha256(content).digest()
+    return "sha256=" + base64.urlsafe_b64encode(digest).rstrip(b"=").decode()
+
+
+def make_wheel(path, files=None, tamper=False):
+    files = files or {
+        "demo/__init__.py": b"VERSION = '0.0.1'\n",
+        "demo/cli.py": b"def main():\n    print('demo')\n",
+        "demo-0.0.1.data/scripts/demo-script": b"#!python\nprint('script')\n",
+        "demo-0.0.1.dist-info/METADATA": b"Name: demo\nVersion: 0.0.1\n",
+        "demo-0.0.1.dist-info/WHEEL": b"Wheel-Version: 1.0\nRoot-Is-Purelib: true\n",
+        "demo-0.0.1.dist-info/entry_points.txt": (
+            b"[console_scripts]\ndemo = demo.cli:main\n"
+        ),
+    }
+    record = io.StringIO()
+    writer = csv.writer(record)
+    for name, content in files.items():
+        writer.writerow([name, record_hash(content), len(content)])
+    writer.writerow(["demo-0.0.1.dist-info/RECORD", "", ""])
+    with zipfile.ZipFile(path, "w") as zf:
+        for name, content in files.items():
+            zf.writestr(name, content + b"# tampered" if tamper else content)
+        zf.writestr("demo-0.0.1.dist-info/RECORD", record.getvalue())
+    return path
+
+
+def make_paths(root):
+    lib = str(root / "lib")
+    return {
+        "purelib": lib,
+        "platlib": lib,
+        "scripts": str(root / "bin"),
+        "data": str(root),
+        "headers": str(root / "include"),
+        "prefix": str(root),
+    }
+
+
+def make_maker():
+    maker = ScriptMaker(None, None)
+    maker.variants = {""}
+    maker.executable = sys.executable
+    return maker
+
+
+def test_install_wheel(tmp_path):
+    wheel = make_wheel(tmp_path / "demo-0.0.1-py3-none-any.whl")
+    paths = make_paths(tmp_path / "prefix")
+    sources = install_wheel(str(wheel), paths, make_maker())
+
+    lib = tmp_path / "prefix/lib"
+    assert sorted(sources) == [
+        str(lib / "demo/__init__.py"),
+        str(lib / "demo/cli.py"),
+    ]
+    script = tmp_path / "prefix/bin/demo-script"
+    assert script.read_text().startswith(f"#!{sys.executable}")
+    assert os.access(script, os.X_OK)
+    assert (tmp_path / "prefix/bin/demo").exists()
+    assert (lib / "demo-0.0.1.dist-info/INSTALLER").read_text() == "pdm\n"
+
+    with open(lib / "demo-0.0.1.dist-info/RECORD") as f:
+        records = {row[0]: row for row in csv.reader(f)}
+    assert "demo/__init__.py" in records
+    assert "../bin/demo" in records
+    assert records["demo-0.0.1.dist-info/RECORD"] == [
+        "demo-0.0.1.dist-info/RECORD",
+        "",
+        "",
+    ]
+    # The bytecode is compiled in a separate stage.
+    assert not (lib / "demo/__pycache__").exists()
+
+
+def test_install_wheel_with_hash_mismatch_rolls_back(tmp_path):
+    wheel = make_wheel(tmp_path / "demo-0.0.1-py3-none-any.whl", tamper=True)
+    paths = make_paths(tmp_path / "prefix")
+    with pytest.raises(InstallationError):
+        install_wheel(str(wheel), paths, make_maker())
+    lib = tmp_path / "prefix/lib"
+    assert not any(path.is_file() for path in lib.rglob("*"))
+
+
+def test_compile_bytecode(tmp_path):
+    sources = []
+    for i in range(4):
+        source = tmp_path / f"module{i}.py"
+        source.write_text(f"VALUE = {i}\n")
+        sources.append(str(source))
+    broken = tmp_path / "broken.py"
+    broken.write_text("def broken(:\n")
+
+    compile_bytecode(sys.executable, sources + [str(broken)], workers=2)
+    compiled = os.listdir(tmp_path / "__pycache__")
+    assert len(compiled) == 4
+    assert not any(name.startswith("broken.") for name in compiled)
+
+
+def test_installer_defers_bytecode_compilation(project, tmp_path):
+    wheel = make_wheel(tmp_path / "demo-0.0.1-py3-none-any.whl")
+    deferred = []
+    installer = Installer(project.environment, deferred_sources=deferred)
+    installer.install_wheel(Wheel(str(wheel)))
+
+    lib = project.environment.get_paths()["purelib"]
+    assert sorted(deferred) == [
+        os.path.join(lib, "demo", "__init__.py"),
+        os.path.join(lib, "demo", "cli.py"),
+    ]
+    assert not os.path.exists(os.path.join(lib, "demo", "__pycache__"))
+
+    project.project_config["install.compile_bytecode"] = False
+    deferred.clear()
+    installer.install_wheel(Wheel(str(wheel)))
+    assert not deferred
+
+
+def test_installer_unpacks_wheels_in_processes(project, tmp_path):
+    wheel = make_wheel(tmp_path / "demo-0.0.1-py3-none-any.whl")
+    deferred = []
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(1, mp_context=context) as executor:
+        installer = Installer(
+            project.environment, deferred_sources=deferred, executor=executor
+        )
+        installer.install_wheel(Wheel(str(wheel)))
+
+    lib = project.environment.get_paths()["purelib"]
+    assert os.path.join(lib, "demo", "__init__.py") in deferred
+    assert os.path.exists(os.path.join(lib, "demo-0.0.1.dist-info", "RECORD"))
+
+
+def test_install_wheel_from_package_store(tmp_path):
+    wheel = make_wheel(tmp_path / "demo-0.0.1-py3-none-any.whl")
+    store = tmp_path / "store"
+    for name in ("first", "second"):
+        install_wheel(str(wheel), make_paths(tmp_path / name), make_maker(), str(store))
+
+    first = tmp_path / "first/lib/demo/__init__.py"
+    second = tmp_path / "second/lib/demo/__init__.py"
+    assert os.path.samefile(first, second)
+    assert len(list(store.glob("*/*.json"))) == 1
+    with open(tmp_path / "second/lib/demo-0.0.1.dist-info/RECORD") as f:
+        records = {row[0]: row for row in csv.reader(f)}
+    content = b"VERSION = '0.0.1'\n"
+    assert records["demo/__init__.py"][1:] == [record_hash(content), str(len(content))]
+    script = tmp_path / "second/bin/demo-script"
+    assert script.read_text().startswith(f"#!{sys.executable}")
+
+    # Reinstalling without the store doesn't write through the links.
+    changed = make_wheel(
+        tmp_path / "demo-changed-0.0.1-py3-none-any.whl",
+        {
+            "demo/__init__.py": b"VERSION = 'changed'\n",
+            "demo-0.0.1.dist-info/WHEEL": b"Root-Is-Purelib: true\n",
+        },
+    )
+    install_wheel(str(changed), make_paths(tmp_path / "second"), make_maker())
+    assert second.read_bytes() == b"VERSION = 'changed'\n"
+    assert first.read_bytes() == content
+
+
+def test_bytecode_compiler_compiles_in_batches(tmp_path):
+    compiler = BytecodeCompiler(sys.executable, batch_size=3)
+    for i in range(5):
+        source = tmp_path / f"module{i}.py"
+        source.write_text(f"VALUE = {i}\n")
+        compiler.put([str(source)])
+    assert compiler.close() == 5
+    assert len(os.listdir(tmp_path / "__pycache__")) == 5
+    # The first three files are compiled together, and the rest on closing.
+    assert compiler.timer.counts["compile"] == 2
+
+
+def test_uninstall_distribution_by_record(tmp_path):
+    wheel = make_wheel(tmp_path / "demo-0.0.1-py3-none-any.whl")
+    paths = make_paths(tmp_path / "prefix")
+    sources = install_wheel(str(wheel), paths, make_maker())
+    compile_bytecode(sys.executable, sources)
+    lib = tmp_path / "prefix/lib"
+    (dist,) = pkg_resources.find_distributions(str(lib))
+    roots = [paths["purelib"], paths["scripts"]]
+
+    removal = stash_distribution(dist, lambda path: True, roots)
+    assert not (lib / "demo/__init__.py").exists()
+    assert not (tmp_path / "prefix/bin/demo").exists()
+    removal.rollback()
+    assert (lib / "demo/__init__.py").exists()
+    assert (tmp_path / "prefix/bin/demo").exists()
+
+    # The compiled bytecode isn't recorded but removed with the sources.
+    assert not any("__pycache__" in path for path in dist.get_metadata_lines("RECORD"))
+    stash_distribution(dist, lambda path: True, roots).commit()
+    assert os.listdir(lib) == []
+    assert os.listdir(tmp_path / "prefix/bin") == []
+
+
+def test_uninstall_bytecode_compiled_by_other_interpreters(tmp_path):
+    wheel = make_wheel(tmp_path / "demo-0.0.1-py3-none-any.whl")
+    install_wheel(str(wheel), make_paths(tmp_path / "prefix"), make_maker())
+    lib = tmp_path / "prefix/lib"
+    cache_dir = lib / "demo/__pycache__"
+    cache_dir.mkdir()
+    for name in (
+        "__init__.cpython-36.pyc",
+        "cli.pypy37.opt-1.pyc",
+        "cli.other.cpython-36.pyc",
+    ):
+        (cache_dir / name).write_bytes(b"")
+    (dist,) = pkg_resources.find_distributions(str(lib))
+
+    stash_distribution(dist, lambda path: True, [str(lib)]).commit()
+    # Only the bytecode of the recorded sources is removed.
+    assert os.listdir(cache_dir) == ["cli.other.cpython-36.pyc"]
+
+
+def test_uninstall_egg_info_distribution(tmp_path):
+    lib = tmp_path / "lib"
+    info_dir = lib / "demo-0.0.1-py3.8.egg-info"
+    info_dir.mkdir(parents=True)
+    (info_dir / "PKG-INFO").write_text("Name: demo\nVersion: 0.0.1\n")
+    (info_dir / "installed-files.txt").write_text("../demo.py\nPKG-INFO\n")
+    (lib / "demo.py").write_text("")
+    (lib / "other.py").write_text("")
+    (dist,) = pkg_resources.find_distributions(str(lib))
+
+    stash_distribution(dist, lambda path: True, [str(lib)]).commit()
+    assert os.listdir(lib) == ["other.py"]
@@ -1,7 +1,5 @@
 from unittest import mock
 
-from pip._vendor import pkg_resources
-
 from pdm.cli.commands.base import BaseCommand
 from pdm.project.config import ConfigItem
 
@@ -36,8 +34,8 @@ def make_entry_point(plugin):
 
 
 def test_plugin_new_command(invoke, mocker, project):
-    mocker.patch.object(
-        pkg_resources, "iter_entry_points", return_value=[make_entry_point(new_command)]
+    mocker.patch(
+        "pdm.core.iter_entry_points", return_value=[make_entry_point(new_command)]
     )
     result = invoke(["--help"], obj=project)
     assert "hello" in result.output
@@ -50,9 +48,8 @@ def test_plugin_new_command(invoke, mocker, project):
 
 
 def test_plugin_replace_command(invoke, mocker, project):
-    mocker.patch.object(
-        pkg_resources,
-        "iter_entry_points",
+    mocker.patch(
+        "pdm.core.iter_entry_points",
         return_value=[make_entry_point(replace_command)],
     )
 
@@ -64,9 +61,8 @@ def test_plugin_replace_command(invoke, mocker, project):
 
 
 def test_load_multiple_plugings(invoke, mocker, project):
-    mocker.patch.object(
-        pkg_resources,
-        "iter_entry_points",
+    mocker.patch(
+        "pdm.core.iter_entry_points",
         return_value=[make_entry_point(new_command), make_entry_point(add_new_config)],
     )
 
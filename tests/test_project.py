@@ -6,6 +6,7 @@ from pathlib import Path
 import distlib.wheel
 import pytest
 
+from pdm.models.python import PythonInfo
 from pdm.models.requirements import filter_requirements_with_extras
 from pdm.pep517.api import build_wheel
 from pdm.utils import cd, temp_environ
@@ -23,8 +24,8 @@ def test_project_python_with_pyenv_support(project, mocker):
         pyenv_python.parent.mkdir()
         pyenv_python.touch()
         mocker.patch(
-            "pythonfinder.models.python.get_python_version",
-            return_value="3.8.0",
+            "pdm.models.python.get_interpreter_info",
+            return_value={"version": "3.8.0"},
         )
         assert Path(project.python.executable) == pyenv_python
 
@@ -35,6 +36,24 @@ def test_project_python_with_pyenv_support(project, mocker):
         assert Path(project.python.executable) != pyenv_python
 
 
+def test_project_python_info_cache(project, mocker):
+    from pdm.models import in_process
+
+    mocker.patch.object(in_process, "_interpreter_infos", {})
+    cache = project.make_interpreter_cache()
+    python = PythonInfo.from_path(sys.executable, cache)
+    assert python.version_tuple == sys.version_info[:3]
+
+    # A new process reads the result from the cache without spawning the interpreter
+    mocker.patch.object(in_process, "_interpreter_infos", {})
+    check_output = mocker.patch.object(in_process.subprocess, "check_output")
+    assert PythonInfo.from_path(sys.executable, cache).version == python.version
+    assert in_process.get_pep508_environment(sys.executable)["python_version"] == (
+        "{}.{}".format(*sys.version_info[:2])
+    )
+    check_output.assert_not_called()
+
+
 def test_project_config_items(project):
     config = project.config
 
@@ -163,3 +182,15 @@ def test_select_dependencies(project):
         "test",
         "venv",
     ]
+
+
+def test_environment_reuses_pooled_session(project):
+    project.project_config["pypi.max_connections"] = 4
+    environment = project.environment
+    with environment.get_finder() as finder:
+        session = finder.session
+    insecure = {"url": "http://insecure.test/simple", "verify_ssl": False}
+    with environment.get_finder([insecure]) as finder:
+        assert finder.session is session
+    assert ("insecure.test", None) in session.pip_trusted_origins
+    assert session.get_adapter("https://pypi.org/")._pool_maxsize == 4
@@ -1,12 +1,15 @@
 import pathlib
 import re
+import subprocess
 import sys
+import threading
 
 import pytest
 
 from pdm import utils
 from pdm.cli import utils as cli_utils
 from pdm.exceptions import PdmUsageError
+from pdm.models.pip_shims import InstallationCandidate, Link
 
 
 @pytest.mark.parametrize(
@@ -124,3 +127,116 @@ def test_prod_should_not_be_with_dev(project):
     setup_dependencies(project)
     with pytest.raises(PdmUsageError):
         cli_utils.translate_sections(project, True, False, ("test",))
+
+
+def test_finder_ignore_compatibility():
+    sources = [{"url": "https://pypi.org/simple", "verify_ssl": True, "name": "pypi"}]
+    link = Link("https://example.org/demo-0.1-cp27-cp27m-win32.whl")
+    candidates = [
+        InstallationCandidate("demo", "0.1", link),
+        InstallationCandidate("demo", "0.1", Link("https://example.org/demo-0.1.zip")),
+    ]
+    finder = utils.get_finder(sources, python_version=(3, 9), python_abi_tag="cp39")
+    assert not finder.make_link_evaluator("demo").evaluate_link(link)[0]
+
+    # Another finder sharing the process doesn't affect the first one.
+    compatible = utils.get_finder(
+        sources,
+        session=finder.session,
+        python_version=(3, 9),
+        python_abi_tag="cp39",
+        ignore_compatibility=True,
+    )
+    assert compatible.make_link_evaluator("demo").evaluate_link(link) == (True, "0.1")
+    assert not finder.make_link_evaluator("demo").evaluate_link(link)[0]
+    best = compatible.make_candidate_evaluator("demo").sort_best_candidate(candidates)
+    assert best.link == link
+
+
+def test_file_lock_readers_writer(tmp_path):
+    lock_file = tmp_path / "cache.lock"
+    events = []
+
+    def acquire(shared):
+        with utils.file_lock(lock_file, shared=shared):
+            events.append("shared" if shared else "exclusive")
+
+    with utils.file_lock(lock_file, shared=True):
+        reader = threading.Thread(target=acquire, args=(True,))
+        reader.start()
+        reader.join(5)
+        assert events == ["shared"]
+
+        writer = threading.Thread(target=acquire, args=(False,))
+        writer.start()
+        writer.join(0.5)
+        assert writer.is_alive()
+        events.append("released")
+    writer.join(5)
+    assert events == ["shared", "released", "exclusive"]
+
+
+def test_file_lock_nested(tmp_path):
+    lock_file = str(tmp_path / "cache.lock")
+    with utils.file_lock(lock_file):
+        with utils.file_lock(lock_file, shared=True):
+            pass
+        with utils.file_lock(lock_file):
+            pass
+    with utils.file_lock(lock_file, shared=True):
+        with utils.file_lock(lock_file, shared=True):
+            pass
+        with pytest.raises(RuntimeError):
+            with utils.file_lock(lock_file):
+                pass
+        with pytest.raises(BlockingIOError):
+            with utils.file_lock(lock_file, blocking=False):
+                pass
+
+
+def test_file_lock_non_blocking(tmp_path):
+    lock_file = tmp_path / "cache.lock"
+    results = []
+
+    def acquire(shared):
+        try:
+            with utils.file_lock(lock_file, shared=shared, blocking=False):
+                results.append(shared)
+        except BlockingIOError:
+            results.append(None)
+
+    with utils.file_lock(lock_file, shared=True):
+        for shared in (True, False):
+            thread = threading.Thread(target=acquire, args=(shared,))
+            thread.start()
+            thread.join(5)
+    assert results == [True, None]
+    acquire(False)
+    assert results == [True, None, False]
+
+
+def test_file_lock_shared_with_other_process(tmp_path):
+    lock_file = tmp_path / "cache.lock"
+    script = (
+        "import sys\n"
+        "from pdm.utils import file_lock\n"
+        "with file_lock(sys.argv[1], shared=True):\n"
+        "    print('locked', flush=True)\n"
+        "    sys.stdin.read()\n"
+    )
+    holder = subprocess.Popen(
+        [sys.executable, "-c", script, str(lock_file)],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+    )
+    try:
+        assert holder.stdout.readline().strip() == b"locked"
+        with utils.file_lock(lock_file, shared=True, blocking=False):
+            pass
+        with pytest.raises(BlockingIOError):
+            with utils.file_lock(lock_file, blocking=False):
+                pass
+    finally:
+        holder.communicate()
+    with utils.file_lock(lock_file, blocking=False):
+        pass